@@ -1,15 +1,42 @@
-import sys, os, json, webbrowser, markdown
+import sys, os, time, datetime, webbrowser
+_T0 = time.perf_counter()       # 启动计时起点（--profile-startup）
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QToolButton,
     QPushButton, QSplitter, QLineEdit, QDialog, QFormLayout, QComboBox,
-    QFileDialog, QMessageBox, QTreeWidget, QTreeWidgetItem, QMenu,
-    QTextEdit, QLabel, QSpinBox, QDialogButtonBox, QTabWidget, QPlainTextEdit
+    QFileDialog, QMessageBox, QTreeView, QMenu,
+    QTextEdit, QLabel, QSpinBox, QDialogButtonBox, QTabWidget, QPlainTextEdit, QCheckBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QDateEdit, QShortcut
 )
-from PyQt5.QtCore import Qt, QProcess
-from PyQt5.QtGui import QIcon
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as Canvas
-from matplotlib import rcParams
+from PyQt5.QtCore import Qt, QProcess, QTimer, QObject, QThreadPool, QEvent, QDate, QFileSystemWatcher, pyqtSignal
+from PyQt5.QtGui import QIcon, QTextCursor, QKeySequence
+from ivylib.config import SETTINGS_FILE, TOOLS_FILE, DEFAULT_SETTINGS, I18N
+from ivylib.storage import load_json, save_json, peek_json, file_stamp, recovery_log, DebouncedWriter
+from ivylib.usage import open_usage_store
+from ivylib.catalog import ensure_tool_ids, new_tool_id, diff_tools, merge_tools, merge_fields
+from ivylib.catalog_store import open_catalog_store
+from ivylib.tool_model import ToolModel, ToolFilterProxy
+from ivylib.health import HealthCache, check_tool, check_tools, BAD
+from ivylib.search import SearchIndex, read_doc, query_terms
+from ivylib.qt_tasks import run_in_background
+from ivylib.render_cache import LRUCache, content_key, doc_stamp, render_detail
+from ivylib.output_buffer import OutputBuffer, spool_path, prune_history
+from ivylib.launch import type_key, build_command, script_runner, CLI_TYPES
+from ivylib.batch import BatchDialog
+from ivylib.result_cache import ResultCache
+from ivylib.runs import RunLog, summarize, export_csv, export_jsonl
+from ivylib.run_monitor import RunMonitor
+from ivylib.pipeline_dialog import PipelineDialog
+from ivylib.import_dialog import ImportDialog
+from ivylib.log_viewer import RunHistoryDialog
+from ivylib.supervisor import Supervisor, QUEUED
+from ivylib.process_panel import ProcessPanel
+from ivylib.frecency import Frecency
+from ivylib.palette import LaunchPalette
+from ivylib.warm_pool import WarmPools, warm_request
+from ivylib.startup_profile import StartupProfile
+
+PROFILE = StartupProfile(_T0, enabled="--profile-startup" in sys.argv)
+PROFILE.mark("imports")
 
 # 可选 Windows 深色模式检测
 try:
@@ -17,82 +44,15 @@ try:
 except ImportError:
     winreg = None
 
-# 全局常量
-SETTINGS_FILE = "settings.json"
-TOOLS_FILE    = "tools_data.json"
-USAGE_LOG     = "usage_log.json"
-
-DEFAULT_SETTINGS = {
-    "theme":"System",
-    "font_size":10,
-    "window_width":1800,
-    "window_height":1200,
-    "language":"中文",
-    "python_path":"python",      # 新增：默认解释器命令
-    "java_path": "java"         # 新增：Java解释器路径
-
-}
-
-
-I18N = {
-    "中文":{
-        "app_title":"工具管理平台","search":"搜索工具...",
-        "add_tool":"+ 添加工具","select_detail":"选择一个工具查看详情",
-        "settings":"应用设置","about":"关于信息",
-        "theme":"主题","light":"浅色","dark":"暗黑","system":"随系统",
-        "font_size":"字体大小","window_size":"初始窗口大小","language":"系统语言",
-        "ok":"确定","cancel":"取消",
-        "name":"名称","type":"类型","url":"网址","category":"分类",
-        "path":"执行文件","args":"默认参数","simple_description":"说明",
-        "browse":"浏览文件…","import_doc":"导入说明文档…",
-        "add":"添加","edit":"编辑","delete":"删除",
-        "confirm_delete":"确认删除","launch_error":"启动失败",
-        "restart_prompt":"设置已保存，需要重启后生效，立即重启？",
-        "recent_usage":"近期工具使用情况",
-        "opt_py_cli": "命令行Python工具",
-        "opt_py_exec": "可执行Python工具",
-        "today_top5":"今日使用 Top5","trend7":"7天趋势","trend30":"30天趋势",
-        "opt_website":"网站","opt_cli":"命令行工具","opt_exec":"可执行程序",
-        "cli_title":"命令行工具运行","cli_args":"参数","cli_run":"运行","cli_output":"输出",
-        "opt_java_cli": "命令行Java工具",
-        "opt_java_exec": "可执行Java程序",
-
-    },
-    "English":{
-        "app_title":"Tool Manager","search":"Search tools...",
-        "add_tool":"+ Add Tool","select_detail":"Select a tool to see details",
-        "settings":"Settings","about":"About",
-        "theme":"Theme","light":"Light","dark":"Dark","system":"System",
-        "font_size":"Font Size","window_size":"Initial Window Size","language":"Language",
-        "ok":"OK","cancel":"Cancel",
-        "name":"Name","type":"Type","url":"URL","category":"Category",
-        "path":"Executable","args":"Default Args","simple_description":"Description",
-        "browse":"Browse…","import_doc":"Import Doc…",
-        "add":"Add","edit":"Edit","delete":"Delete",
-        "confirm_delete":"Confirm Delete","launch_error":"Launch Error",
-        "restart_prompt":"Settings saved. Restart now to apply?",
-        "recent_usage":"Recent Usage","today_top5":"Today Top5",
-        "opt_py_cli": "Python CLI Tool",
-        "opt_py_exec": "Python Executable",
-        "trend7":"7‑day Trend","trend30":"30‑day Trend",
-        "opt_website":"Website","opt_cli":"CLI","opt_exec":"Executable",
-        "cli_title":"Run CLI Tool","cli_args":"Args","cli_run":"Run","cli_output":"Output",
-        "opt_java_cli": "Java CLI Tool",
-        "opt_java_exec": "Java Executable",
-    }
-}
-
-# 支持中文字体和负号
-rcParams['font.sans-serif']=['Microsoft YaHei','Arial']
-rcParams['axes.unicode_minus']=False
-
-# JSON 读写
-def load_json(path, default):
-    try: return json.load(open(path, "r", encoding="utf-8"))
-    except: return default.copy()
-
-def save_json(path, data):
-    json.dump(data, open(path, "w", encoding="utf-8"), ensure_ascii=False, indent=2)
+# matplotlib 只在第一次打开仪表盘时导入（导入本身要几百毫秒）
+def load_matplotlib():
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as Canvas
+    from matplotlib import rcParams
+    # 支持中文字体和负号
+    rcParams['font.sans-serif']=['Microsoft YaHei','Arial']
+    rcParams['axes.unicode_minus']=False
+    return Figure, Canvas
 
 # 深色模式检测
 def detect_windows_dark_mode():
@@ -128,56 +88,233 @@ def apply_theme(app, settings):
     app.setStyleSheet(qss)
 
 # 日志记录与统计
+_usage_store = None
+
+def usage_store():
+    # 首次使用时打开，旧版 usage_log.json 会在这里自动迁移
+    global _usage_store
+    if _usage_store is None:
+        settings = load_json(SETTINGS_FILE, DEFAULT_SETTINGS)
+        _usage_store = open_usage_store(settings.get("usage_backend", "sqlite"),
+                                        retention_days=settings.get("usage_retention_days", 0))
+    return _usage_store
+
+def close_usage_store():
+    # 退出时调用：各后端在这里把汇总等状态存盘
+    global _usage_store
+    if _usage_store is not None:
+        _usage_store.close()
+        _usage_store = None
+
 def log_usage(name):
-    import datetime
-    data = load_json(USAGE_LOG, [])
-    data.append({"tool": name, "time": datetime.datetime.now().isoformat()})
-    save_json(USAGE_LOG, data)
-
-def compute_today_top5(data):
-    import datetime
-    from collections import Counter
-    today = datetime.date.today().isoformat()
-    cnt = Counter(e["tool"] for e in data if e["time"].startswith(today))
-    return ([],[]) if not cnt else zip(*cnt.most_common(5))
-
-def compute_trend(data, days):
-    import datetime
-    from collections import defaultdict
-    c = defaultdict(int)
-    for e in data:
-        d = e["time"][:10]; dt = datetime.date.fromisoformat(d)
-        if dt >= datetime.date.today() - datetime.timedelta(days=days-1):
-            c[dt]+=1
-    days_sorted = sorted(c)
-    return days_sorted, [c[d] for d in days_sorted]
+    usage_store().record(name)
+
+def usage_totals(store):
+    # 每个工具的累计使用次数，直接从日汇总求和
+    totals = {}
+    for _, tool, n in store.rollup():
+        totals[tool] = totals.get(tool, 0) + n
+    return totals
+
+def build_search_index(tools, usage, catalog):
+    # 在后台线程里运行：补上延迟加载的说明、读取说明文档并建立完整索引
+    heavy = catalog.heavy_all()
+    index = SearchIndex()
+    index.set_usage(usage)
+    for t in tools:
+        index.add({**heavy[t["id"]], **t} if t["id"] in heavy else t)
+    return index
 
 # 仪表盘
 class Dashboard(QWidget):
-    def __init__(self, L):
+    # 订阅启动事件增量累加计数；重绘合并到每 250ms 至多一次，刻度不变时只重画变化的图元（blit）。
+    # 数据来自按天按工具的日汇总，区间选择只查询所需的日期范围
+    RUN_COLS = ("tool", "runs", "failures", "wall_p50", "wall_p95", "rss_p50", "rss_p95", "spawn_p50")
+
+    def __init__(self, L, launched=None, recorded=None):
         super().__init__()
+        self.L = L
         layout = QVBoxLayout(self)
-        usage = load_json(USAGE_LOG, [])
-
-        # 今日 Top5
-        tools, counts = compute_today_top5(usage)
-        fig1 = Figure(figsize=(4,2), dpi=100); ax1 = fig1.add_subplot(111)
-        ax1.bar(tools, counts); ax1.set_title(L["today_top5"]); ax1.grid(True, linestyle='--', alpha=0.5)
-        fig1.tight_layout(); layout.addWidget(Canvas(fig1))
-
-        # 7 天趋势
-        days7, vals7 = compute_trend(usage, 7)
-        labels7 = [d.strftime("%m-%d") for d in days7]
-        fig2 = Figure(figsize=(4,2), dpi=100); ax2 = fig2.add_subplot(111)
-        ax2.plot(labels7, vals7, marker="o"); ax2.set_title(L["trend7"]); ax2.grid(True, linestyle='--', alpha=0.5)
-        fig2.tight_layout(); layout.addWidget(Canvas(fig2))
-
-        # 30 天趋势
-        days30, vals30 = compute_trend(usage, 30)
-        labels30 = [d.strftime("%m-%d") for d in days30]
-        fig3 = Figure(figsize=(4,2), dpi=100); ax3 = fig3.add_subplot(111)
-        ax3.plot(labels30, vals30, marker="o"); ax3.set_title(L["trend30"]); ax3.grid(True, linestyle='--', alpha=0.5)
-        fig3.tight_layout(); layout.addWidget(Canvas(fig3))
+        Figure, Canvas = load_matplotlib()
+        self.store = usage_store()
+        self.counts = {}                 # date -> {tool: n}，只含当前用得到的日期
+        self.backgrounds, self.animated = {}, {}
+        self.dirty = set()
+        self.redraw_timer = QTimer(self); self.redraw_timer.setSingleShot(True); self.redraw_timer.setInterval(250)
+        self.redraw_timer.timeout.connect(self.redraw)
+
+        # 自定义区间
+        h = QHBoxLayout(); today = QDate.currentDate()
+        self.from_edit, self.to_edit = QDateEdit(today.addDays(-29)), QDateEdit(today)
+        for w in (self.from_edit, self.to_edit):
+            w.setCalendarPopup(True); w.setDisplayFormat("yyyy-MM-dd")
+            w.dateChanged.connect(lambda _: self.range_timer.start())
+        h.addWidget(QLabel(L["dash_range"])); h.addWidget(self.from_edit); h.addWidget(QLabel("~")); h.addWidget(self.to_edit)
+        h.addStretch(); layout.addLayout(h)
+        self.range_timer = QTimer(self); self.range_timer.setSingleShot(True); self.range_timer.setInterval(200)
+        self.range_timer.timeout.connect(self.reload)
+
+        self.canvases = {}
+        for key in ("top5", "trend7", "range"):
+            fig = Figure(figsize=(4,2), dpi=100); fig.add_subplot(111)
+            c = self.canvases[key] = Canvas(fig)
+            c.mpl_connect("draw_event", lambda e, k=key: self.on_draw(k))
+            layout.addWidget(c)
+
+        # 每个工具的运行耗时、内存分位数：所选区间内的 run_records.jsonl 在后台读取，之后随运行记录增量追加
+        self.run_records, self.runs_extra, self.runs_seq = [], [], 0
+        h = QHBoxLayout(); h.addWidget(QLabel(L["run_stats"])); h.addStretch()
+        h.addWidget(QPushButton(L["run_export"], clicked=self.export_runs))
+        layout.addLayout(h)
+        self.run_table = QTableWidget(0, len(self.RUN_COLS))
+        self.run_table.setHorizontalHeaderLabels([L["run_col_" + c] for c in self.RUN_COLS])
+        self.run_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.run_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.run_table)
+
+        self.reload()
+        if launched is not None: launched.connect(self.on_launch)
+        if recorded is not None: recorded.connect(self.on_run)
+
+    # —— 数据 ——
+    def span(self):
+        return self.from_edit.date().toPyDate(), self.to_edit.date().toPyDate()
+
+    def reload(self):
+        # 从日汇总取出今天、近 7 天和所选区间覆盖的日期（其他进程写入的记录也在这里补上）
+        self.today = datetime.date.today()
+        lo, hi = self.span()
+        first = min(lo, self.today - datetime.timedelta(days=6))
+        self.counts = {}
+        for day, tool, n in self.store.rollup(first.isoformat()):
+            d = datetime.date.fromisoformat(day)
+            if d <= max(hi, self.today):
+                c = self.counts.setdefault(d, {}); c[tool] = c.get(tool, 0) + n
+        for key in self.canvases:
+            self.full_draw(key)
+        self.load_runs()
+
+    def run_window(self):
+        # 所选区间对应的时间戳范围 [since, until)
+        lo, hi = self.span()
+        return (time.mktime(lo.timetuple()),
+                time.mktime((hi + datetime.timedelta(days=1)).timetuple()))
+
+    @staticmethod
+    def read_runs(since, until):
+        return list(RunLog().records(since, until))
+
+    def load_runs(self):
+        # 读取期间到达的运行记录先放在 runs_extra，读完后补上文件里还没有的
+        self.runs_seq += 1
+        self.runs_extra = []
+        seq = self.runs_seq
+        run_in_background(self.read_runs, *self.run_window(),
+                          on_done=lambda recs: self.on_runs_loaded(seq, recs))
+
+    def on_runs_loaded(self, seq, recs):
+        if seq != self.runs_seq:                     # 区间又变了，等最新的一次
+            return
+        seen = {(r.get("tool"), r.get("start")) for r in recs}
+        self.run_records = recs + [r for r in self.runs_extra if (r["tool"], r["start"]) not in seen]
+        self.runs_extra = []
+        self.refresh_runs()
+
+    def on_launch(self, tool):
+        if datetime.date.today() != self.today:      # 跨天了：日期轴整体变化，重新加载
+            return self.reload()
+        c = self.counts.setdefault(self.today, {}); c[tool] = c.get(tool, 0) + 1
+        lo, hi = self.span()
+        self.dirty |= {"top5", "trend7"} | ({"range"} if lo <= self.today <= hi else set())
+        self.redraw_timer.start()
+
+    def on_run(self, rec):
+        since, until = self.run_window()
+        if not since <= rec["start"] < until:
+            return
+        self.run_records.append(rec)
+        self.runs_extra.append(rec)
+        self.dirty.add("runs")
+        self.redraw_timer.start()
+
+    def series(self, key):
+        if key == "top5":
+            ranked = sorted(self.counts.get(self.today, {}).items(), key=lambda kv: -kv[1])[:5]
+            return [k for k, _ in ranked], [v for _, v in ranked]
+        lo, hi = (self.today - datetime.timedelta(days=6), self.today) if key == "trend7" else self.span()
+        days = [lo + datetime.timedelta(days=i) for i in range((hi - lo).days + 1)]
+        return days, [sum(self.counts.get(d, {}).values()) for d in days]
+
+    # —— 绘制 ——
+    def title(self, key):
+        if key == "range":
+            lo, hi = self.span()
+            return self.L["trend30"] if (hi - lo).days == 29 and hi == self.today else f"{lo} ~ {hi}"
+        return self.L["today_top5" if key == "top5" else "trend7"]
+
+    def full_draw(self, key):
+        c = self.canvases[key]; ax = c.figure.axes[0]
+        ax.clear()
+        xs, ys = self.series(key)
+        if key == "top5":
+            artists = list(ax.bar(xs, ys))
+            self.top5_labels = xs
+        else:
+            artists = ax.plot(range(len(xs)), ys, marker="o")
+            step = max(1, len(xs) // 10)
+            ax.set_xticks(range(0, len(xs), step))
+            ax.set_xticklabels([d.strftime("%m-%d") for d in xs[::step]])
+        ax.set_ylim(0, max(ys, default=0) * 1.2 + 1)   # 留出余量，增量更新多半不用改刻度
+        ax.set_title(self.title(key)); ax.grid(True, linestyle='--', alpha=0.5)
+        for a in artists: a.set_animated(True)
+        self.animated[key] = artists
+        c.figure.tight_layout()
+        c.draw_idle()
+
+    def on_draw(self, key):
+        # 完整重绘后记下不含动态图元的背景，再把动态图元画上去
+        c = self.canvases[key]
+        self.backgrounds[key] = c.copy_from_bbox(c.figure.bbox)
+        for a in self.animated.get(key, []):
+            a.axes.draw_artist(a)
+
+    def redraw(self):
+        dirty, self.dirty = self.dirty, set()
+        if "runs" in dirty:
+            self.refresh_runs()
+        for key in dirty & set(self.canvases):
+            c = self.canvases[key]; ax = c.figure.axes[0]
+            xs, ys = self.series(key)
+            fits = max(ys, default=0) < ax.get_ylim()[1] and key in self.backgrounds
+            if key == "top5" and xs != self.top5_labels:
+                fits = False                          # 排名变了，柱子本身要换
+            if not fits:
+                self.full_draw(key); continue
+            if key == "top5":
+                for bar, y in zip(self.animated[key], ys): bar.set_height(y)
+            else:
+                self.animated[key][0].set_ydata(ys)
+            c.restore_region(self.backgrounds[key])
+            for a in self.animated[key]:
+                ax.draw_artist(a)
+            c.blit(c.figure.bbox)
+
+    def refresh_runs(self):
+        rows = summarize(self.run_records)
+        fmt = {"wall_p50": "{:.2f}s", "wall_p95": "{:.2f}s", "spawn_p50": "{:.0f}ms"}
+        self.run_table.setRowCount(len(rows))
+        for i, r in enumerate(rows):
+            for c, k in enumerate(self.RUN_COLS):
+                v = r[k]
+                if v is None: text = ""
+                elif k.startswith("rss"): text = f"{v / 1024:.1f} MB"
+                else: text = fmt.get(k, "{}").format(v)
+                self.run_table.setItem(i, c, QTableWidgetItem(text))
+
+    def export_runs(self):
+        f, kind = QFileDialog.getSaveFileName(self, self.L["run_export"], "run_records.csv", "CSV (*.csv);;JSONL (*.jsonl)")
+        if not f: return
+        (export_jsonl if f.endswith(".jsonl") or "jsonl" in kind.lower() else export_csv)(self.run_records, f)
 
 # 设置对话框
 class SettingsDialog(QDialog):
@@ -210,6 +347,30 @@ class SettingsDialog(QDialog):
         #在这里插入Java 解释器路径
         self.java_path_edit = QLineEdit(settings.get("java_path", "java"))
         layout.addRow("Java 执行器路径", self.java_path_edit)
+        # 命令行输出
+        self.enc_cb = QComboBox(); self.enc_cb.setEditable(True)
+        self.enc_cb.addItems(["", "utf-8", "gbk", "gb18030", "latin-1"])
+        self.enc_cb.setCurrentText(settings.get("cli_encoding", "")); layout.addRow(L["cli_encoding"], self.enc_cb)
+        self.scrollback_spin = QSpinBox(); self.scrollback_spin.setRange(1000, 1000000)
+        self.scrollback_spin.setValue(settings.get("cli_scrollback", 10000))
+        layout.addRow(L["cli_scrollback"], self.scrollback_spin)
+        # 可执行程序的启动限额（0 表示不限）
+        h = QHBoxLayout(); self.max_run_spin, self.max_cat_spin = QSpinBox(), QSpinBox()
+        self.max_run_spin.setRange(0, 64); self.max_cat_spin.setRange(0, 64)
+        self.max_run_spin.setValue(settings.get("max_running", 0))
+        self.max_cat_spin.setValue(settings.get("max_per_category", 0))
+        h.addWidget(self.max_run_spin); h.addWidget(QLabel(L["proc_per_cat"])); h.addWidget(self.max_cat_spin)
+        layout.addRow(L["proc_max"], h)
+        self.mem_spin = QSpinBox(); self.mem_spin.setRange(0, 1 << 20); self.mem_spin.setSuffix(" MB")
+        self.mem_spin.setValue(settings.get("memory_budget_mb", 0))
+        layout.addRow(L["proc_budget"], self.mem_spin)
+        # 工具目录存储，下次启动时自动迁移
+        self.backend_cb = QComboBox()
+        for key in ("json", "sqlite"):
+            self.backend_cb.addItem(L["backend_" + key], key)
+        self.backend_cb.setCurrentIndex(max(0, self.backend_cb.findData(settings.get("catalog_backend", "json"))))
+        self.backend_cb.setToolTip(L["backend_tip"])
+        layout.addRow(L["catalog_backend"], self.backend_cb)
         # 按钮
         bb = QDialogButtonBox(QDialogButtonBox.Ok|QDialogButtonBox.Cancel)
         bb.button(QDialogButtonBox.Ok).setText(L["ok"]); bb.button(QDialogButtonBox.Cancel).setText(L["cancel"])
@@ -217,7 +378,7 @@ class SettingsDialog(QDialog):
 
     def get_settings(self):
         rev = {self.L["light"]:"Light", self.L["dark"]:"Dark", self.L["system"]:"System"}
-        return {
+        return {**self.settings,   # 保留对话框里没有的配置项
             "theme": rev[self.theme_cb.currentText()],
             "font_size": self.font_spin.value(),
             "window_width": self.w_spin.value(),
@@ -225,13 +386,31 @@ class SettingsDialog(QDialog):
             "language": self.lang_cb.currentText(),
             "python_path": self.python_path_edit.text().strip(),   # 新增
             "java_path": self.java_path_edit.text().strip(),  # 新增
+            "cli_encoding": self.enc_cb.currentText().strip(),
+            "cli_scrollback": self.scrollback_spin.value(),
+            "max_running": self.max_run_spin.value(),
+            "max_per_category": self.max_cat_spin.value(),
+            "memory_budget_mb": self.mem_spin.value(),
+            "catalog_backend": self.backend_cb.currentData(),
         }
 
 # 命令行工具对话框，实时输出
+# 输出先进 OutputBuffer（增量解码 + 落盘），由定时器每 100ms 批量刷到界面；
+# 界面只保留 scrollback 行，完整输出在 run_history 下的日志文件里
 class CommandLineDialog(QDialog):
-    def __init__(self, exe, script, default_args, L):
+    def __init__(self, exe, script, default_args, L, name=None, encoding=None, scrollback=10000, warm_pool=None,
+                 jvm=None, jvm_exe=None, cache=None, monitor=None):
         super().__init__(); self.L=L
+        self.monitor, self.run_rec = monitor, None     # 每次运行一条运行记录
+        self.cache, self.cache_key = cache, None   # 开启结果缓存时，相同输入直接回放上次的输出
+        self.warm_pool = warm_pool  # 开启预热时从池里取已启动的解释器运行脚本
+        self.jvm, self.jvm_exe = jvm, jvm_exe    # 开启常驻 JVM 时在启动器 JVM 里运行 jar/类
+        self.jvm_run = None
+        self.run_seq = 0                # 每点一次运行加一，后台查缓存回来时据此丢弃过时的结果
         self.script = script        # ← 新增：保存脚本路径
+        self.name = name or os.path.basename(script or exe)
+        self.encoding = encoding
+        self.buffer = None
         self.setWindowTitle(L["cli_title"]); self.resize(600,400)
         layout = QVBoxLayout(self)
         # 参数
@@ -241,34 +420,167 @@ class CommandLineDialog(QDialog):
         h.addWidget(self.arg_edit)
         run_btn = QPushButton(L["cli_run"]); run_btn.clicked.connect(self.run_cmd)
         h.addWidget(run_btn)
+        self.force = QCheckBox(L["cache_force"]); self.force.setVisible(cache is not None)
+        h.addWidget(self.force)
         layout.addLayout(h)
         # 输出
         self.out_view = QPlainTextEdit(); self.out_view.setReadOnly(True)
+        self.out_view.setMaximumBlockCount(scrollback)
+        self.out_view.setUndoRedoEnabled(False)
         layout.addWidget(self.out_view)
-        # QProcess
-        self.process = QProcess(self)
-        self.process.setProcessChannelMode(QProcess.MergedChannels)
-        self.process.readyReadStandardOutput.connect(self.on_ready_read)
-        self.process.finished.connect(self.on_finished)
+        self.log_label = QLabel(); self.log_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        h = QHBoxLayout(); h.addWidget(self.log_label, 1)
+        h.addWidget(QPushButton(L["hist_title"], clicked=self.open_history))
+        layout.addLayout(h)
+        self.flush_timer = QTimer(self); self.flush_timer.setInterval(100)
+        self.flush_timer.timeout.connect(self.flush_output)
+        # QProcess：每次运行一个新进程（冷启动或从预热池取）
+        self.process = None
         self.exe = exe
 
+    def open_history(self):
+        self.history = RunHistoryDialog(self.L, self.name, self.encoding, parent=self)
+        self.history.show()
+
+    def use_process(self, p):
+        old, self.process = self.process, p
+        if old is not None:
+            for sig in (old.readyReadStandardOutput, old.finished, old.errorOccurred):
+                sig.disconnect()
+            old.deleteLater()
+        p.setParent(self)
+        p.setProcessChannelMode(QProcess.MergedChannels)
+        p.readyReadStandardOutput.connect(self.on_ready_read)
+        p.finished.connect(self.on_finished)
+        p.errorOccurred.connect(self.on_error)
+
     def run_cmd(self):
-        if self.process.state() != QProcess.NotRunning:
+        if self.process is not None and self.process.state() != QProcess.NotRunning:
             self.process.kill()
             self.process.waitForFinished()
             self.out_view.appendPlainText("\n--- 进程被中断 ---\n")
+        if self.jvm_run is not None and not self.jvm_run.done:
+            self.jvm_run.kill()
+        if self.run_rec is not None:                    # 被打断的上一次运行
+            self.monitor.finish(self.run_rec, None, self.buffer.total_bytes if self.buffer else None)
+            self.run_rec = None
         self.out_view.clear()
-        parts = self.arg_edit.text().split()
+        parts = self.run_parts = self.arg_edit.text().split()
         # 真正的启动参数：先插入 script，再加上用户输入的 parts
         args = (self.script.split() if self.script else []) + parts
-        self.process.start(self.exe, args)
+        self.cache_key = None
+        self.run_seq += 1
+        if self.cache is not None:
+            # 算键（读解释器和参数文件取指纹）与读缓存都在后台做，回来再决定回放还是启动
+            seq = self.run_seq
+            run_in_background(self.cache.lookup, self.exe, args, self.force.isChecked(),
+                              on_done=lambda r: self.on_lookup(seq, parts, args, *r),
+                              on_error=lambda e: self.on_lookup(seq, parts, args, None, None))
+            return
+        self.start_run(parts, args)
+
+    def on_lookup(self, seq, parts, args, key, hit):
+        if seq != self.run_seq:                         # 期间又点了运行
+            return
+        self.cache_key = key
+        if hit is not None:
+            if self.monitor:
+                rec = self.monitor.begin(self.name, "cache"); self.monitor.spawned(rec)
+                self.monitor.finish(rec, hit[0], len(hit[1]))
+            return self.replay(*hit)
+        self.start_run(parts, args)
+
+    def start_run(self, parts, args):
+        self.buffer = OutputBuffer(self.encoding, max_pending=256 * 1024, spool=spool_path(self.name))
+        self._dropped = 0
+        self.log_label.setText(f"{self.L['cli_log']}: {os.path.abspath(self.buffer.spool_path)}")
+        self.flush_timer.start()
+        warm = self.warm_pool.take() if self.warm_pool else None
+        mode = "warm" if warm is not None else "jvm" if self.jvm is not None and self.jvm.ready() else "cold"
+        rec = self.run_rec = self.monitor.begin(self.name, mode) if self.monitor else None
+        if warm is not None:
+            # 预热进程已在等待请求：接管它，写入脚本与参数（argv、工作目录与冷启动一致）
+            self.use_process(warm)
+            warm.write(warm_request(self.script, parts))
+            if rec: self.monitor.spawned(rec, warm.processId(), lambda: None)
+            self.log_label.setText(self.log_label.text() + f"  ({self.L['cli_warm']})")
+        elif self.jvm is not None and self.jvm.ready():
+            self.jvm_run = self.jvm.run(self.jvm_exe, parts, self)
+            self.jvm_run.output.connect(self.buffer.feed)
+            self.jvm_run.finished.connect(lambda code: self.on_finished(code, QProcess.NormalExit))
+            self.jvm_run.failed.connect(self.on_jvm_failed)
+            self.log_label.setText(self.log_label.text() + f"  ({self.L['cli_jvm']})")
+            if rec: self.monitor.spawned(rec)           # 在共享的 JVM 里运行，内存不单独计
+        else:
+            p = QProcess(self)
+            self.use_process(p)
+            if rec: p.started.connect(lambda: self.monitor.spawned(rec, p.processId(), lambda: None))
+            self.process.start(self.exe, args)
+
+    def replay(self, code, data, created):
+        buf = OutputBuffer(self.encoding, max_pending=len(data) + 1)
+        buf.feed(data); buf.close()
+        self.buffer = None
+        self.out_view.setPlainText(buf.take())
+        when = datetime.datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M")
+        self.log_label.setText("⚡ " + self.L["cache_hit"].format(when=when))
+        self.out_view.appendPlainText(f"\n--- 进程结束，退出码: {code} ---\n")
 
     def on_ready_read(self):
-        data = self.process.readAllStandardOutput().data().decode(errors="ignore")
-        self.out_view.appendPlainText(data)
+        self.buffer.feed(self.process.readAllStandardOutput().data())
+
+    def flush_output(self):
+        if self.buffer is None: return
+        text = self.buffer.take()
+        if self.buffer.dropped != self._dropped:
+            text = f"\n[{self.L['cli_dropped'].format(n=self.buffer.dropped - self._dropped)}]\n" + text
+            self._dropped = self.buffer.dropped
+        if not text: return
+        bar = self.out_view.verticalScrollBar()
+        at_end = bar.value() == bar.maximum()
+        # 用独立光标追加，不打断用户在输出区的选择
+        cur = QTextCursor(self.out_view.document())
+        cur.movePosition(QTextCursor.End)
+        cur.insertText(text)
+        if at_end: bar.setValue(bar.maximum())
 
     def on_finished(self, exitCode, exitStatus):
+        self.flush_timer.stop()
+        if self.process is not None:
+            self.buffer.feed(self.process.readAllStandardOutput().data())
+        self.buffer.close()
+        self.flush_output()
         self.out_view.appendPlainText(f"\n--- 进程结束，退出码: {exitCode} ---\n")
+        if self.run_rec is not None:
+            self.monitor.finish(self.run_rec, exitCode, self.buffer.total_bytes)
+            self.run_rec = None
+        if self.cache_key and exitStatus == QProcess.NormalExit:
+            # 读落盘文件、压缩、写入都在后台；超过单条上限的按文件大小直接跳过
+            run_in_background(self.cache.put_file, self.cache_key, exitCode, self.buffer.spool_path)
+            self.cache_key = None
+
+    def on_jvm_failed(self, err):
+        # 连不上或中途断开：守护进程在后台重启，本窗口之后都走冷启动，这一次也立刻用普通 java 重跑，
+        # 不让运行因为守护进程的问题失败
+        self.flush_timer.stop()
+        self.buffer.close()
+        if self.run_rec is not None:
+            self.monitor.finish(self.run_rec, None, self.buffer.total_bytes)
+            self.run_rec = None
+        self.jvm.restart()
+        self.jvm = None
+        self.arg_edit.setText(" ".join(self.run_parts))     # 用户可能在运行期间改了参数，重跑原来那次
+        self.run_cmd()
+        self.out_view.appendPlainText("--- " + self.L["cli_jvm_failed"].format(err=err) + " ---\n")
+
+    def on_error(self, err):
+        if err == QProcess.FailedToStart:      # 启动失败不会有 finished 信号
+            self.flush_timer.stop()
+            self.buffer.close()
+            self.out_view.appendPlainText(f"{self.L['launch_error']}: {self.process.errorString()}")
+            if self.run_rec is not None:
+                self.monitor.finish(self.run_rec, -1, 0)
+                self.run_rec = None
 
 # 添加／编辑工具对话框
 class AddToolDialog(QDialog):
@@ -305,6 +617,13 @@ class AddToolDialog(QDialog):
 
         self.args = QLineEdit();           fmt.addRow(L["args"], self.args)
 
+        self.cache_results = QCheckBox(L["cache_results"]); fmt.addRow("", self.cache_results)
+        self.warm = QCheckBox(L["warm"]);  fmt.addRow("", self.warm)
+        self.preload = QLineEdit();        fmt.addRow(L["preload"], self.preload)
+        self.preload.setPlaceholderText("requests,bs4")
+        self.jvm_daemon = QCheckBox(L["jvm_daemon"]); fmt.addRow("", self.jvm_daemon)
+        self.priority = QSpinBox(); self.priority.setRange(-10, 10); fmt.addRow(L["proc_priority"], self.priority)
+
         self.doc  = QLineEdit();           fmt.addRow("说明文档", self.doc)
         fmt.addWidget(QPushButton(L["browse"], clicked=self.browse_doc))
 
@@ -334,6 +653,11 @@ class AddToolDialog(QDialog):
             self.args.setText(tool.get("args", ""))
             self.doc.setText(tool.get("doc_path", ""))
             self.desc.setPlainText(tool.get("description", ""))
+            self.warm.setChecked(bool(tool.get("warm")))
+            self.preload.setText(tool.get("preload", ""))
+            self.jvm_daemon.setChecked(bool(tool.get("jvm_daemon")))
+            self.cache_results.setChecked(bool(tool.get("cache_results")))
+            self.priority.setValue(tool.get("priority", 0))
 
         # 6) 最后根据最终的 type_cb 文本设置各控件可用性
         self.update_fields(self.type_cb.currentText())
@@ -356,6 +680,15 @@ class AddToolDialog(QDialog):
         # 参数仅在 CLI 或 命令行Python 时启用
         self.args.setEnabled(is_cli or is_py_cli or is_java_cli)
 
+        # 预热解释器仅用于命令行 Python 工具（可执行类需要脱离 IvyDock 独立运行）
+        self.warm.setEnabled(is_py_cli)
+        self.preload.setEnabled(is_py_cli)
+        self.jvm_daemon.setEnabled(is_java_cli)
+        # 结果缓存只对在窗口里运行的命令行工具有意义
+        self.cache_results.setEnabled(is_cli or is_py_cli or is_java_cli)
+        # 启动优先级只对经启动器排队的可执行类工具有效
+        self.priority.setEnabled(is_exec or is_py_exec or is_java_exec)
+
         # 文档与说明始终启用
         self.doc.setEnabled(True)
         self.desc.setEnabled(True)
@@ -379,32 +712,167 @@ class AddToolDialog(QDialog):
             "path":        self.path.text().strip(),
             "args":        self.args.text().strip(),
             "doc_path":    self.doc.text().strip(),
-            "description": self.desc.toPlainText().strip()
+            "description": self.desc.toPlainText().strip(),
+            "warm":        self.warm.isChecked() and self.warm.isEnabled(),
+            "preload":     self.preload.text().strip(),
+            "jvm_daemon":  self.jvm_daemon.isChecked() and self.jvm_daemon.isEnabled(),
+            "cache_results": self.cache_results.isChecked() and self.cache_results.isEnabled(),
+            "priority":    self.priority.value() if self.priority.isEnabled() else 0,
         }
 
 
+# 详情渲染：主线程只查缓存，Markdown 渲染和文档读取都在工作线程里做
+class DetailRenderer(QObject):
+    rendered = pyqtSignal(str, str)     # 工具 id, html
+
+    def __init__(self, L, parent=None, fill=None):
+        super().__init__(parent)
+        self.L = L
+        self.fill = fill or (lambda t: t)     # 补上延迟加载的大字段（在后台线程里调用）
+        self.cache = LRUCache(128)      # content_key -> (文档 stamp, html)
+        self.inflight = set()
+        self.pool = QThreadPool(self); self.pool.setMaxThreadCount(2)
+
+    def cached(self, t):
+        hit = self.cache.get(content_key(t))
+        return hit[1] if hit else None
+
+    def request(self, t, revalidate=False):
+        # 未命中则渲染；revalidate 时即使命中也在后台确认文档没有改过
+        key = content_key(t)
+        hit = self.cache.get(key)
+        if (hit and not revalidate) or key in self.inflight:
+            return
+        self.inflight.add(key)
+        run_in_background(self._render, dict(t), hit, pool=self.pool,
+                          on_done=lambda r: self._done(key, r),
+                          on_error=lambda e: self.inflight.discard(key))
+
+    def _render(self, t, old):
+        doc = t.get("doc_path", "")
+        if old is not None and (doc_stamp(doc) if doc else None) == old[0]:
+            return None
+        return render_detail(self.fill(t), self.L["category"])
+
+    def _done(self, key, result):
+        self.inflight.discard(key)
+        if result is not None:
+            self.cache.put(key, result)
+            self.rendered.emit(key[0], result[1])
+
+# 健康检查：路径和解释器的检查都在专用线程池里分块进行，结果按块回到主线程更新徽标
+class HealthScanner(QObject):
+    scanned = pyqtSignal(dict)          # {id: (状态, 问题, 说明)}
+    CHUNK = 64
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache = HealthCache()
+        self.generation = 0
+        self.pool = QThreadPool(self); self.pool.setMaxThreadCount(8)   # 主要在等 I/O
+
+    def scan(self, tools, settings):
+        gen, settings = self.generation, dict(settings)
+        tools = [dict(t) for t in tools]
+        for i in range(0, len(tools), self.CHUNK):
+            run_in_background(check_tools, tools[i:i + self.CHUNK], settings, I18N, self.cache, pool=self.pool,
+                              on_done=lambda r, g=gen: g == self.generation and self.scanned.emit(r))
+
+    def recheck(self, t, settings):
+        self.cache.forget(t.get("path", ""), t.get("doc_path", ""))
+        self.scan([t], settings)
+
+    def check_now(self, t, settings):
+        # 启动前同步复查单个工具，不信任缓存的结果：几次 stat，解释器版本按 mtime 缓存，通常不必重新探测
+        self.cache.forget(t.get("path", ""), t.get("doc_path", ""),
+                          settings.get("python_path", "python"), settings.get("java_path", "java"))
+        r = check_tool(t, settings, I18N, self.cache)
+        self.scanned.emit({t["id"]: r})
+        return r
+
+    def reset(self):
+        # 解释器设置改了：丢掉缓存，未完成的旧结果也不再采用
+        self.generation += 1
+        self.cache.clear()
+
 # 主界面
 class ToolManager(QWidget):
+    launched = pyqtSignal(str)          # 每次启动工具（仪表盘据此增量更新）
+    write_failed = pyqtSignal(str, str) # 后台写盘失败：路径, 错误（快照保留、稍后重试）
+
     def __init__(self):
         super().__init__()
         # ← 新增：在窗体创建时设置窗口图标
         icon_path = os.path.join(os.path.dirname(__file__), 'icon.png')
         if os.path.isfile(icon_path):
             self.setWindowIcon(QIcon(icon_path))
-        self.settings = load_json(SETTINGS_FILE, DEFAULT_SETTINGS)
+        self.settings = load_json(SETTINGS_FILE, DEFAULT_SETTINGS, repair=True)
+        PROFILE.mark("settings load")
         apply_theme(QApplication.instance() or QApplication(sys.argv), self.settings)
         # ✅ 插入以下初始化代码
-        if not os.path.exists(TOOLS_FILE):
-            save_json(TOOLS_FILE, [])
         if not os.path.exists(SETTINGS_FILE):
             save_json(SETTINGS_FILE, DEFAULT_SETTINGS)
-        if not os.path.exists(USAGE_LOG):
-            save_json(USAGE_LOG, [])
         self.L = I18N[self.settings["language"]]
         self.setWindowTitle(self.L["app_title"])
         self.resize(self.settings["window_width"], self.settings["window_height"])
-        self.tools_data = load_json(TOOLS_FILE, [])
+        # 目录与设置的修改先记下，由后台线程合并写盘；退出前写完
+        self.writer = DebouncedWriter(on_error=self.write_failed.emit)
+        self.write_failed.connect(lambda path, err: QMessageBox.warning(
+            self, self.L["app_title"], f"{self.L['write_failed']}\n\n{path}: {err}"))
+        QApplication.instance().aboutToQuit.connect(self.before_quit)
+        self.warm_pools = WarmPools(parent=self)
+        QApplication.instance().aboutToQuit.connect(self.warm_pools.shutdown)
+        self._jvm_daemons = None
+        self.monitor = RunMonitor(parent=self)      # 运行记录：启动延迟、耗时、峰值内存等
+        # 可执行类工具统一经启动器排队启动（并发数、内存预算）
+        self.supervisor = Supervisor(self.settings, self.monitor, parent=self)
+        self.supervisor.failed.connect(lambda tool, msg: QMessageBox.warning(self, self.L["launch_error"], f"{tool}\n{msg}"))
+        self.process_panel = None
+        # 快速启动面板按 frecency 排序：首次绘制后从日汇总初始化，之后每次启动增量更新
+        self.frecency = Frecency(self.settings.get("frecency_half_life_days", 14))
+        self.quick_palette = None
+        # 目录存储：json（tools_data.json）或 sqlite（tools.db，按工具逐条读写，说明等大字段用到时再取）
+        self.catalog = open_catalog_store(self.settings.get("catalog_backend", "json"), writer=self.writer)
+        self.tools_data = self.catalog.load()
+        PROFILE.mark("catalog load")
         self.init_ui()
+        self.init_watch()
+        PROFILE.mark("tree build")
+        self._painted = False
+
+    def event(self, e):
+        # 第一次绘制之后再做索引、预热等后台准备工作，不占用首屏时间
+        if e.type() == QEvent.Paint and not self._painted:
+            self._painted = True
+            QTimer.singleShot(0, self.after_first_paint)
+        return super().event(e)
+
+    def after_first_paint(self):
+        PROFILE.mark("first paint")
+        PROFILE.report()
+        self.rebuild_index()
+        self.doc_timer.start()
+        self.health.scan(self.tools_data, self.settings)
+        self.health_timer.start()
+        self.prewarm()
+        run_in_background(self.load_frecency, list(usage_store().rollup()), on_done=self.on_frecency_loaded)
+        self.prune_history()
+        if recovery_log:
+            QMessageBox.warning(self, self.L["app_title"], "\n\n".join([self.L["recovered"]] + recovery_log))
+
+    def prune_history(self, names=None):
+        # 运行输出保留期：启动时清理全部工具，之后每次启动某个工具时清理它的目录
+        run_in_background(prune_history, self.settings.get("run_history_keep", 100),
+                          self.settings.get("run_history_days", 0), names)
+
+    @property
+    def jvm_daemons(self):
+        # QtNetwork 只有用到常驻 JVM 时才加载
+        if self._jvm_daemons is None:
+            from ivylib.jvm_daemon import JvmDaemons
+            self._jvm_daemons = JvmDaemons(self)
+            QApplication.instance().aboutToQuit.connect(self._jvm_daemons.shutdown)
+        return self._jvm_daemons
 
     def init_ui(self):
         main = QVBoxLayout(self)
@@ -415,20 +883,36 @@ class ToolManager(QWidget):
         tb = QToolButton(); tb.setText("☰"); tb.setPopupMode(QToolButton.MenuButtonPopup)
         tb.clicked.connect(self.toggle_sidebar)
         menu = QMenu(tb); menu.addAction(self.L["settings"], self.open_settings)
+        menu.addAction(self.L["pipe_new"], lambda: self.open_pipeline(None))
+        menu.addAction(self.L["import_title"], self.open_import)
+        menu.addAction(self.L["hist_title"], lambda: self.open_history(None))
+        menu.addAction(self.L["proc_title"], self.open_processes)
+        menu.addAction(self.L["palette_title"], self.open_palette)
         menu.addAction(self.L["about"], self.open_about); tb.setMenu(menu)
         hb.addWidget(tb); hb.addWidget(QLabel(self.L["app_title"])); hb.addStretch()
         self.search = QLineEdit(); self.search.setPlaceholderText(self.L["search"])
-        self.search.textChanged.connect(self.on_search); hb.addWidget(self.search)
+        self.search.textChanged.connect(lambda _: self.search_timer.start())
+        hb.addWidget(self.search)
+        # 快速启动：应用内全局快捷键，命令行窗口等子窗口里也有效
+        key = QShortcut(QKeySequence(self.settings.get("palette_shortcut", "Ctrl+K")), self, self.open_palette)
+        key.setContext(Qt.ApplicationShortcut)
+        # 输入防抖：停止输入 150ms 后才检索
+        self.search_timer = QTimer(self); self.search_timer.setSingleShot(True); self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(lambda: self.on_search(self.search.text()))
         ml.addLayout(hb)
         # 内容区
         self.splitter = QSplitter(Qt.Horizontal)
         # 左侧
         left = QWidget(); ll = QVBoxLayout(left)
         ll.addWidget(QPushButton(self.L["add_tool"], clicked=self.show_add))
-        self.tree = QTreeWidget(); self.tree.setHeaderLabels([self.L["name"], ""])
-        self.tree.setColumnHidden(1, True)
-        self.tree.itemClicked.connect(self.on_item)
-        self.tree.itemDoubleClicked.connect(self.on_double)
+        self.model = ToolModel(self.tools_data, self.L["name"], self)
+        self.tools_data = self.model.tools      # 此后目录以模型为准（按目录顺序的实时视图）
+        self.proxy = ToolFilterProxy(self); self.proxy.setSourceModel(self.model)
+        self.tree = QTreeView(); self.tree.setModel(self.proxy)
+        self.tree.setUniformRowHeights(True)
+        self.tree.selectionModel().currentChanged.connect(lambda cur, _: self.on_item(cur))
+        self.tree.doubleClicked.connect(self.on_double)
+        self.proxy.rowsInserted.connect(self.on_rows_inserted)
         self.tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.on_context)
         ll.addWidget(self.tree); self.splitter.addWidget(left)
@@ -436,13 +920,180 @@ class ToolManager(QWidget):
         right = QWidget(); rl = QVBoxLayout(right)
         self.detail_title = QLabel(self.L["select_detail"]); self.detail_title.setStyleSheet("font-size:20px;")
         self.detail_text = QTextEdit(); self.detail_text.setReadOnly(True)
+        self.current_id = None
+        self.renderer = DetailRenderer(self.L, self, fill=self.catalog.full)
+        self.renderer.rendered.connect(self.on_rendered)
         rl.addWidget(self.detail_title); rl.addWidget(self.detail_text); self.splitter.addWidget(right)
         ml.addWidget(self.splitter)
-        # Tabs
+        # Tabs：仪表盘页先放空容器，第一次切换过去时才创建
         tabs.addTab(mgr, self.L["app_title"])
-        tabs.addTab(Dashboard(self.L), self.L["recent_usage"])
+        self.dash_page = QWidget(); QVBoxLayout(self.dash_page).setContentsMargins(0, 0, 0, 0)
+        self.dashboard = None
+        tabs.addTab(self.dash_page, self.L["recent_usage"])
+        tabs.currentChanged.connect(lambda i: tabs.widget(i) is self.dash_page and self.show_dashboard())
         main.addWidget(tabs)
-        self.refresh_tree()
+        self.tree.expandAll()
+        # 检索索引在首次绘制后于后台建立，建好前搜索退回子串匹配；说明文档每 30 秒检查一次是否被修改
+        self.index, self._index_dirty = None, False
+        self.doc_timer = QTimer(self); self.doc_timer.setInterval(30000)
+        self.doc_timer.timeout.connect(self.check_docs)
+        # 健康状态首次绘制后全量扫描一次，之后每 5 分钟复查（TTL 内的路径直接用缓存）
+        self.health = HealthScanner(self)
+        self.health.scanned.connect(self.model.set_health)
+        self.health_timer = QTimer(self); self.health_timer.setInterval(300000)
+        self.health_timer.timeout.connect(lambda: self.health.scan(self.tools_data, self.settings))
+
+    def show_dashboard(self):
+        # 第一次切换时创建；之后每次切换回来重新查一次日汇总，补上命令行等其他进程的记录
+        if self.dashboard is None:
+            self.dashboard = Dashboard(self.L, self.launched, self.monitor.recorded)
+            self.dash_page.layout().addWidget(self.dashboard)
+        else:
+            self.dashboard.reload()
+
+    def log_usage(self, name):
+        log_usage(name)
+        self.frecency.bump(name)
+        self.launched.emit(name)
+        if self.quick_palette is not None:
+            self.quick_palette.invalidate()
+
+    def load_frecency(self, rows):
+        f = Frecency(self.settings.get("frecency_half_life_days", 14), epoch=self.frecency.epoch)
+        f.load(rows)
+        return f
+
+    def on_frecency_loaded(self, f):
+        # 汇总是在初始化开始前取的，期间的启动只记在旧对象里，合并进来
+        self.frecency = f.merge(self.frecency)
+        if self.quick_palette is not None:
+            self.quick_palette.frecency = self.frecency
+            self.quick_palette.invalidate()
+
+    def open_palette(self):
+        if self.quick_palette is None:
+            search = lambda q: self.index.search(q, limit=50) if self.index and query_terms(q) else []
+            self.quick_palette = LaunchPalette(self.L, self.tools_data, self.frecency, self.launch, search, self)
+        self.quick_palette.popup()
+
+    # —— 目录/设置文件热加载 ——
+    # 两个文件可能放在同步盘上多人共用。记下最近一次与磁盘一致的版本作为三方合并的基准，
+    # 文件变化时按 id 合并别人的修改和本地尚未写盘的修改，只把差异应用到树和索引；
+    # 两边改了同一工具的同一字段（或一边删一边改）时询问保留哪一边。sqlite 目录由数据库自己处理并发，只监视设置
+    def init_watch(self):
+        self.disk = {}                   # path -> (file_stamp, 基准版本)
+        self.synced = ([TOOLS_FILE] if self.catalog.shared else []) + [SETTINGS_FILE]
+        for path in self.synced:
+            stamp = file_stamp(path)
+            self.disk[path] = (stamp, list(self.tools_data) if path == TOOLS_FILE else dict(self.settings))
+            self.writer.adopt(path, stamp)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(lambda _: self.sync_timer.start())
+        # 原子写入（包括我们自己的）是先写临时文件再改名，被替换的文件会从监视列表里掉出去，
+        # 所以同时监视所在目录，变化时重新加上
+        self.watcher.directoryChanged.connect(lambda _: self.sync_timer.start())
+        self.sync_timer = QTimer(self); self.sync_timer.setSingleShot(True); self.sync_timer.setInterval(300)
+        self.sync_timer.timeout.connect(self.sync_files)
+        self.rewatch()
+
+    def rewatch(self):
+        paths = [os.path.abspath(p) for p in self.synced if os.path.exists(p)]
+        paths.append(os.path.dirname(os.path.abspath(SETTINGS_FILE)))
+        missing = [p for p in paths if p not in self.watcher.files() + self.watcher.directories()]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def sync_files(self, ask=True):
+        self.rewatch()
+        for path in self.synced:
+            self.sync_file(path, ask)
+
+    def sync_file(self, path, ask=True):
+        stamp = file_stamp(path)
+        known, base = self.disk[path]
+        if stamp is None or (stamp == known and path not in self.writer.stale):
+            return
+        catalog = path == TOOLS_FILE
+        theirs = peek_json(path, [] if catalog else {})
+        if theirs is None:               # 同步工具写到一半，写完还会再通知
+            return
+        if theirs == self.writer.written.get(path):     # 自己刚写的
+            self.disk[path] = (stamp, theirs)
+            self.writer.adopt(path, stamp)
+            return
+        fixed = catalog and ensure_tool_ids(theirs)
+        ours = self.tools_data if catalog else self.settings
+        merge = merge_tools if catalog else merge_fields
+        merged, conflicts = merge(base, ours, theirs)
+        if conflicts and ask and not self.keep_ours(path, conflicts):
+            merged, _ = merge(base, ours, theirs, prefer="theirs")
+        self.disk[path] = (stamp, theirs)
+        self.writer.adopt(path, stamp)
+        if catalog:
+            self.apply_catalog(merged)
+        else:
+            self.apply_settings(merged)
+        if fixed or merged != theirs:    # 本地还有对方没有的修改：合并结果写回
+            if catalog:
+                self.catalog.save(self.tools_data)
+            else:
+                self.writer.schedule(path, ours)
+
+    def keep_ours(self, path, conflicts):
+        lines = [f"{c[1]}: {c[2] or self.L['sync_deleted']}" if isinstance(c, tuple) else c for c in conflicts]
+        text = self.L["sync_conflict"].format(path, "\n".join(lines[:20]) + ("\n…" if len(lines) > 20 else ""))
+        return QMessageBox.question(self, self.L["app_title"], text) == QMessageBox.Yes
+
+    def apply_catalog(self, merged):
+        added, removed, changed = diff_tools(self.tools_data, merged)
+        for tid in removed:
+            self.model.remove_tool(tid)
+        for t in changed:
+            self.model.update_tool(t["id"], t)
+        for t in added:
+            self.model.add_tool(t)
+        self.model.reorder([t["id"] for t in merged])
+        for tid in removed + [t["id"] for t in changed + added]:
+            self.index_changed(tid)
+        if changed or added:
+            self.health.scan(changed + added, self.settings)
+        if self.current_id in removed:
+            self.current_id = None
+            self.detail_title.setText(self.L["select_detail"]); self.detail_text.clear()
+        elif any(t["id"] == self.current_id for t in changed):
+            self.on_item(self.tree.currentIndex())
+
+    def apply_settings(self, new):
+        # 主题和解释器立即生效；语言、窗口尺寸等仍在下次启动时生效
+        apply_theme(QApplication.instance(), new)
+        changed = any(new.get(k) != self.settings.get(k) for k in ("python_path", "java_path"))
+        self.settings.clear(); self.settings.update(new)
+        if changed:
+            self.health.reset()
+            self.health.scan(self.tools_data, self.settings)
+
+    def before_quit(self):
+        # 还在排队的启动不能悄悄丢掉：列出来，让用户选择立即全部启动或放弃
+        queued = self.supervisor.queued()
+        if queued:
+            box = QMessageBox(QMessageBox.Question, self.L["app_title"],
+                              self.L["proc_quit_queued"].format(n=len(queued)) + "\n\n" + "\n".join(j.tool for j in queued),
+                              QMessageBox.Discard, None)
+            start = box.addButton(self.L["proc_start_all"], QMessageBox.AcceptRole)
+            box.exec_()
+            if box.clickedButton() is start:
+                self.supervisor.start_queued()
+        # 退出前再合并一次，别人刚写入的修改不会被最后一次写盘覆盖
+        self.sync_files(ask=False)
+        failed = self.writer.flush()
+        while failed:
+            detail = "\n".join(f"{p}: {e}" for p, e in failed.items())
+            if QMessageBox.warning(None, self.L["app_title"], f"{self.L['write_failed_quit']}\n\n{detail}",
+                                   QMessageBox.Retry | QMessageBox.Discard) != QMessageBox.Retry:
+                break
+            failed = self.writer.flush()
+        self.catalog.close()
+        close_usage_store()
 
     # 回调 & 方法
     def toggle_sidebar(self):
@@ -451,30 +1102,121 @@ class ToolManager(QWidget):
         self.splitter.setSizes([0, self.width()] if vis else [300, self.width()-300])
 
     def on_search(self, text):
-        k = text.lower()
-        fl = [t for t in self.tools_data if k in t["name"].lower() or k in t["category"].lower()]
-        self.refresh_tree(fl)
-
-    def on_item(self, it, _):
-        info = it.data(1, Qt.DisplayRole)
-        if not info: return
-        t = json.loads(info)
-        md = f"# {t['name']}\n\n- **{self.L['category']}**: {t['category']}\n\n{t.get('description','')}"
-        self.detail_title.setText(t["name"])
-        self.detail_text.setHtml(markdown.markdown(md, extensions=["fenced_code","tables"]))
+        # 查询里没有可检索的词（如只有符号）时仍按子串过滤
+        ranked = self.index.search(text) if self.index and query_terms(text) else None
+        self.proxy.set_key(text, ranked)
+        self.tree.expandAll()
 
-    def on_double(self, it, _):
-        info = it.data(1, Qt.DisplayRole)
-        if not info:
+    def rebuild_index(self):
+        self._index_dirty = False
+        run_in_background(build_search_index, [dict(t) for t in self.tools_data],
+                          usage_totals(usage_store()), self.catalog, on_done=self.on_index_built)
+
+    def on_index_built(self, index):
+        if self._index_dirty:        # 建索引期间目录又改过，重新建一次
+            return self.rebuild_index()
+        self.index = index
+        if self.search.text():
+            self.on_search(self.search.text())
+
+    def index_changed(self, tid):
+        # 工具增删改后增量更新索引
+        if self.quick_palette is not None:
+            self.quick_palette.invalidate()
+        if self.index is None:
+            self._index_dirty = True
+        elif tid in self.model.by_id:
+            self.index_tool(tid)
+        else:
+            self.index.remove(tid)
+        if self.search.text():
+            self.search_timer.start()
+
+    def check_docs(self):
+        if self.index is not None:
+            run_in_background(self.index.stale_docs, on_done=self.reload_docs)
+
+    def reload_docs(self, stale):
+        for tid, _ in stale:
+            if tid in self.model.by_id:
+                self.index_tool(tid)
+
+    def index_tool(self, tid):
+        # 读说明文档（sqlite 目录还要取大字段）放到后台，读完回到主线程更新索引
+        src = self.model.by_id[tid]
+        run_in_background(self.read_for_index, dict(src), on_done=lambda r: self.on_doc_read(src, *r))
+
+    def read_for_index(self, t):
+        t = self.catalog.full(t)
+        return (t, *read_doc(t.get("doc_path", "")))
+
+    def on_doc_read(self, src, t, mtime, text):
+        # 读的期间工具被删或又改过（编辑会整体替换字典）就丢弃，最新那次的读取随后会到
+        if self.index is None or self.model.by_id.get(t["id"]) is not src:
             return
-        t = json.loads(info)
-        log_usage(t["name"])
+        self.index.add(t, doc_text=text, mtime=mtime)
+        if self.search.text():
+            self.search_timer.start()
+
+    def on_rows_inserted(self, parent, first, last):
+        # 新出现的分类默认展开，与原来 expandAll 的效果一致
+        if not parent.isValid():
+            for row in range(first, last + 1):
+                self.tree.expand(self.proxy.index(row, 0))
+
+    def tool_at(self, index):
+        return self.model.tool(self.proxy.mapToSource(index))
+
+    def on_item(self, index):
+        t = self.tool_at(index)
+        if not t: return
+        self.current_id = t["id"]
+        self.detail_title.setText(t["name"])
+        self.detail_text.setHtml(self.renderer.cached(t) or "")
+        self.renderer.request(t, revalidate=True)
+        # 预取上下相邻的工具，方向键/连续点击切换时直接命中缓存
+        up = down = index
+        for _ in range(2):
+            up, down = self.tree.indexAbove(up), self.tree.indexBelow(down)
+            for n in (self.tool_at(up), self.tool_at(down)):
+                if n: self.renderer.request(n)
+
+    def on_rendered(self, tid, html):
+        if tid == self.current_id:
+            self.detail_text.setHtml(html)
+
+    def on_double(self, index):
+        t = self.tool_at(index)
+        if t:
+            self.launch(t)
+
+    def launch(self, t):
+        # 双击和快速启动面板共用
+        h = self.model.health.get(t["id"])
+        if h and h[0] == BAD:
+            # 缓存的结果可能已过时（文件刚放回去、解释器刚装好）：先复查一次，仍不行再让用户决定
+            h = self.health.check_now(t, self.settings)
+            if h[0] == BAD:
+                box = QMessageBox(QMessageBox.Warning, self.L["launch_error"],
+                                  "\n".join([self.L["tool_broken"]] + h[1]), QMessageBox.Cancel, self)
+                anyway = box.addButton(self.L["launch_anyway"], QMessageBox.AcceptRole)
+                box.exec_()
+                if box.clickedButton() is not anyway:
+                    return
+        self.log_usage(t["name"])
+        self.prune_history([t["name"]])
+        if self.index is not None:
+            self.index.usage[t["name"]] = self.index.usage.get(t["name"], 0) + 1
         typ = t["type"]
         exe = t.get("path", "")
         default_args = t.get("args", "").split()
         url = t.get("url", "")
         doc = t.get("doc_path", "")
 
+        # 流水线：打开编辑/运行窗口并直接运行
+        if type_key(typ, I18N) == "opt_pipeline":
+            return self.open_pipeline(t, run=True)
+
         # 1. 网站类型
         if typ == self.L["opt_website"] and url:
             webbrowser.open(url)
@@ -484,23 +1226,20 @@ class ToolManager(QWidget):
 
         # 2. 普通命令行工具
         if typ == self.L["opt_cli"] and exe and os.path.isfile(exe):
-            # exe 就是可执行路径，script 设为 None
-            self.cli_dialog = CommandLineDialog(exe, None, default_args, self.L)
+            # exe 就是可执行路径，script 设为 None；.ps1/.sh 这类脚本交给解释器，脚本作为 script 参数
+            runner = script_runner(exe)
+            program, script = (runner[0], " ".join(runner[1] + [exe])) if runner else (exe, None)
+            self.cli_dialog = CommandLineDialog(program, script, default_args, self.L, **self.cli_options(t))
             self.cli_dialog.show()
             if doc and os.path.isfile(doc):
                 os.startfile(doc)
             return
 
         # 3. 可执行程序
-        import subprocess
         if typ == self.L["opt_exec"] and exe and os.path.isfile(exe):
             try:
-                # 设置启动目录为工具所在路径
-                cwd = os.path.dirname(exe)
-                subprocess.Popen(exe, cwd=cwd)
-            except Exception as e:
-                QMessageBox.warning(self, self.L["launch_error"], str(e))
-
+                # 设置启动目录为工具所在路径（脚本类的经 build_command 换成解释器启动）
+                self.start_detached(t, *build_command(t, "opt_exec", self.settings, []))
             except Exception as e:
                 QMessageBox.warning(self, self.L["launch_error"], str(e))
             if doc and os.path.isfile(doc):
@@ -511,7 +1250,8 @@ class ToolManager(QWidget):
         if typ == self.L["opt_py_cli"] and exe and os.path.isfile(exe):
             python = self.settings.get("python_path", "python")
             # exe 是 .py 脚本路径，传给 script
-            self.cli_dialog = CommandLineDialog(python, exe, default_args, self.L)
+            pool = self.warm_pools.get(python, exe, t.get("preload", "")) if t.get("warm") else None
+            self.cli_dialog = CommandLineDialog(python, exe, default_args, self.L, **self.cli_options(t), warm_pool=pool)
             self.cli_dialog.show()
             if doc and os.path.isfile(doc):
                 os.startfile(doc)
@@ -522,7 +1262,7 @@ class ToolManager(QWidget):
             python = self.settings.get("python_path", "python")
             try:
                 # script 放在参数列表里同理，也可以直接双击 .exe
-                QProcess.startDetached(python, [exe] + default_args)
+                self.start_detached(t, python, [exe] + default_args)
             except Exception as e:
                 QMessageBox.warning(self, self.L["launch_error"], str(e))
             if doc and os.path.isfile(doc):
@@ -531,12 +1271,15 @@ class ToolManager(QWidget):
         # Java 命令行工具
         if typ == self.L["opt_java_cli"] and exe and os.path.isfile(exe):
             java_cmd = self.settings.get("java_path", "java")
+            jvm = self.jvm_daemons.get(java_cmd) if t.get("jvm_daemon") else None
             if exe.endswith(".jar"):
-                self.cli_dialog = CommandLineDialog(java_cmd, None, default_args, self.L)
+                self.cli_dialog = CommandLineDialog(java_cmd, None, default_args, self.L, **self.cli_options(t),
+                                                    jvm=jvm, jvm_exe=exe)
                 self.cli_dialog.script = "-jar " + exe  # ✅ 作为前缀注入，不污染用户参数栏
             else:
                 classname = os.path.splitext(os.path.basename(exe))[0]
-                self.cli_dialog = CommandLineDialog(java_cmd, None, default_args, self.L)
+                self.cli_dialog = CommandLineDialog(java_cmd, None, default_args, self.L, **self.cli_options(t),
+                                                    jvm=jvm, jvm_exe=exe)
                 self.cli_dialog.script = classname
             self.cli_dialog.show()
             if doc and os.path.isfile(doc):
@@ -548,54 +1291,152 @@ class ToolManager(QWidget):
             java_cmd = self.settings.get("java_path", "java")
             try:
                 args = ["-jar", exe] if exe.endswith(".jar") else [exe]
-                QProcess.startDetached(java_cmd, args + default_args)
+                self.start_detached(t, java_cmd, args + default_args)
             except Exception as e:
                 QMessageBox.warning(self, self.L["launch_error"], str(e))
             if doc and os.path.isfile(doc):
                 os.startfile(doc)
             return
+        # 走到这里说明没有分支能启动（多半是扫描之后文件才被删掉）
+        QMessageBox.warning(self, self.L["launch_error"], f"{self.L['tool_broken']}\n{exe or url or typ}")
+        self.health.recheck(t, self.settings)
+
+    def start_detached(self, t, program, args, cwd=None):
+        # 交给启动器排队：超过并发或内存限额时先排队，面板里可以看到
+        job = self.supervisor.submit(t["name"], t.get("category", ""), program, args, cwd, t.get("priority", 0))
+        if job.state == QUEUED:
+            self.open_processes()
+
+    def open_processes(self):
+        if self.process_panel is None:
+            self.process_panel = ProcessPanel(self.L, self.supervisor, self)
+        self.process_panel.show(); self.process_panel.raise_()
+
+    def prewarm(self):
+        # 启动后为开启预热的工具先备好解释器池
+        python = self.settings.get("python_path", "python")
+        for t in self.tools_data:
+            if t.get("warm") and type_key(t["type"], I18N) == "opt_py_cli" and os.path.isfile(t.get("path", "")):
+                self.warm_pools.get(python, t["path"], t.get("preload", ""))
+            if t.get("jvm_daemon") and type_key(t["type"], I18N) == "opt_java_cli":
+                self.jvm_daemons.get(self.settings.get("java_path", "java"))
+
+    def cli_options(self, t):
+        return {"name": t["name"], "encoding": self.settings.get("cli_encoding") or None,
+                "scrollback": self.settings.get("cli_scrollback", 10000),
+                "cache": self.result_cache() if t.get("cache_results") else None, "monitor": self.monitor}
+
+    def result_cache(self):
+        if getattr(self, "_result_cache", None) is None:
+            self._result_cache = ResultCache(max_bytes=self.settings.get("result_cache_mb", 256) << 20,
+                                             ttl=self.settings.get("result_cache_hours", 168) * 3600)
+        return self._result_cache
+
+    def open_batch(self, tid):
+        t = self.model.by_id[tid]
+        key = type_key(t["type"], I18N)
+        self.log_usage(t["name"])
+        dlg = BatchDialog(t, lambda args: build_command(t, key, self.settings, args), self.L,
+                          encoding=self.settings.get("cli_encoding") or None)
+        self.batch_dialogs = [d for d in getattr(self, "batch_dialogs", []) if d.isVisible()] + [dlg]
+        dlg.show()
+
+    def open_pipeline(self, t, run=False):
+        cli = [x for x in self.tools_data if type_key(x["type"], I18N) in CLI_TYPES]
+        dlg = PipelineDialog(self.L, cli, self.pipeline_stage, pipeline=t,
+                             encoding=self.settings.get("cli_encoding") or None,
+                             scrollback=self.settings.get("cli_scrollback", 10000), on_save=self.save_pipeline)
+        self.pipeline_dialogs = [d for d in getattr(self, "pipeline_dialogs", []) if d.isVisible()] + [dlg]
+        dlg.show()
+        if run: dlg.start()
+
+    def pipeline_stage(self, st):
+        # 一级 -> (名称, 程序, 参数, 工作目录)；参数留空时用工具自己的默认参数
+        t = self.model.by_id[st["tool"]]
+        key = type_key(t["type"], I18N)
+        if key not in CLI_TYPES:
+            raise ValueError(t["name"])
+        args = st.get("args", "")
+        return (t["name"],) + build_command(t, key, self.settings, args.split() if args.strip() else None)
+
+    def save_pipeline(self, p):
+        if p.get("id") in self.model.by_id:
+            self.model.update_tool(p["id"], {**self.model.by_id[p["id"]], **p})
+        else:
+            p.update(id=new_tool_id(), type=self.L["opt_pipeline"])
+            self.model.add_tool(dict(p))
+        self.catalog.save(self.tools_data, [self.model.by_id[p["id"]]])
+        self.index_changed(p["id"])
+        self.health.recheck(self.model.by_id[p["id"]], self.settings)
 
     def show_add(self):
         dlg = AddToolDialog(self.L)
         if dlg.exec_():
-            self.tools_data.append(dlg.get_tool_info())
-            save_json(TOOLS_FILE, self.tools_data)
-            self.refresh_tree()
+            t = {"id": new_tool_id(), **dlg.get_tool_info()}
+            self.model.add_tool(t)
+            self.catalog.save(self.tools_data, [t])
+            self.index_changed(t["id"])
+            self.health.recheck(t, self.settings)
+
+    def open_history(self, name):
+        dlg = RunHistoryDialog(self.L, name, self.settings.get("cli_encoding") or None, parent=self)
+        dlg.setAttribute(Qt.WA_DeleteOnClose)
+        dlg.show()
+
+    def open_import(self):
+        dlg = ImportDialog(self.L, [t.get("path", "") for t in self.tools_data],
+                           self.settings.get("import_roots", []), self)
+        if not dlg.exec_():
+            return
+        tools = [{"id": new_tool_id(), **t} for t in dlg.selected()]
+        for t in tools:
+            self.model.add_tool(t)
+            self.index_changed(t["id"])
+        self.settings["import_roots"] = dlg.roots()
+        self.writer.schedule(SETTINGS_FILE, self.settings)
+        if tools:
+            self.catalog.save(self.tools_data, tools)
+            self.health.scan(tools, self.settings)
 
     def on_context(self, pos):
-        it = self.tree.itemAt(pos)
-        if not it or not it.data(1, Qt.DisplayRole): return
+        t = self.tool_at(self.tree.indexAt(pos))
+        if not t: return
         menu = QMenu(self)
-        menu.addAction(self.L["edit"], lambda: self.edit_tool(it))
-        menu.addAction(self.L["delete"], lambda: self.delete_tool(it))
+        menu.addAction(self.L["edit"], lambda: self.edit_tool(t["id"]))
+        menu.addAction(self.L["delete"], lambda: self.delete_tool(t["id"]))
+        if type_key(t["type"], I18N) in CLI_TYPES:
+            menu.addAction(self.L["batch_run"], lambda: self.open_batch(t["id"]))
+        menu.addAction(self.L["health_rescan"], lambda: self.health.recheck(t, self.settings))
+        menu.addAction(self.L["hist_title"], lambda: self.open_history(t["name"]))
         menu.exec_(self.tree.mapToGlobal(pos))
 
-    def delete_tool(self, it):
-        t = json.loads(it.data(1, Qt.DisplayRole))
+    def delete_tool(self, tid):
+        t = self.model.by_id[tid]
         if QMessageBox.question(self, self.L["confirm_delete"], f"{t['name']}?") != QMessageBox.Yes:
             return
-        self.tools_data = [x for x in self.tools_data if not(x["name"]==t["name"] and x["category"]==t["category"])]
-        save_json(TOOLS_FILE, self.tools_data)
-        self.refresh_tree()
-
-    def edit_tool(self, it):
-        t = json.loads(it.data(1, Qt.DisplayRole))
-        dlg = AddToolDialog(self.L, tool=t)
+        self.model.remove_tool(tid)
+        self.catalog.save(self.tools_data, removed=[tid])
+        self.index_changed(tid)
+
+    def edit_tool(self, tid):
+        t = self.model.by_id[tid]
+        if type_key(t["type"], I18N) == "opt_pipeline":
+            return self.open_pipeline(t)
+        dlg = AddToolDialog(self.L, tool=self.catalog.full(t))
         if dlg.exec_():
-            new = dlg.get_tool_info()
-            idx = self.tools_data.index(t)
-            self.tools_data[idx] = new
-            save_json(TOOLS_FILE, self.tools_data)
-            self.refresh_tree()
+            # 合并而不是替换，保留 id 以及对话框里没有的字段
+            self.model.update_tool(tid, {**t, **dlg.get_tool_info()})
+            self.catalog.save(self.tools_data, [self.model.by_id[tid]])
+            self.index_changed(tid)
+            self.health.recheck(self.model.by_id[tid], self.settings)
 
     def open_settings(self):
         dlg = SettingsDialog(self.settings, self.L)
         if dlg.exec_():
             new = dlg.get_settings()
-            save_json(SETTINGS_FILE, new)
             QMessageBox.information(self, self.L["settings"], self.L["restart_prompt"])
-            apply_theme(QApplication.instance(), new)
-            self.settings = new
+            self.apply_settings(new)
+            self.writer.schedule(SETTINGS_FILE, self.settings)
 
     def open_about(self):
         # 中文环境
@@ -606,22 +1447,9 @@ class ToolManager(QWidget):
             text = "Version 1.0\nAuthor: zyf\nPowered by PyQt5"
         QMessageBox.information(self, self.L["about"], text)
 
-    def refresh_tree(self, filtered=None):
-        self.tree.clear()
-        groups = {}
-        for t in (filtered or self.tools_data):
-            groups.setdefault(t["category"], []).append(t)
-        for cat, tools in groups.items():
-            ci = QTreeWidgetItem([cat, ""])
-            ci.setFirstColumnSpanned(True)
-            self.tree.addTopLevelItem(ci)
-            for t in tools:
-                ni = QTreeWidgetItem([t["name"], json.dumps(t)])
-                ci.addChild(ni)
-        self.tree.expandAll()
-
 if __name__=='__main__':
     app = QApplication(sys.argv)
+    PROFILE.mark("qapplication")
     # ← 可选：全局设置 App 图标（有些平台任务栏会优先取这里的）
     icon_path = os.path.join(os.path.dirname(__file__), 'icon.png')
     if os.path.isfile(icon_path):
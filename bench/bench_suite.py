@@ -0,0 +1,319 @@
+# 合成数据规模下的热点路径基准：目录读写、建树、检索、记录使用、趋势统计、仪表盘刷新。
+# 界面相关的用例在 offscreen 平台上运行，缺 PyQt5 / matplotlib 时自动跳过。
+# 每个用例报告延迟分位数、吞吐和峰值内存（tracemalloc），结果写成 JSON，可与上一次的结果比较：
+#   python bench/bench_suite.py --out new.json [--full] [--only search,log_usage]
+#   python bench/bench_suite.py --out new.json --compare old.json --threshold 0.25   # 有退化时退出码为 1
+import os, sys, gc, json, math, time, random, argparse, platform, tempfile, tracemalloc, subprocess, datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from ivylib.config import I18N
+from ivylib.storage import load_json, save_json
+from ivylib.search import SearchIndex
+from ivylib.usage import BACKENDS, compute_trend, compute_today_top5
+from ivylib.frecency import Frecency, Ranker
+from ivylib.catalog_store import SqliteCatalogStore
+
+CATALOG_SIZES = {"quick": [100, 1000, 10000], "full": [100, 1000, 10000, 50000]}
+EVENT_SIZES = {"quick": [1000, 100000], "full": [1000, 100000, 1000000, 5000000]}
+TYPES = ("opt_cli", "opt_exec", "opt_py_cli", "opt_py_exec", "opt_java_cli", "opt_java_exec", "opt_website")
+WORDS = ("scan", "port", "web", "sql", "fuzz", "dns", "brute", "proxy", "crypto", "recon", "exploit", "shell",
+         "xss", "dir", "sub", "domain", "vuln", "pass", "hash", "log")
+
+
+# —— 合成数据 ——
+def synthetic_catalog(n, seed=1):
+    rnd = random.Random(seed)
+    L = I18N["中文"]
+    cats = [f"分类{i}" for i in range(max(5, int(math.sqrt(n))))]
+    return [{"id": f"{i:032x}", "name": f"{rnd.choice(WORDS)}{rnd.choice(WORDS)}-{i}", "type": L[rnd.choice(TYPES)],
+             "url": "", "category": rnd.choice(cats), "path": f"/opt/tools/{i}/tool{i}", "args": "-v",
+             "doc_path": "", "description": " ".join(rnd.choice(WORDS) for _ in range(12))} for i in range(n)]
+
+
+def synthetic_events(n, tools=500, days=90, seed=2):
+    rnd = random.Random(seed)
+    now = time.time()
+    step = days * 86400 / n
+    for i in range(n):
+        yield f"tool{int(rnd.paretovariate(1.2)) % tools}", now - (n - i) * step
+
+
+# —— 计时 ——
+def measure(op, runs, budget_s):
+    # 至少跑 3 次，至多 runs 次或 budget_s 秒；返回每次耗时（微秒）
+    samples, start = [], time.perf_counter()
+    for i in range(runs):
+        t0 = time.perf_counter()
+        op()
+        samples.append((time.perf_counter() - t0) * 1e6)
+        if i >= 2 and time.perf_counter() - start > budget_s:
+            break
+    return samples
+
+
+def peak_kb(setup, op):
+    # 建数据 + 执行一次的 Python 分配峰值（单独跑一遍，不影响计时）
+    gc.collect()
+    tracemalloc.start()
+    try:
+        state = setup()
+        op(state)
+    finally:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak // 1024
+
+
+def pct(sorted_samples, q):
+    return sorted_samples[min(len(sorted_samples), max(1, math.ceil(q * len(sorted_samples)))) - 1]
+
+
+def result(case, size, samples, ops_per_call=1, peak=None, **extra):
+    s = sorted(samples)
+    total = sum(s) / 1e6
+    return {"case": case, "size": size, **extra, "runs": len(s),
+            "p50_us": round(pct(s, .5), 2), "p95_us": round(pct(s, .95), 2), "p99_us": round(pct(s, .99), 2),
+            "ops_per_s": round(len(s) * ops_per_call / total, 1) if total else None, "peak_kb": peak}
+
+
+# —— 用例：make(size) 返回 (setup() -> state, op(state)[, 每次 op 包含的操作数])，在临时目录里执行 ——
+def case_catalog_save(n):
+    tools = synthetic_catalog(n)
+    return lambda: tools, lambda tools: save_json("tools_data.json", tools)
+
+
+def case_catalog_load(n):
+    save_json("tools_data.json", synthetic_catalog(n))
+    return lambda: None, lambda _: load_json("tools_data.json", [])
+
+
+def case_catalog_put_sqlite(n):
+    # 改一个工具只写一行（对照 catalog_save 的整文件写）
+    tools = synthetic_catalog(n)
+    store = SqliteCatalogStore("tools.db")
+    store.save(tools, tools)
+    it = iter(range(1 << 62))
+    return lambda: store, lambda s: s.save(tools, [dict(tools[next(it) % n], name="renamed")])
+
+
+def case_catalog_load_sqlite(n):
+    # 不含说明等大字段
+    tools = synthetic_catalog(n)
+    store = SqliteCatalogStore("tools.db")
+    store.save(tools, tools)
+    return lambda: store, lambda s: s.load()
+
+
+def case_search(n):
+    tools = synthetic_catalog(n)
+    # 每次跑完整的一组查询（前缀、多词、容错），各次样本可比
+    queries = ["scan", "sql inj", "brut", "porrt", "web proxy", "分类3", "recon dns sub"]
+
+    def setup():
+        index = SearchIndex()
+        for t in tools:
+            index.add(t, "")
+        return index
+    return setup, lambda index: [index.search(q) for q in queries], len(queries)
+
+
+def case_palette(n):
+    # 快速启动面板每次按键的排序（目标：10k 工具一帧之内）；每次跑完整的一组输入，含空查询和只能靠子序列命中的。
+    # 面板打开时的预排序（Ranker 构造）在 palette_open 里单独计
+    tools = synthetic_catalog(n)
+    queries = ["", "s", "sc", "scan", "scanp", "sqm", "zzz"]
+
+    def setup():
+        f = Frecency()
+        f.load((f"2026-01-{d:02d}", t["name"], 1 + d % 3) for d in range(1, 29) for t in tools[d::50])
+        index = SearchIndex()
+        for t in tools:
+            index.add(t, "")
+        return Ranker(tools, f), lambda q: index.search(q, limit=50)
+    return setup, lambda st: [st[0].rank(q, 20, st[1]) for q in queries], len(queries)
+
+
+def case_palette_open(n):
+    tools = synthetic_catalog(n)
+    f = Frecency()
+    f.load((f"2026-01-{d:02d}", t["name"], 1 + d % 3) for d in range(1, 29) for t in tools[d::50])
+    return lambda: None, lambda _: Ranker(tools, f)
+
+
+def case_index_build(n):
+    tools = synthetic_catalog(n)
+
+    def op(_):
+        index = SearchIndex()
+        for t in tools:
+            index.add(t, "")
+    return lambda: None, op
+
+
+def usage_cases(backend):
+    cls, fname = BACKENDS[backend]
+
+    def open_store(n):
+        store = cls(fname)
+        store.import_events(synthetic_events(n))
+        return store
+
+    def record(n):
+        store = open_store(n)
+        it = iter(range(1 << 62))
+        return lambda: store, lambda s: s.record(f"tool{next(it) % 500}")
+
+    def trend(n):
+        store = open_store(n)
+        return lambda: store, lambda s: (compute_trend(s, 30), compute_today_top5(s))
+    return record, trend
+
+
+def qt_cases():
+    # 界面路径：ToolModel 建树（代替原来的 refresh_tree）、检索过滤（on_search）、仪表盘增量刷新
+    try:
+        from PyQt5.QtWidgets import QApplication, QTreeView
+        from ivylib.tool_model import ToolModel, ToolFilterProxy
+    except ImportError:
+        return {}
+    app = QApplication.instance() or QApplication([])
+
+    def tree_build(n):
+        tools = synthetic_catalog(n)
+
+        def op(_):
+            model = ToolModel(list(tools), "name")
+            proxy = ToolFilterProxy(); proxy.setSourceModel(model)
+            view = QTreeView(); view.setUniformRowHeights(True); view.setModel(proxy)
+            view.expandAll(); app.processEvents()
+            view.deleteLater()
+        return lambda: None, op
+
+    def filter_(n):
+        tools = synthetic_catalog(n)
+        index = SearchIndex()
+        for t in tools:
+            index.add(t, "")
+        model = ToolModel(list(tools), "name")
+        proxy = ToolFilterProxy(); proxy.setSourceModel(model)
+        view = QTreeView(); view.setModel(proxy)
+        queries = ["scan", "sql", "web proxy", "dns", "fuzz", ""]
+
+        def op(_):
+            for q in queries:
+                proxy.set_key(q, index.search(q) if q else None)
+                view.expandAll(); app.processEvents()
+        return lambda: None, op, len(queries)
+
+    cases = {"tree_build": (tree_build, CATALOG_SIZES), "search_filter": (filter_, CATALOG_SIZES)}
+    try:
+        import matplotlib  # noqa: F401
+        import IvyDock
+    except ImportError:
+        return cases
+
+    def dashboard(n):
+        save_json("settings.json", {"usage_backend": "sqlite"})
+        IvyDock._usage_store = None
+        IvyDock.usage_store().import_events(synthetic_events(n))
+        dash = IvyDock.Dashboard(IvyDock.I18N["中文"])
+        for c in dash.canvases.values():
+            c.draw()                     # 记下背景，之后才能走增量（blit）路径
+        it = iter(range(1 << 62))
+
+        def op(_):
+            dash.on_launch(f"tool{next(it) % 5}")
+            dash.redraw_timer.stop(); dash.redraw()
+            app.processEvents()
+        return lambda: None, op
+
+    cases["dashboard_update"] = (dashboard, EVENT_SIZES)
+    return cases
+
+
+def all_cases():
+    cases = {"catalog_save": (case_catalog_save, CATALOG_SIZES), "catalog_load": (case_catalog_load, CATALOG_SIZES),
+             "catalog_put[sqlite]": (case_catalog_put_sqlite, CATALOG_SIZES),
+             "catalog_load[sqlite]": (case_catalog_load_sqlite, CATALOG_SIZES),
+             "index_build": (case_index_build, CATALOG_SIZES), "search": (case_search, CATALOG_SIZES),
+             "palette_open": (case_palette_open, CATALOG_SIZES), "palette_rank": (case_palette, CATALOG_SIZES)}
+    for backend in BACKENDS:
+        record, trend = usage_cases(backend)
+        cases[f"log_usage[{backend}]"] = (record, EVENT_SIZES)
+        cases[f"compute_trend[{backend}]"] = (trend, EVENT_SIZES)
+    cases.update(qt_cases())
+    return cases
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(new, old, threshold):
+    # 同一 (用例, 规模) 的 p50 或峰值内存超过基准 (1 + threshold) 倍算退化；太快的用例（<50us）噪声大，放宽到 2 倍
+    base = {(r["case"], r["size"]): r for r in old["results"]}
+    bad = []
+    for r in new["results"]:
+        o = base.get((r["case"], r["size"]))
+        if not o:
+            continue
+        limit = max(threshold, 1.0) if o["p50_us"] < 50 else threshold
+        for key in ("p50_us", "peak_kb"):
+            if o.get(key) and r.get(key) and r[key] > o[key] * (1 + limit):
+                bad.append(f"{r['case']:<26}{r['size']:>9}  {key} {o[key]} -> {r[key]} (+{r[key] / o[key] - 1:.0%})")
+    return bad
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--full", action="store_true", help="目录到 50k、事件到 5M（较慢）")
+    ap.add_argument("--only", help="只跑名称包含这些关键字的用例，逗号分隔")
+    ap.add_argument("--runs", type=int, default=200)
+    ap.add_argument("--budget", type=float, default=3.0, help="每个用例每个规模的计时上限（秒）")
+    ap.add_argument("--out", help="结果 JSON 路径")
+    ap.add_argument("--compare", help="基准结果 JSON，与本次比较")
+    ap.add_argument("--threshold", type=float, default=0.25)
+    opts = ap.parse_args()
+    tier = "full" if opts.full else "quick"
+    only = [k for k in (opts.only or "").split(",") if k]
+    out = {"meta": {"commit": git_commit(), "time": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(), "platform": platform.platform(), "tier": tier},
+           "results": []}
+    cwd = os.getcwd()
+    for name, (make, sizes) in all_cases().items():
+        if only and not any(k in name for k in only):
+            continue
+        for n in sizes[tier]:
+            with tempfile.TemporaryDirectory() as d:
+                os.chdir(d)
+                try:
+                    setup, op, *ops = make(n)
+                    state = setup()
+                    samples = measure(lambda: op(state), opts.runs, opts.budget)
+                    peak = peak_kb(setup, op) if n <= 1000000 else None   # 5M 事件下 tracemalloc 太慢
+                    r = result(name, n, samples, ops[0] if ops else 1, peak=peak)
+                finally:
+                    os.chdir(cwd)
+            out["results"].append(r)
+            print(f"{name:<26}{n:>9}  p50 {r['p50_us']:>11.1f} us  p95 {r['p95_us']:>11.1f} us  "
+                  f"{r['ops_per_s'] or 0:>10.1f} op/s  peak {r['peak_kb'] if peak is not None else '-':>8} KB", flush=True)
+    if opts.out:
+        with open(opts.out, "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False, indent=2)
+    if opts.compare:
+        with open(opts.compare, "r", encoding="utf-8") as f:
+            bad = compare(out, json.load(f), opts.threshold)
+        if bad:
+            print("\nREGRESSIONS:\n  " + "\n  ".join(bad))
+            sys.exit(1)
+        print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
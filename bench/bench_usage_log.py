@@ -0,0 +1,69 @@
+# 启动记录延迟基准：历史规模从 1k 到 1M，单次 record() 的耗时应基本不变
+# 用法：python bench/bench_usage_log.py [--sizes 1000,10000,100000,1000000] [--legacy]
+import os, sys, json, time, random, argparse, tempfile, statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ivylib.usage import BACKENDS
+
+
+def synthetic_events(n, tools=200):
+    now = time.time()
+    for i in range(n):
+        yield f"tool{random.randrange(tools)}", now - (n - i) * 30
+
+
+def time_records(store, runs):
+    samples = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        store.record(f"tool{i % 200}")
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+
+def legacy_record(path):
+    # 旧实现：整表读入再整表写回
+    import datetime
+    data = json.load(open(path, "r", encoding="utf-8"))
+    data.append({"tool": "tool0", "time": datetime.datetime.now().isoformat()})
+    json.dump(data, open(path, "w", encoding="utf-8"), ensure_ascii=False, indent=2)
+
+
+def report(name, n, samples):
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:8} {n:>9}  median {statistics.median(samples):9.1f} us   p95 {p95:9.1f} us")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1000,10000,100000,1000000")
+    ap.add_argument("--runs", type=int, default=200)
+    ap.add_argument("--legacy", action="store_true", help="同时测旧的 usage_log.json 整文件重写（最多 100k）")
+    opts = ap.parse_args()
+    sizes = [int(x) for x in opts.sizes.split(",")]
+
+    for backend, (cls, fname) in BACKENDS.items():
+        for n in sizes:
+            with tempfile.TemporaryDirectory() as d:
+                store = cls(os.path.join(d, fname))
+                store.import_events(synthetic_events(n))
+                report(backend, n, time_records(store, opts.runs))
+                store.close()
+
+    if opts.legacy:
+        for n in [s for s in sizes if s <= 100000]:
+            with tempfile.TemporaryDirectory() as d:
+                path = os.path.join(d, "usage_log.json")
+                import datetime
+                json.dump([{"tool": t, "time": datetime.datetime.fromtimestamp(ts).isoformat()}
+                           for t, ts in synthetic_events(n)], open(path, "w", encoding="utf-8"))
+                samples = []
+                for _ in range(min(opts.runs, 20)):
+                    t0 = time.perf_counter(); legacy_record(path)
+                    samples.append((time.perf_counter() - t0) * 1e6)
+                report("legacy", n, samples)
+
+
+if __name__ == "__main__":
+    main()
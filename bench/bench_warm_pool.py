@@ -0,0 +1,66 @@
+# 冷启动与预热进程的启动延迟对比：从发起运行到脚本退出的耗时
+# 用法：python bench/bench_warm_pool.py [--python python] [--preload json,http.client,email.parser] [--runs 20]
+import os, sys, time, argparse, tempfile, statistics, subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+WORKER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ivylib", "warm_worker.py")
+
+SCRIPT = """import sys
+{imports}
+print("args:", sys.argv[1:])
+"""
+
+
+def request(script, args):
+    import json
+    return (json.dumps({"script": script, "args": args, "cwd": None}) + "\n").encode("utf-8")
+
+
+def cold(python, script, runs):
+    out = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([python, script, str(i)], stdout=subprocess.DEVNULL, check=True)
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def warm(python, script, preload, runs, pool_size=2):
+    # 与 WarmPool 相同：保持 pool_size 个空闲进程，取一个就补一个；测量只计写请求到退出
+    def spawn():
+        args = [python, WORKER, os.path.dirname(script)] + ([preload] if preload else [])
+        return subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)
+    idle = [spawn() for _ in range(pool_size)]
+    out = []
+    for i in range(runs):
+        time.sleep(0.3)                         # 模拟两次运行之间的间隔，让补进来的进程完成预加载
+        p = idle.pop(0); idle.append(spawn())
+        t0 = time.perf_counter()
+        p.stdin.write(request(script, [str(i)])); p.stdin.close()
+        p.wait()
+        out.append((time.perf_counter() - t0) * 1000)
+    for p in idle:
+        p.stdin.close(); p.wait()
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--python", default=sys.executable)
+    ap.add_argument("--preload", default="json,http.client,email.parser,argparse,asyncio")
+    ap.add_argument("--runs", type=int, default=20)
+    opts = ap.parse_args()
+    mods = [m for m in opts.preload.split(",") if m]
+    with tempfile.TemporaryDirectory() as d:
+        script = os.path.join(d, "tool.py")
+        with open(script, "w") as f:
+            f.write(SCRIPT.format(imports="\n".join(f"import {m}" for m in mods)))
+        for name, samples in (("cold", cold(opts.python, script, opts.runs)),
+                              ("warm", warm(opts.python, script, opts.preload, opts.runs))):
+            samples.sort()
+            print(f"{name}  median {statistics.median(samples):7.1f} ms   "
+                  f"p95 {samples[int(len(samples) * 0.95) - 1]:7.1f} ms   min {samples[0]:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
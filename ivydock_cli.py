@@ -0,0 +1,8 @@
+# IvyDock 命令行入口（不启动图形界面）：
+#   python ivydock_cli.py list | search <关键词> | run <工具> -- 参数... | stats
+# 数据目录默认是本文件所在目录，可用 --dir 或环境变量 IVYDOCK_HOME 指定
+import os, sys
+from ivylib.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main(default_dir=os.path.dirname(os.path.abspath(__file__))))
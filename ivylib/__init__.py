@@ -0,0 +1 @@
+# IvyDock 的功能模块；此包本身不导入 PyQt5，供无界面场景复用
@@ -0,0 +1,240 @@
+# 批量运行：同一个命令行工具对多个目标执行，限制并发、排队、超时、重试与取消
+import os, csv, time
+from collections import deque
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QPlainTextEdit, QLineEdit, QSpinBox,
+    QPushButton, QLabel, QTableWidget, QTableWidgetItem, QFileDialog, QSplitter, QHeaderView
+)
+from PyQt5.QtCore import Qt, QObject, QProcess, QTimer, pyqtSignal
+from ivylib.launch import template_args
+from ivylib.output_buffer import OutputBuffer, spool_path
+
+QUEUED, RUNNING, DONE, FAILED, TIMEOUT, CANCELLED = "queued", "running", "done", "failed", "timeout", "cancelled"
+TAIL_CHARS = 64 * 1024          # 每个任务在内存里保留的输出尾部，完整输出在日志文件
+
+
+class BatchJob:
+    def __init__(self, row, target):
+        self.row, self.target = row, target
+        self.state, self.attempts = QUEUED, 0
+        self.exit_code = None
+        self.started = self.finished = None
+        self.process = self.timer = self.buffer = None
+        self.output = ""
+        self.log = None
+
+    def tail(self):
+        # 运行中取缓冲里尚未取走的部分（即最近的输出），结束后取保存下来的尾部
+        if self.process is not None and self.buffer is not None:
+            return "".join(self.buffer.pending)
+        return self.output
+
+    @property
+    def duration(self):
+        if self.started is None:
+            return None
+        return (self.finished or time.monotonic()) - self.started
+
+
+class BatchRunner(QObject):
+    job_changed = pyqtSignal(object)
+    all_done = pyqtSignal()
+
+    def __init__(self, build, concurrency=4, timeout=0, retries=0, encoding=None, name="batch", parent=None):
+        super().__init__(parent)
+        self.build = build                  # target -> (程序, 参数列表, 工作目录)
+        self.concurrency, self.timeout, self.retries = concurrency, timeout, retries
+        self.encoding, self.name = encoding, name
+        self.jobs, self.queue, self.running = [], deque(), set()
+        self.log_dir = os.path.splitext(spool_path(name))[0] + "-batch"
+
+    def start(self, targets):
+        self.jobs = [BatchJob(i, t) for i, t in enumerate(targets)]
+        self.queue = deque(self.jobs)
+        self._pump()
+
+    def _pump(self):
+        while self.queue and len(self.running) < self.concurrency:
+            self._launch(self.queue.popleft())
+        if not self.queue and not self.running:
+            self.all_done.emit()
+
+    def _launch(self, job):
+        program, args, cwd = self.build(job.target)
+        job.state, job.attempts = RUNNING, job.attempts + 1
+        job.started, job.finished, job.exit_code = time.monotonic(), None, None
+        job.log = os.path.join(self.log_dir, f"{job.row:05d}-try{job.attempts}.log")
+        job.buffer = OutputBuffer(self.encoding, max_pending=TAIL_CHARS, spool=job.log)
+        p = job.process = QProcess(self)
+        p.setProcessChannelMode(QProcess.MergedChannels)
+        if cwd: p.setWorkingDirectory(cwd)
+        p.readyReadStandardOutput.connect(lambda: job.buffer.feed(p.readAllStandardOutput().data()))
+        p.finished.connect(lambda code, status: self._finished(job, code, status))
+        p.errorOccurred.connect(lambda err: self._error(job, err))
+        if self.timeout:
+            job.timer = QTimer(self); job.timer.setSingleShot(True)
+            job.timer.timeout.connect(lambda: self._timed_out(job))
+            job.timer.start(self.timeout * 1000)
+        self.running.add(job)
+        p.start(program, args)
+        self.job_changed.emit(job)
+
+    def _error(self, job, err):
+        if err == QProcess.FailedToStart:      # 启动失败不会有 finished 信号
+            job.buffer.feed(job.process.errorString().encode("utf-8"))
+            self._finished(job, -1, None)
+
+    def _timed_out(self, job):
+        if job.state == RUNNING:
+            job.state = TIMEOUT
+            job.process.kill()
+
+    def _finished(self, job, code, status):
+        if job not in self.running:
+            return
+        self.running.discard(job)
+        if job.timer:
+            job.timer.stop(); job.timer.deleteLater(); job.timer = None
+        job.buffer.close()
+        job.output = job.buffer.take()[-TAIL_CHARS:]
+        job.finished, job.exit_code = time.monotonic(), code
+        if job.state == RUNNING:
+            job.state = DONE if code == 0 and status == QProcess.NormalExit else FAILED
+        job.process.deleteLater(); job.process = None
+        if job.state in (FAILED, TIMEOUT) and job.attempts <= self.retries:
+            job.state = QUEUED
+            self.queue.append(job)
+        self.job_changed.emit(job)
+        self._pump()
+
+    def cancel(self):
+        for job in self.queue:
+            job.state = CANCELLED
+            self.job_changed.emit(job)
+        self.queue.clear()
+        for job in list(self.running):
+            job.state = CANCELLED
+            job.process.kill()
+
+    def summary(self):
+        counts = {}
+        for j in self.jobs:
+            counts[j.state] = counts.get(j.state, 0) + 1
+        return counts
+
+
+class BatchDialog(QDialog):
+    COLS = ("target", "status", "attempts", "duration", "exit_code")
+
+    def __init__(self, tool, build_for_args, L, encoding=None):
+        super().__init__()
+        self.L, self.tool, self.build_for_args, self.encoding = L, tool, build_for_args, encoding
+        self.runner = None
+        self.setWindowTitle(f"{L['batch_title']} - {tool['name']}"); self.resize(900, 650)
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        self.targets = QPlainTextEdit(); self.targets.setPlaceholderText(L["batch_targets_hint"])
+        self.targets.setFixedHeight(120)
+        tl = QVBoxLayout(); tl.addWidget(self.targets)
+        tl.addWidget(QPushButton(L["batch_load"], clicked=self.load_targets))
+        form.addRow(L["batch_targets"], tl)
+        self.template = QLineEdit(tool.get("args", "")); self.template.setPlaceholderText("-u {target}")
+        form.addRow(L["cli_args"], self.template)
+        h = QHBoxLayout()
+        self.conc = QSpinBox(); self.conc.setRange(1, 256); self.conc.setValue(4)
+        self.timeout = QSpinBox(); self.timeout.setRange(0, 86400); self.timeout.setSuffix(" s")
+        self.retries = QSpinBox(); self.retries.setRange(0, 10)
+        for label, w in ((L["batch_concurrency"], self.conc), (L["batch_timeout"], self.timeout), (L["batch_retries"], self.retries)):
+            h.addWidget(QLabel(label)); h.addWidget(w)
+        h.addStretch()
+        self.start_btn = QPushButton(L["cli_run"], clicked=self.start)
+        self.cancel_btn = QPushButton(L["cancel"], clicked=self.cancel); self.cancel_btn.setEnabled(False)
+        h.addWidget(self.start_btn); h.addWidget(self.cancel_btn)
+        h.addWidget(QPushButton(L["batch_export"], clicked=self.export))
+        form.addRow(h)
+        layout.addLayout(form)
+        split = QSplitter(Qt.Vertical)
+        self.table = QTableWidget(0, len(self.COLS))
+        self.table.setHorizontalHeaderLabels([L["batch_col_" + c] for c in self.COLS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.currentCellChanged.connect(lambda row, *_: self.show_output(row))
+        split.addWidget(self.table)
+        self.output = QPlainTextEdit(); self.output.setReadOnly(True)
+        split.addWidget(self.output)
+        layout.addWidget(split)
+        self.status = QLabel(); layout.addWidget(self.status)
+        self.tick = QTimer(self); self.tick.setInterval(1000); self.tick.timeout.connect(self.refresh_running)
+
+    def load_targets(self):
+        f, _ = QFileDialog.getOpenFileName(self, self.L["batch_load"], "", "*.txt;;*.*")
+        if f:
+            with open(f, "r", encoding="utf-8", errors="replace") as fp:
+                self.targets.setPlainText(fp.read())
+
+    def start(self):
+        targets = []
+        for line in self.targets.toPlainText().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#") and line not in targets:
+                targets.append(line)
+        if not targets:
+            return
+        template = self.template.text()
+        self.runner = BatchRunner(lambda t: self.build_for_args(template_args(template, t)),
+                                  self.conc.value(), self.timeout.value(), self.retries.value(),
+                                  self.encoding, self.tool["name"], self)
+        self.runner.job_changed.connect(self.update_row)
+        self.runner.all_done.connect(self.on_all_done)
+        self.table.setRowCount(len(targets))
+        for i, t in enumerate(targets):
+            self.table.setItem(i, 0, QTableWidgetItem(t))
+            for c in range(1, len(self.COLS)):
+                self.table.setItem(i, c, QTableWidgetItem(""))
+        self.start_btn.setEnabled(False); self.cancel_btn.setEnabled(True)
+        self.tick.start()
+        self.runner.start(targets)
+
+    def cancel(self):
+        if self.runner: self.runner.cancel()
+
+    def update_row(self, job):
+        self.table.item(job.row, 1).setText(self.L["batch_state_" + job.state])
+        self.table.item(job.row, 2).setText(str(job.attempts))
+        self.table.item(job.row, 3).setText("" if job.duration is None else f"{job.duration:.1f}s")
+        self.table.item(job.row, 4).setText("" if job.exit_code is None else str(job.exit_code))
+        if job.row == self.table.currentRow():
+            self.show_output(job.row)
+        self.status.setText("  ".join(f"{self.L['batch_state_' + k]}: {v}" for k, v in self.runner.summary().items()))
+
+    def refresh_running(self):
+        for job in self.runner.running:
+            self.table.item(job.row, 3).setText(f"{job.duration:.1f}s")
+
+    def show_output(self, row):
+        if not self.runner or not 0 <= row < len(self.runner.jobs):
+            return
+        job = self.runner.jobs[row]
+        head = f"# {job.log}\n" if job.log else ""
+        self.output.setPlainText(head + job.tail())
+
+    def export(self):
+        # 按目标汇总导出：最终状态、尝试次数、耗时、退出码和日志路径
+        if not self.runner: return
+        f, _ = QFileDialog.getSaveFileName(self, self.L["batch_export"], f"{self.tool['name']}-batch.csv", "*.csv")
+        if not f: return
+        with open(f, "w", encoding="utf-8-sig", newline="") as fp:
+            w = csv.writer(fp)
+            w.writerow(self.COLS + ("log",))
+            for j in self.runner.jobs:
+                w.writerow([j.target, j.state, j.attempts, "" if j.duration is None else f"{j.duration:.3f}",
+                            "" if j.exit_code is None else j.exit_code, j.log or ""])
+
+    def on_all_done(self):
+        self.tick.stop()
+        self.start_btn.setEnabled(True); self.cancel_btn.setEnabled(False)
+
+    def closeEvent(self, e):
+        self.cancel()
+        super().closeEvent(e)
@@ -0,0 +1,67 @@
+# 工具目录：每个工具带稳定 id，增删改都按 id 定位，不再靠整条字典比较
+import uuid
+
+_MISSING = object()
+
+
+def new_tool_id():
+    return uuid.uuid4().hex
+
+
+def ensure_tool_ids(tools):
+    # 旧数据没有 id，或手工复制出了重复 id，都补发新的；返回是否有改动
+    seen, changed = set(), False
+    for t in tools:
+        if not t.get("id") or t["id"] in seen:
+            t["id"] = new_tool_id(); changed = True
+        seen.add(t["id"])
+    return changed
+
+
+def diff_tools(old, new):
+    # 按 id 比较两版目录：返回 (新增的工具, 删除的 id, 修改后的工具)
+    o = {t["id"]: t for t in old}
+    n = {t["id"]: t for t in new}
+    added = [t for tid, t in n.items() if tid not in o]
+    removed = [tid for tid in o if tid not in n]
+    changed = [t for tid, t in n.items() if tid in o and o[tid] != t]
+    return added, removed, changed
+
+
+def merge_fields(base, ours, theirs, prefer="ours"):
+    # 字段级三方合并（base 是双方共同的上一版）；两边把同一字段改成不同值算冲突，按 prefer 取值。
+    # 返回 (合并结果, 冲突字段列表)
+    out, conflicts = {}, []
+    for k in list(ours) + [k for k in theirs if k not in ours]:
+        b, o, t = base.get(k, _MISSING), ours.get(k, _MISSING), theirs.get(k, _MISSING)
+        if o == t or t == b: v = o
+        elif o == b: v = t
+        else:
+            conflicts.append(k)
+            v = o if prefer == "ours" else t
+        if v is not _MISSING:             # 一边删掉了字段、另一边没动：删除
+            out[k] = v
+    return out, conflicts
+
+
+def merge_tools(base, ours, theirs, prefer="ours"):
+    # 按 id 三方合并：只有一边改过的直接采用，两边都改了的逐字段合并；
+    # 一边删除另一边修改、或同一字段改法不同，记为冲突 (id, 名称, 字段)，按 prefer 决定。
+    # 顺序沿用对方文件，本地新增的排在后面
+    b = {t["id"]: t for t in base}
+    o = {t["id"]: t for t in ours}
+    th = {t["id"]: t for t in theirs}
+    merged, conflicts = [], []
+    for tid in list(th) + [tid for tid in o if tid not in th]:
+        bt, ot, tt = b.get(tid), o.get(tid), th.get(tid)
+        if ot == tt or tt == bt: t = ot
+        elif ot == bt: t = tt
+        elif ot is None or tt is None:          # 一边删除、一边修改
+            conflicts.append((tid, (ot or tt)["name"], None))
+            t = ot if prefer == "ours" else tt
+        else:
+            t, fields = merge_fields(bt or {}, ot, tt, prefer)
+            conflicts += [(tid, ot["name"], f) for f in fields]
+        if t is not None:
+            merged.append(t)
+    return merged, conflicts
@@ -0,0 +1,176 @@
+# 工具目录存储：可插拔后端（不依赖 Qt，图形界面和命令行共用）
+#   json：tools_data.json 整文件，原来的格式；可以放在同步盘上多人共用，文件变化时热加载合并
+#   sqlite：tools.db，每个工具一行，按 id 增删改只写受影响的那一行；说明等大字段单独一列，
+#           加载目录时不读，用到时（详情页、编辑、检索索引）再按 id 取。首次打开时自动导入 tools_data.json
+# 在设置里切换后端，下次启动时自动迁移：json -> sqlite 导入后把 json 改名，sqlite -> json 导出后把库改名
+import os, json, sqlite3, threading
+from ivylib.config import TOOLS_FILE
+from ivylib.storage import load_json, save_json
+from ivylib.catalog import ensure_tool_ids
+
+HEAVY_FIELDS = ("description",)
+
+
+class CatalogStore:
+    # load 返回按目录顺序的工具列表，lazy 为真时不含 HEAVY_FIELDS（用 full/heavy_all 取）；
+    # save(全部工具, 改动或新增的工具, 删除的 id)：各后端取所需的部分，json 整文件写，sqlite 只写受影响的行
+    lazy = False
+    shared = False                       # 文件可能被其他进程/同步工具整体改写，需要监视并合并
+
+    def load(self):
+        raise NotImplementedError
+
+    def save(self, tools, changed=(), removed=()):
+        raise NotImplementedError
+
+    def heavy(self, tid):
+        return {}
+
+    def heavy_all(self):
+        return {}
+
+    def full(self, tool):
+        # 补上大字段；内存里已有的（刚编辑过）优先
+        return {**self.heavy(tool["id"]), **tool} if self.lazy else tool
+
+    def close(self):
+        pass
+
+
+class JsonCatalogStore(CatalogStore):
+    shared = True
+
+    def __init__(self, path, writer=None, readonly=False):
+        # readonly：命令行等只读的调用方，补发的 id 只留在内存里，不写盘、不从 .bak 写回
+        self.path, self.writer, self.readonly = path, writer, readonly
+
+    def load(self):
+        tools = load_json(self.path, [], repair=not self.readonly)
+        if ensure_tool_ids(tools) and not self.readonly:
+            save_json(self.path, tools)
+        return tools
+
+    def save(self, tools, changed=(), removed=()):
+        # 有 DebouncedWriter 时合并到后台写盘
+        if self.writer is not None:
+            self.writer.schedule(self.path, list(tools))
+        else:
+            save_json(self.path, list(tools))
+
+
+class SqliteCatalogStore(CatalogStore):
+    # pos 记录目录顺序：新增的排在最后，修改不动位置。category 单独一列并建索引，可按分类取。
+    # 连接可跨线程使用（详情渲染、建索引在后台线程里取大字段），由锁串行化
+    lazy = True
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS tools(
+                id       TEXT PRIMARY KEY,
+                pos      INTEGER NOT NULL,
+                category TEXT NOT NULL DEFAULT '',
+                data     TEXT NOT NULL,
+                heavy    TEXT);
+            CREATE INDEX IF NOT EXISTS idx_tools_pos ON tools(pos);
+            CREATE INDEX IF NOT EXISTS idx_tools_category ON tools(category);
+        """)
+
+    # heavy 为 NULL 表示这次没带大字段（延迟加载的工具被改了别的字段），保留原值
+    _PUT = ("INSERT INTO tools(id, pos, category, data, heavy) "
+            "VALUES (?, (SELECT IFNULL(MAX(pos), 0) + 1 FROM tools), ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET category = excluded.category, data = excluded.data, "
+            "heavy = COALESCE(excluded.heavy, heavy)")
+
+    @staticmethod
+    def _row(t):
+        light = {k: v for k, v in t.items() if k not in HEAVY_FIELDS}
+        heavy = {k: t[k] for k in HEAVY_FIELDS if k in t}
+        return (t["id"], t.get("category", ""), json.dumps(light, ensure_ascii=False),
+                json.dumps(heavy, ensure_ascii=False) if heavy else None)
+
+    def load(self):
+        with self.lock:
+            rows = self.db.execute("SELECT data FROM tools ORDER BY pos").fetchall()
+        return json.loads("[" + ",".join(d for d, in rows) + "]")      # 一次解析，比逐行 loads 快
+
+    def save(self, tools, changed=(), removed=()):
+        with self.lock, self.db:
+            self.db.executemany("DELETE FROM tools WHERE id = ?", ((tid,) for tid in removed))
+            self.db.executemany(self._PUT, map(self._row, changed))
+
+    def heavy(self, tid):
+        with self.lock:
+            row = self.db.execute("SELECT heavy FROM tools WHERE id = ?", (tid,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def heavy_all(self):
+        with self.lock:
+            rows = self.db.execute("SELECT id, heavy FROM tools WHERE heavy IS NOT NULL").fetchall()
+        return {tid: json.loads(h) for tid, h in rows}
+
+    def count(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM tools").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+CATALOG_BACKENDS = {
+    "json":   (JsonCatalogStore, TOOLS_FILE),
+    "sqlite": (SqliteCatalogStore, "tools.db"),
+}
+
+
+def migrate_json(store, json_path):
+    # 库还是空的时导入 tools_data.json，成功后改名，避免重复导入；返回导入的工具数
+    if not os.path.isfile(json_path) or store.count():
+        return 0
+    tools = load_json(json_path, [])
+    ensure_tool_ids(tools)
+    store.save(tools, tools)
+    os.replace(json_path, json_path + ".migrated")
+    return len(tools)
+
+
+def export_db(db_path, json_path):
+    # 把 tools.db 导出成 tools_data.json（含大字段），返回导出的工具数
+    store = SqliteCatalogStore(db_path)
+    heavy = store.heavy_all()
+    tools = [{**t, **heavy.get(t["id"], {})} for t in store.load()]
+    store.close()
+    save_json(json_path, tools)
+    return len(tools)
+
+
+def open_catalog_store(backend="json", base_dir=".", writer=None, readonly=False):
+    cls, fname = CATALOG_BACKENDS.get(backend, CATALOG_BACKENDS["json"])
+    if cls is JsonCatalogStore:
+        path, db = os.path.join(base_dir, fname), os.path.join(base_dir, CATALOG_BACKENDS["sqlite"][1])
+        if not os.path.exists(path) and os.path.isfile(db):
+            # 从 sqlite 换回 json：导出后把库改名，之后再换成 sqlite 时从 json 重新导入
+            export_db(db, path)
+            os.replace(db, db + ".migrated")
+        return JsonCatalogStore(path, writer, readonly)
+    store = cls(os.path.join(base_dir, fname))
+    migrate_json(store, os.path.join(base_dir, TOOLS_FILE))
+    return store
+
+
+if __name__ == "__main__":
+    # python -m ivylib.catalog_store export [--dir .]：把 tools.db 导出成 tools_data.json（含大字段），
+    # 拿去同步盘与别人共用时执行（在设置里换回 json 后端会自动导出，不必手动）
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m ivylib.catalog_store")
+    ap.add_argument("command", choices=["export"])
+    ap.add_argument("--dir", default=".")
+    opts = ap.parse_args()
+    out = os.path.join(opts.dir, TOOLS_FILE)
+    n = export_db(os.path.join(opts.dir, CATALOG_BACKENDS["sqlite"][1]), out)
+    print(f"exported {n} tools to {out}")
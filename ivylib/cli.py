@@ -0,0 +1,238 @@
+# 无界面入口：不导入 PyQt5 / matplotlib / markdown，直接读工具目录与设置，
+# 按与图形界面相同的启动语义运行工具并记录使用日志。用法见 python ivydock_cli.py -h
+import os, sys, json, time, argparse, subprocess
+from ivylib.config import SETTINGS_FILE, DEFAULT_SETTINGS, I18N
+from ivylib.storage import load_json
+from ivylib.catalog_store import open_catalog_store
+from ivylib.launch import type_key, build_command, CLI_TYPES, DETACHED_TYPES
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class Catalog:
+    def __init__(self, base):
+        self.base = base
+        self.settings = load_json(os.path.join(base, SETTINGS_FILE), DEFAULT_SETTINGS)
+        self.store = open_catalog_store(self.settings.get("catalog_backend", "json"), base, readonly=True)
+        self.tools = self.store.load()
+        self.by_id = {t.get("id"): t for t in self.tools}
+
+    def key(self, t):
+        return type_key(t.get("type", ""), I18N)
+
+    def find(self, ref):
+        # 先按 id、再按名称（不区分大小写），最后按唯一的名称前缀
+        if ref in self.by_id:
+            return self.by_id[ref], []
+        low = ref.lower()
+        exact = [t for t in self.tools if t["name"].lower() == low]
+        if len(exact) == 1:
+            return exact[0], []
+        cands = exact or [t for t in self.tools if t["name"].lower().startswith(low)]
+        return (cands[0], []) if len(cands) == 1 else (None, cands)
+
+    def usage_store(self):
+        from ivylib.usage import open_usage_store
+        return open_usage_store(self.settings.get("usage_backend", "sqlite"), self.base,
+                                self.settings.get("usage_retention_days", 0))
+
+    def run_log(self):
+        from ivylib.runs import RunLog, RUNS_FILE
+        return RunLog(os.path.join(self.base, RUNS_FILE))
+
+
+def _row(t, key):
+    return f"{t.get('id', '')[:8]}  {key or '?':<14}{t.get('category', ''):<12}{t['name']}"
+
+
+def cmd_list(cat, opts):
+    tools = [t for t in cat.tools
+             if (opts.category is None or t.get("category", "") == opts.category)
+             and (opts.type is None or cat.key(t) == opts.type)]
+    if opts.names:                       # 供 shell 补全使用：只输出名称
+        print("\n".join(t["name"] for t in tools))
+    elif opts.json:
+        heavy = cat.store.heavy_all()
+        print(json.dumps([{**t, **heavy.get(t["id"], {})} for t in tools], ensure_ascii=False, indent=2))
+    else:
+        for t in tools:
+            print(_row(t, cat.key(t)))
+    return 0
+
+
+def cmd_search(cat, opts):
+    from ivylib.search import SearchIndex
+    index = SearchIndex()
+    if opts.usage:
+        store = cat.usage_store()
+        totals = {}
+        for _, tool, n in store.rollup():
+            totals[tool] = totals.get(tool, 0) + n
+        store.close()
+        index.set_usage(totals)
+    heavy = cat.store.heavy_all()
+    for t in cat.tools:
+        index.add({**t, **heavy.get(t["id"], {})}, None if opts.docs else "")     # 默认不读说明文档，保持毫秒级
+    for tid in index.search(opts.query, opts.limit):
+        t = cat.by_id[tid]
+        print(_row(t, cat.key(t)))
+    return 0
+
+
+def _record(cat, t, mode, t0, spawn, code, before):
+    from ivylib.runs import new_record
+    rec = new_record(t["name"], mode)
+    rec.update(spawn_ms=round((spawn - t0) * 1000, 2), wall_s=round(time.monotonic() - t0, 3), exit_code=code)
+    if before is not None:
+        # 本进程只等待了这一个子进程，子进程资源统计就是它的
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        # ru_maxrss 在 Linux 上以 KB 计，macOS 上以字节计
+        rec["peak_rss_kb"] = after.ru_maxrss // 1024 if sys.platform == "darwin" else after.ru_maxrss
+        rec["cpu_s"] = round(after.ru_utime + after.ru_stime - before.ru_utime - before.ru_stime, 3)
+    try: cat.run_log().append(rec)
+    except OSError: pass
+
+
+def _record_usage(cat, t):
+    # 确实启动了才计入使用次数
+    store = cat.usage_store()
+    store.record(t["name"])
+    store.close()
+
+
+def run_pipeline(cat, t):
+    from ivylib.pipeline import PipelineRun
+    stages = []
+    for st in t.get("stages", []):
+        s = cat.by_id.get(st.get("tool"))
+        if s is None or cat.key(s) not in CLI_TYPES:
+            print(f"ivydock: pipeline stage not usable: {st.get('tool')}", file=sys.stderr)
+            return 2
+        args = st.get("args", "")
+        stages.append((s["name"],) + build_command(s, cat.key(s), cat.settings, args.split() if args.strip() else None))
+    run = PipelineRun(stages)
+    try:
+        run.start()
+    except OSError as e:
+        print(f"ivydock: pipeline {t['name']!r} failed to start: {e}", file=sys.stderr)
+        return 127
+    _record_usage(cat, t)
+    out, err = sys.stdout.buffer, sys.stderr.buffer
+    try:
+        while not run.done():
+            try: kind, _, data = run.events.get(timeout=0.1)
+            except Exception: continue
+            (out if kind == "out" else err).write(data)
+    except KeyboardInterrupt:
+        run.stop()
+        return 130
+    out.flush()
+    return run.stats[-1].code if run.stats else 0
+
+
+def cmd_run(cat, opts):
+    t, cands = cat.find(opts.tool)
+    if t is None:
+        print(f"ivydock: no tool matches {opts.tool!r}" if not cands else
+              "ivydock: ambiguous, candidates:\n  " + "\n  ".join(c["name"] for c in cands), file=sys.stderr)
+        return 2
+    key = cat.key(t)
+    args = opts.args[1:] if opts.args[:1] == ["--"] else opts.args
+    if opts.dry_run and key not in ("opt_website", "opt_pipeline"):
+        program, argv, cwd = build_command(t, key, cat.settings, args or None)
+        print(subprocess.list2cmdline([program] + argv) + (f"   (cwd {cwd})" if cwd else ""))
+        return 0
+    if key == "opt_website":
+        import webbrowser
+        if not webbrowser.open(t.get("url", "")):
+            print(f"ivydock: could not open a browser for {t.get('url', '')!r}", file=sys.stderr)
+            return 1
+        _record_usage(cat, t)
+        return 0
+    if key == "opt_pipeline":
+        return run_pipeline(cat, t)
+    if key not in CLI_TYPES + DETACHED_TYPES:
+        print(f"ivydock: unknown tool type {t.get('type')!r}", file=sys.stderr)
+        return 2
+    program, argv, cwd = build_command(t, key, cat.settings, args or None)
+    before = resource.getrusage(resource.RUSAGE_CHILDREN) if resource and key in CLI_TYPES else None
+    t0 = time.monotonic()
+    try:
+        if key in DETACHED_TYPES:
+            # 与图形界面一致：脱离当前终端运行，不等待
+            kw = {"creationflags": 0x00000008} if os.name == "nt" else {"start_new_session": True}
+            p = subprocess.Popen([program] + argv, cwd=cwd, stdin=subprocess.DEVNULL,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kw)
+            _record_usage(cat, t)
+            _record(cat, t, "detached", t0, time.monotonic(), None, None)
+            print(p.pid)
+            return 0
+        p = subprocess.Popen([program] + argv, cwd=cwd)
+    except OSError as e:
+        print(f"ivydock: {program}: {e}", file=sys.stderr)
+        return 127
+    spawn = time.monotonic()
+    _record_usage(cat, t)
+    try:
+        code = p.wait()
+    except KeyboardInterrupt:
+        code = p.wait()                  # Ctrl+C 已同时送给子进程，等它自己退出
+    _record(cat, t, "cli", t0, spawn, code, before)
+    return code
+
+
+def cmd_stats(cat, opts):
+    import datetime
+    from ivylib.runs import summarize
+    first = datetime.date.today() - datetime.timedelta(days=opts.days - 1)
+    store = cat.usage_store()
+    totals = {}
+    for _, tool, n in store.rollup(first.isoformat()):
+        totals[tool] = totals.get(tool, 0) + n
+    store.close()
+    since = time.mktime(first.timetuple())
+    print(f"# usage since {first} ({sum(totals.values())} launches)")
+    for tool, n in sorted(totals.items(), key=lambda kv: -kv[1])[:opts.top]:
+        print(f"{n:6d}  {tool}")
+    rows = summarize(r for r in cat.run_log().records() if r.get("start", 0) >= since)
+    if rows:
+        print("\n# runs          count  fail   p50 s   p95 s  p95 MB")
+        for r in rows[:opts.top]:
+            fmt = lambda v, f: format(v, f) if v is not None else "-"
+            mb = r["rss_p95"] / 1024 if r["rss_p95"] is not None else None
+            print(f"{r['tool'][:14]:<14}{r['runs']:6d}{r['failures']:6d}{fmt(r['wall_p50'], '8.2f'):>8}"
+                  f"{fmt(r['wall_p95'], '8.2f'):>8}{fmt(mb, '8.1f'):>8}")
+    return 0
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(prog="ivydock", description="IvyDock headless launcher")
+    ap.add_argument("--dir", default=os.environ.get("IVYDOCK_HOME"),
+                    help="data directory holding tools_data.json (default: $IVYDOCK_HOME or the IvyDock folder)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("list", help="list tools")
+    p.add_argument("--category"); p.add_argument("--type", help="type key, e.g. opt_py_cli")
+    p.add_argument("--names", action="store_true", help="names only (for shell completion)")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(fn=cmd_list)
+    p = sub.add_parser("search", help="ranked search over name/category/description")
+    p.add_argument("query"); p.add_argument("--limit", type=int, default=20)
+    p.add_argument("--docs", action="store_true", help="also index doc files (slower)")
+    p.add_argument("--no-usage", dest="usage", action="store_false", help="do not weight by usage")
+    p.set_defaults(fn=cmd_search)
+    p = sub.add_parser("run", help="run a tool: run <id|name|prefix> [-- args...]")
+    p.add_argument("tool"); p.add_argument("args", nargs=argparse.REMAINDER)
+    p.add_argument("--dry-run", action="store_true", help="print the command instead of running it")
+    p.set_defaults(fn=cmd_run)
+    p = sub.add_parser("stats", help="usage counts and run-time percentiles")
+    p.add_argument("--days", type=int, default=7); p.add_argument("--top", type=int, default=10)
+    p.set_defaults(fn=cmd_stats)
+    return ap
+
+
+def main(argv=None, default_dir="."):
+    opts = build_parser().parse_args(argv)
+    return opts.fn(Catalog(opts.dir or default_dir), opts)
@@ -0,0 +1,164 @@
+# 数据文件、默认设置与界面文字（不依赖 Qt，图形界面和命令行共用）
+# 全局常量
+SETTINGS_FILE = "settings.json"
+TOOLS_FILE    = "tools_data.json"
+
+DEFAULT_SETTINGS = {
+    "theme":"System",
+    "font_size":10,
+    "window_width":1800,
+    "window_height":1200,
+    "language":"中文",
+    "python_path":"python",      # 新增：默认解释器命令
+    "java_path": "java",        # 新增：Java解释器路径
+    "usage_backend": "sqlite",  # 使用日志后端：sqlite / jsonl / columnar（紧凑列式，装了 numpy 时统计更快）
+    "usage_retention_days": 0,  # 明细保留天数，更早的只保留日汇总；0 表示全部保留（jsonl 后端不压缩）
+    "catalog_backend": "json",  # 工具目录存储：json（tools_data.json，可放同步盘共用）/ sqlite（tools.db，工具很多时用，首次启动自动导入）
+    "cli_encoding": "",         # 命令行输出编码，留空跟随系统
+    "cli_scrollback": 10000,    # 输出窗口保留的行数，完整输出在 run_history 目录
+    "run_history_keep": 100,    # run_history 下每个工具最多保留最近这么多次运行的输出，0 表示不限
+    "run_history_days": 0,      # 超过这么多天的运行输出删除，0 表示不限
+    "max_running": 0,            # 同时运行的可执行类工具上限，超出的排队；0 表示不限（默认不限）
+    "max_per_category": 0,       # 每个分类的上限（category_limits 可按分类单独指定）；0 表示不限
+    "category_limits": {},
+    "memory_budget_mb": 0,       # 可执行类工具合计内存预算，0 表示不限
+    "import_roots": [],          # 批量导入上次扫描的目录
+    "palette_shortcut": "Ctrl+K",  # 快速启动面板的快捷键（在 IvyDock 任意窗口内有效）
+    "frecency_half_life_days": 14, # 使用记录的权重每过这么多天减半
+    "result_cache_mb": 256,     # 运行结果缓存上限（开启了缓存的工具共用）
+    "result_cache_hours": 168,  # 缓存结果的有效期
+}
+
+
+I18N = {
+    "中文":{
+        "app_title":"工具管理平台","search":"搜索工具...",
+        "add_tool":"+ 添加工具","select_detail":"选择一个工具查看详情",
+        "settings":"应用设置","about":"关于信息",
+        "theme":"主题","light":"浅色","dark":"暗黑","system":"随系统",
+        "font_size":"字体大小","window_size":"初始窗口大小","language":"系统语言",
+        "ok":"确定","cancel":"取消",
+        "name":"名称","type":"类型","url":"网址","category":"分类",
+        "path":"执行文件","args":"默认参数","simple_description":"说明",
+        "browse":"浏览文件…","import_doc":"导入说明文档…",
+        "add":"添加","edit":"编辑","delete":"删除",
+        "confirm_delete":"确认删除","launch_error":"启动失败",
+        "restart_prompt":"设置已保存，需要重启后生效，立即重启？",
+        "recent_usage":"近期工具使用情况",
+        "opt_py_cli": "命令行Python工具",
+        "opt_py_exec": "可执行Python工具",
+        "today_top5":"今日使用 Top5","trend7":"7天趋势","trend30":"30天趋势","dash_range":"统计区间",
+        "sync_conflict":"{} 已被其他人修改，以下内容与本地的修改冲突：\n\n{}\n\n保留本地的修改？（选“否”则采用文件中的版本）","sync_deleted":"一方已删除",
+        "import_title":"从目录批量导入…","import_add_dir":"+ 添加目录","import_scan":"扫描","import_scanning":"正在扫描…",
+        "import_found":"找到 {} 个新工具（{}/{} 个文件未变化，使用缓存）","import_all":"全选","import_none":"全不选",
+        "import_col_name":"名称","import_col_type":"类型","import_col_category":"分类","import_col_path":"路径","import_col_doc":"说明文档",
+        "hist_title":"运行历史","hist_search":"正则检索（回车跳到下一处）","hist_case":"忽略大小写","hist_filter":"只显示匹配行",
+        "hist_status":"{} 行，{}，已索引 {}%","hist_matches":"{} 行匹配","hist_bad_regex":"正则有误",
+        "proc_title":"运行中的程序","proc_col_tool":"工具","proc_col_category":"分类","proc_col_state":"状态","proc_col_pid":"PID",
+        "proc_col_priority":"优先级","proc_col_elapsed":"时长","proc_col_rss":"内存","proc_queued":"排队中","proc_running":"运行中",
+        "proc_suspended":"已挂起","proc_kill":"结束","proc_suspend":"挂起","proc_resume":"恢复","proc_cancel":"取消排队",
+        "proc_limits":"运行 {} / 上限 {}，每个分类 {}，内存预算 {} MB（各项 0 为不限）","proc_max":"同时运行的程序（0 为不限）","proc_per_cat":"每个分类",
+        "catalog_backend":"工具目录存储","backend_json":"JSON 文件（可放同步盘共用）","backend_sqlite":"SQLite 数据库（工具很多时更快）",
+        "backend_tip":"重启后生效，现有目录自动迁移。SQLite 不适合放在同步盘上与别人共用",
+        "proc_quit_queued":"还有 {n} 个程序在排队等待启动，退出后排队会丢失：","proc_start_all":"全部立即启动",
+        "proc_budget":"内存预算（0 为不限）","proc_priority":"启动优先级",
+        "palette_title":"快速启动","palette_hint":"输入名称启动工具（回车启动，Esc 关闭）","palette_uses":"近期 {:.1f} 次",
+        "opt_website":"网站","opt_cli":"命令行工具","opt_exec":"可执行程序",
+        "cli_title":"命令行工具运行","cli_args":"参数","cli_run":"运行","cli_output":"输出",
+        "opt_java_cli": "命令行Java工具",
+        "opt_java_exec": "可执行Java程序",
+        "cli_encoding":"输出编码","cli_scrollback":"输出保留行数","cli_log":"完整输出",
+        "cli_dropped":"输出过快，{n} 个字符未显示",
+        "recovered":"以下数据文件读取失败，已尝试自动恢复：",
+        "write_failed":"文件保存失败，修改仍保留在内存中，稍后会自动重试：",
+        "write_failed_quit":"以下文件仍无法保存，现在退出会丢失这些修改。请排除问题（磁盘空间、文件权限、被其他程序占用）后重试：",
+        "tool_broken":"工具无法启动：","launch_anyway":"仍然启动",
+        "run_stats":"运行统计","run_export":"导出运行记录…",
+        "run_col_tool":"工具","run_col_runs":"次数","run_col_failures":"失败",
+        "run_col_wall_p50":"耗时 p50","run_col_wall_p95":"耗时 p95",
+        "run_col_rss_p50":"内存 p50","run_col_rss_p95":"内存 p95","run_col_spawn_p50":"启动延迟 p50",
+        "cache_results":"缓存运行结果","cache_force":"强制重新运行",
+        "cache_hit":"缓存结果（{when} 生成），未实际运行；勾选“强制重新运行”可重新执行",
+        "opt_pipeline":"工具流水线","pipe_new":"新建流水线…","pipe_title":"工具流水线",
+        "pipe_add_stage":"+ 添加一级","pipe_save":"保存到工具目录","pipe_col_tool":"工具",
+        "pipe_incomplete":"请填写名称并至少添加一级","pipe_bad_stage":"流水线中的工具不可用：",
+        "pipe_col_stage":"级","pipe_col_state":"状态","pipe_col_in":"输入","pipe_col_out":"输出",
+        "pipe_col_rate":"吞吐","pipe_col_backpressure":"反压",
+        "health_rescan":"重新检查",
+        "warm":"预热解释器","preload":"预加载模块","cli_warm":"预热进程",
+        "jvm_daemon":"常驻 JVM","cli_jvm":"常驻 JVM","cli_jvm_failed":"常驻 JVM 异常（{err}），已改用普通方式重新运行",
+        "batch_run":"批量运行…","batch_title":"批量运行","batch_targets":"目标列表",
+        "batch_targets_hint":"每行一个目标，参数中的 {target} 会被替换；没有占位符时追加在参数末尾",
+        "batch_load":"从文件导入…","batch_concurrency":"并发","batch_timeout":"超时","batch_retries":"重试",
+        "batch_export":"导出结果…",
+        "batch_col_target":"目标","batch_col_status":"状态","batch_col_attempts":"次数",
+        "batch_col_duration":"耗时","batch_col_exit_code":"退出码",
+        "batch_state_queued":"排队","batch_state_running":"运行中","batch_state_done":"完成",
+        "batch_state_failed":"失败","batch_state_timeout":"超时","batch_state_cancelled":"已取消",
+    },
+    "English":{
+        "app_title":"Tool Manager","search":"Search tools...",
+        "add_tool":"+ Add Tool","select_detail":"Select a tool to see details",
+        "settings":"Settings","about":"About",
+        "theme":"Theme","light":"Light","dark":"Dark","system":"System",
+        "font_size":"Font Size","window_size":"Initial Window Size","language":"Language",
+        "ok":"OK","cancel":"Cancel",
+        "name":"Name","type":"Type","url":"URL","category":"Category",
+        "path":"Executable","args":"Default Args","simple_description":"Description",
+        "browse":"Browse…","import_doc":"Import Doc…",
+        "add":"Add","edit":"Edit","delete":"Delete",
+        "confirm_delete":"Confirm Delete","launch_error":"Launch Error",
+        "restart_prompt":"Settings saved. Restart now to apply?",
+        "recent_usage":"Recent Usage","today_top5":"Today Top5",
+        "opt_py_cli": "Python CLI Tool",
+        "opt_py_exec": "Python Executable",
+        "trend7":"7‑day Trend","trend30":"30‑day Trend","dash_range":"Range",
+        "sync_conflict":"{} was changed by someone else and conflicts with local edits:\n\n{}\n\nKeep your local edits? (No takes the version on disk)","sync_deleted":"deleted on one side",
+        "import_title":"Import from Folders…","import_add_dir":"+ Add Folder","import_scan":"Scan","import_scanning":"Scanning…",
+        "import_found":"{} new tools found ({}/{} files unchanged, from cache)","import_all":"Select All","import_none":"Select None",
+        "import_col_name":"Name","import_col_type":"Type","import_col_category":"Category","import_col_path":"Path","import_col_doc":"Doc",
+        "hist_title":"Run History","hist_search":"Regex search (Enter jumps to next)","hist_case":"Ignore case","hist_filter":"Matching lines only",
+        "hist_status":"{} lines, {}, {}% indexed","hist_matches":"{} matching lines","hist_bad_regex":"Invalid regex",
+        "proc_title":"Running Programs","proc_col_tool":"Tool","proc_col_category":"Category","proc_col_state":"State","proc_col_pid":"PID",
+        "proc_col_priority":"Priority","proc_col_elapsed":"Elapsed","proc_col_rss":"Memory","proc_queued":"Queued","proc_running":"Running",
+        "proc_suspended":"Suspended","proc_kill":"Kill","proc_suspend":"Suspend","proc_resume":"Resume","proc_cancel":"Cancel",
+        "proc_limits":"{} running / limit {}, {} per category, memory budget {} MB (0 = unlimited)","proc_max":"Concurrent programs (0 = unlimited)","proc_per_cat":"per category",
+        "catalog_backend":"Catalog storage","backend_json":"JSON file (can be shared via a sync folder)","backend_sqlite":"SQLite database (faster for large catalogs)",
+        "backend_tip":"Takes effect after restart; the existing catalog is migrated automatically. Do not share an SQLite catalog through a sync folder",
+        "proc_quit_queued":"{n} programs are still queued and the queue is lost on exit:","proc_start_all":"Start them all now",
+        "proc_budget":"Memory budget (0 = none)","proc_priority":"Launch priority",
+        "palette_title":"Quick Launch","palette_hint":"Type a tool name (Enter to launch, Esc to close)","palette_uses":"{:.1f} recent uses",
+        "opt_website":"Website","opt_cli":"CLI","opt_exec":"Executable",
+        "cli_title":"Run CLI Tool","cli_args":"Args","cli_run":"Run","cli_output":"Output",
+        "opt_java_cli": "Java CLI Tool",
+        "opt_java_exec": "Java Executable",
+        "cli_encoding":"Output Encoding","cli_scrollback":"Scrollback Lines","cli_log":"Full output",
+        "cli_dropped":"Output too fast, {n} characters not shown",
+        "recovered":"Some data files could not be read and were recovered:",
+        "write_failed":"A file could not be saved. The changes are kept in memory and will be retried:",
+        "write_failed_quit":"These files still cannot be saved and quitting now loses the changes. Fix the problem (disk space, permissions, file locked by another program) and retry:",
+        "tool_broken":"This tool cannot be launched:","launch_anyway":"Launch anyway",
+        "run_stats":"Run Statistics","run_export":"Export run records…",
+        "run_col_tool":"Tool","run_col_runs":"Runs","run_col_failures":"Failures",
+        "run_col_wall_p50":"Duration p50","run_col_wall_p95":"Duration p95",
+        "run_col_rss_p50":"Memory p50","run_col_rss_p95":"Memory p95","run_col_spawn_p50":"Spawn p50",
+        "cache_results":"Cache results","cache_force":"Force rerun",
+        "cache_hit":"Cached result from {when}; the tool was not run. Tick \"Force rerun\" to run it again",
+        "opt_pipeline":"Tool Pipeline","pipe_new":"New Pipeline…","pipe_title":"Tool Pipeline",
+        "pipe_add_stage":"+ Add Stage","pipe_save":"Save to Catalog","pipe_col_tool":"Tool",
+        "pipe_incomplete":"Enter a name and add at least one stage","pipe_bad_stage":"A pipeline stage is not usable:",
+        "pipe_col_stage":"Stage","pipe_col_state":"State","pipe_col_in":"In","pipe_col_out":"Out",
+        "pipe_col_rate":"Throughput","pipe_col_backpressure":"Backpressure",
+        "health_rescan":"Re-check",
+        "warm":"Warm interpreter","preload":"Preload modules","cli_warm":"warm worker",
+        "jvm_daemon":"Persistent JVM","cli_jvm":"persistent JVM","cli_jvm_failed":"Persistent JVM failed ({err}); re-running with a fresh JVM",
+        "batch_run":"Batch Run…","batch_title":"Batch Run","batch_targets":"Targets",
+        "batch_targets_hint":"One target per line; {target} in the args is replaced, otherwise the target is appended",
+        "batch_load":"Load from file…","batch_concurrency":"Concurrency","batch_timeout":"Timeout","batch_retries":"Retries",
+        "batch_export":"Export results…",
+        "batch_col_target":"Target","batch_col_status":"Status","batch_col_attempts":"Attempts",
+        "batch_col_duration":"Duration","batch_col_exit_code":"Exit code",
+        "batch_state_queued":"Queued","batch_state_running":"Running","batch_state_done":"Done",
+        "batch_state_failed":"Failed","batch_state_timeout":"Timed out","batch_state_cancelled":"Cancelled",
+    }
+}
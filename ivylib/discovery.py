@@ -0,0 +1,202 @@
+# 批量导入（不依赖 Qt）：遍历若干目录，按扩展名、shebang、PE 子系统和 jar 清单推断工具类型，
+# 同目录下的 README/同名 .md 作为说明文档。每个文件的判定结果按 (mtime, 大小) 缓存，重复扫描只读有变化的文件
+import os, json, struct, zipfile, threading
+from concurrent.futures import ThreadPoolExecutor
+from .storage import save_json
+
+DISCOVERY_CACHE = "import_cache.json"
+SKIP_DIRS = {".git", ".svn", ".hg", "__pycache__", "node_modules", ".venv", "venv", "site-packages", ".idea"}
+# .ps1/.sh 不能直接启动，导入后由 launch.build_command 交给 powershell / sh 运行
+SCRIPT_EXTS = {".py": "py", ".pyw": "py", ".jar": "jar", ".exe": "exe", ".bat": "cli", ".cmd": "cli",
+               ".ps1": "cli", ".sh": "sh"}
+DOC_EXTS = (".md", ".txt", ".pdf")
+GUI_MODULES = (b"tkinter", b"Tkinter", b"PyQt5", b"PyQt6", b"PySide2", b"PySide6", b"wx", b"kivy", b"customtkinter")
+HEAD = 64 << 10                          # 只读文件开头这么多字节做判断
+
+
+def _is_candidate(entry):
+    ext = os.path.splitext(entry.name)[1].lower()
+    if ext in SCRIPT_EXTS:
+        return True
+    # 没有扩展名的可执行文件（ELF、带 shebang 的脚本）
+    return not ext and os.name != "nt" and os.access(entry.path, os.X_OK)
+
+
+def pe_subsystem(head):
+    # Windows PE：可选头里的 Subsystem，2 = 图形界面，3 = 控制台
+    if head[:2] != b"MZ" or len(head) < 0x40:
+        return None
+    off = struct.unpack_from("<I", head, 0x3C)[0]
+    if head[off:off + 4] != b"PE\0\0" or len(head) < off + 24 + 70:
+        return None
+    return struct.unpack_from("<H", head, off + 24 + 68)[0]
+
+
+def jar_kind(path):
+    # 有 Main-Class 才能 java -jar；带 JavaFX 入口或打包了 JavaFX 的视为图形界面程序
+    try:
+        with zipfile.ZipFile(path) as z:
+            names = z.namelist()
+            manifest = z.read("META-INF/MANIFEST.MF").decode("utf-8", "replace") if "META-INF/MANIFEST.MF" in names else ""
+    except (OSError, zipfile.BadZipFile, KeyError):
+        return None
+    keys = {l.split(":", 1)[0].strip() for l in manifest.splitlines() if ":" in l}
+    if "JavaFX-Application-Class" in keys or any(n.startswith("javafx/") for n in names):
+        return "opt_java_exec"
+    if "Main-Class" not in keys:
+        return None                      # 类库，不是工具
+    return "opt_java_cli"
+
+
+def classify(path):
+    # 返回类型键；不是可启动的工具返回 None
+    ext = os.path.splitext(path)[1].lower()
+    kind = SCRIPT_EXTS.get(ext)
+    if kind == "jar":
+        return jar_kind(path)
+    try:
+        with open(path, "rb") as f:
+            head = f.read(HEAD)
+    except OSError:
+        return None
+    if kind == "exe":
+        return "opt_exec" if pe_subsystem(head) == 2 else "opt_cli"
+    if kind == "cli":
+        return "opt_cli"
+    first = head.split(b"\n", 1)[0]
+    if kind == "py" or (first.startswith(b"#!") and b"python" in first):
+        gui = ext == ".pyw" or any(b"import " + m in head or b"from " + m in head for m in GUI_MODULES)
+        return "opt_py_exec" if gui else "opt_py_cli"
+    if kind == "sh" or first.startswith(b"#!") or head[:4] == b"\x7fELF":
+        return "opt_cli"
+    return None
+
+
+def find_doc(path, listing):
+    # 同名的 .md/.txt/.pdf 优先，其次目录里的 README，最后是目录里唯一的一个 .md
+    stem = os.path.splitext(os.path.basename(path))[0].lower()
+    docs = {n.lower(): n for n in listing if n.lower().endswith(DOC_EXTS)}
+    for cand in [stem + e for e in DOC_EXTS] + ["readme.md", "readme.txt", "readme_zh.md", "readme-zh.md"]:
+        if cand in docs:
+            return os.path.join(os.path.dirname(path), docs[cand])
+    md = [n for low, n in docs.items() if low.endswith(".md")]
+    return os.path.join(os.path.dirname(path), md[0]) if len(md) == 1 else ""
+
+
+def norm(path):
+    return os.path.normcase(os.path.realpath(path))
+
+
+class FingerprintCache:
+    # path -> [mtime_ns, 大小, 类型键或 None]；文件没变就直接用上次的结论
+    def __init__(self, path=DISCOVERY_CACHE):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.hits = self.misses = 0
+
+    def classify(self, path, st):
+        stamp = [st.st_mtime_ns, st.st_size]
+        hit = self.entries.get(path)
+        if hit and hit[:2] == stamp:
+            with self.lock:
+                self.hits += 1
+            return hit[2]
+        key = classify(path)
+        with self.lock:
+            self.entries[path] = stamp + [key]
+            self.misses += 1
+        return key
+
+    def prune(self, roots, seen):
+        # 扫描过的根目录下已经不存在的文件从缓存里去掉
+        prefixes = tuple(os.path.join(r, "") for r in roots)
+        for p in [p for p in self.entries if p.startswith(prefixes) and p not in seen]:
+            del self.entries[p]
+
+    def save(self):
+        try: save_json(self.path, self.entries)
+        except OSError: pass
+
+
+def _list_dir(d, depth, max_depth):
+    # 读一层：(文件名列表, 候选文件 [(路径, stat)], 要继续进入的子目录)；读不了的目录返回 None
+    try:
+        entries = list(os.scandir(d))
+    except OSError:
+        return None
+    names, cands, subdirs = [], [], []
+    for e in entries:
+        try:
+            if e.is_dir(follow_symlinks=False):
+                if depth < max_depth and e.name not in SKIP_DIRS and not e.name.startswith("."):
+                    subdirs.append(e.path)
+            elif e.is_file():
+                names.append(e.name)
+                if _is_candidate(e):
+                    cands.append((e.path, e.stat()))
+        except OSError:
+            continue
+    return names, cands, subdirs
+
+
+def walk(root, max_depth=6, depth=0):
+    # 逐层 scandir，产出 (目录, 文件名列表, 候选文件 [(路径, stat)])；跳过隐藏目录和常见的依赖目录
+    stack = [(root, depth)]
+    while stack:
+        d, depth = stack.pop()
+        listed = _list_dir(d, depth, max_depth)
+        if listed is None:
+            continue
+        names, cands, subdirs = listed
+        stack.extend((s, depth + 1) for s in subdirs)
+        yield d, names, cands
+
+
+def walk_parallel(root, pool, max_depth=6):
+    # 根目录这一层在当前线程读，每个一级子目录（也就是每个分类）交给线程池各自遍历：
+    # 工具目录常在网络盘上，scandir/stat 主要在等 I/O，并行后总耗时接近最慢的那个分类。按子目录名顺序产出
+    listed = _list_dir(root, 0, max_depth)
+    if listed is None:
+        return
+    names, cands, subdirs = listed
+    futs = [pool.submit(lambda d=d: list(walk(d, max_depth, 1))) for d in sorted(subdirs)]
+    yield root, names, cands
+    for f in futs:
+        yield from f.result()
+
+
+def scan(roots, existing=(), cache=None, workers=8, progress=None):
+    # 返回候选工具列表 [{name, key, path, doc_path, category}]；existing 是目录里已有工具的路径，按真实路径去重。
+    # 各分类子目录的遍历和文件判定（需要读文件头或打开 jar）都交给线程池；progress(已判定, 总数) 可选
+    cache = cache or FingerprintCache()
+    roots = [os.path.abspath(r) for r in roots]
+    known = {norm(p) for p in existing if p}
+    found, seen, jobs = [], set(), []
+    with ThreadPoolExecutor(max_workers=workers) as walkers, ThreadPoolExecutor(max_workers=workers) as pool:
+        for root in roots:
+            for d, names, cands in walk_parallel(root, walkers):
+                rel = os.path.relpath(d, root)
+                category = os.path.basename(root) if rel == "." else rel.split(os.sep)[0]
+                for path, st in cands:
+                    seen.add(path)
+                    real = norm(path)
+                    if real in known:
+                        continue
+                    known.add(real)
+                    jobs.append((path, names, category, pool.submit(cache.classify, path, st)))
+        for i, (path, names, category, fut) in enumerate(jobs, 1):
+            key = fut.result()
+            if progress:
+                progress(i, len(jobs))
+            if key is None:
+                continue
+            found.append({"name": os.path.splitext(os.path.basename(path))[0], "key": key, "path": path,
+                          "doc_path": find_doc(path, names), "category": category})
+    cache.prune(roots, seen)
+    cache.save()
+    return found
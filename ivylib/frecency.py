@@ -0,0 +1,92 @@
+# 快速启动面板的排序（不依赖 Qt）：frecency = Σ exp(-λ·(now - tᵢ))，每次使用的权重按半衰期指数衰减。
+# 在对数空间里相对固定零点累加：log_s = log Σ exp(λ·(tᵢ - epoch))，所有工具随时间同比衰减，
+# 排序与当前时间无关，每次启动只需一次 logaddexp，不用重扫历史；也不会因为 exp 溢出
+import re, math, time, bisect, datetime, itertools
+
+HALF_LIFE_DAYS = 14
+
+
+class Frecency:
+    def __init__(self, half_life_days=HALF_LIFE_DAYS, epoch=None):
+        self.rate = math.log(2) / (half_life_days * 86400)
+        self.epoch = time.time() if epoch is None else epoch
+        self.logs = {}                   # 工具名 -> log_s
+
+    def _add(self, tool, w):
+        old = self.logs.get(tool)
+        self.logs[tool] = w if old is None else max(old, w) + math.log1p(math.exp(-abs(old - w)))
+
+    def bump(self, tool, ts=None, n=1):
+        self._add(tool, math.log(n) + self.rate * ((time.time() if ts is None else ts) - self.epoch))
+
+    def load(self, rows):
+        # 从日汇总 (日期, 工具, 次数) 初始化；同一天的使用按当天正午计，误差不到半天
+        noon = {}
+        for day, tool, n in rows:
+            if day not in noon:
+                d = datetime.date.fromisoformat(day)
+                noon[day] = time.mktime(d.timetuple()) + 43200
+            self.bump(tool, noon[day], n)
+
+    def merge(self, other):
+        # 分数是各次使用的和，换算到同一零点后直接相加（半衰期须相同）；后台初始化期间的启动由此并入
+        shift = self.rate * (other.epoch - self.epoch)
+        for tool, w in other.logs.items():
+            self._add(tool, w + shift)
+        return self
+
+    def key(self, tool):
+        return self.logs.get(tool, -math.inf)
+
+    def score(self, tool, now=None):
+        # 折算到当前时刻的加权次数（显示用）
+        log_s = self.logs.get(tool)
+        if log_s is None:
+            return 0.0
+        return math.exp(log_s - self.rate * ((time.time() if now is None else now) - self.epoch))
+
+
+class Ranker:
+    # 面板打开时把工具按 frecency（相同则按名称）排好一次，之后每次按键顺序扫描、分档收集，
+    # 前缀档凑够 limit 个即停：同档内先遇到的就是分数高的，不用再排序。
+    # 名称前缀 > 名称包含 > 检索索引命中（分类/说明/容错）> 名称子序列（如 "sqm" -> sqlmap）
+    def __init__(self, tools, frecency):
+        get, none = frecency.logs.get, -math.inf
+        self.entries = sorted(((t, t["name"].lower()) for t in tools), key=lambda e: e[1])
+        self.entries.sort(key=lambda e: get(e[0]["name"], none), reverse=True)     # 稳定排序，同分保持名称顺序
+        self.by_id = {t["id"]: t for t in tools}
+        # 子序列匹配在拼接后的整段文本上一次 finditer 完成，按起始偏移找回是第几个工具
+        self.blob = "\n".join(low for _, low in self.entries)
+        self.starts = list(itertools.accumulate((len(low) + 1 for _, low in self.entries), initial=0))
+
+    def rank(self, query, limit=20, search=None):
+        q = query.strip().lower()
+        if not q:
+            return [t for t, _ in self.entries[:limit]]
+        prefix, inner = [], []
+        for t, low in self.entries:
+            if low.startswith(q):
+                prefix.append(t)
+                if len(prefix) >= limit:
+                    break
+            elif len(inner) < limit and q in low:
+                inner.append(t)
+        out = (prefix + inner)[:limit]
+        if len(out) < limit and search is not None:
+            seen = {t["id"] for t in out}
+            for tid in search(query):
+                if tid not in seen and tid in self.by_id:
+                    out.append(self.by_id[tid]); seen.add(tid)
+                    if len(out) >= limit:
+                        return out
+        if len(out) < limit:
+            # s[^q\n]*q[^m\n]*m：没有回溯，也不会跨到下一个名称
+            sub = re.compile("".join(re.escape(c) + f"[^{re.escape(n)}\\n]*" for c, n in zip(q, q[1:])) + re.escape(q[-1]))
+            seen = {t["id"] for t in out}
+            for m in sub.finditer(self.blob):
+                t = self.entries[bisect.bisect_right(self.starts, m.start()) - 1][0]
+                if t["id"] not in seen:
+                    out.append(t); seen.add(t["id"])
+                    if len(out) >= limit:
+                        break
+        return out
@@ -0,0 +1,105 @@
+# 工具健康检查（不依赖 Qt）：检查 path / doc_path 是否存在，解析 python_path / java_path 并探测版本。
+# 文件状态按 TTL 缓存，解释器按 (解析后的路径, mtime) 缓存版本，成千上万个工具共用同一次探测
+import os, time, shutil, threading, subprocess
+from .launch import type_key
+
+OK, WARN, BAD = "ok", "warn", "bad"
+STAT_TTL = 30          # 秒：路径存在性的缓存时间（网络盘上 stat 可能很慢）
+WHICH_TTL = 300        # 秒：命令在 PATH 上的解析结果
+PROBE_TIMEOUT = 5
+
+
+class HealthCache:
+    def __init__(self):
+        self.stats = {}        # path -> (检查时间, 是否存在)
+        self.which = {}        # 命令 -> (检查时间, 解析后的路径或 None)
+        self.versions = {}     # (路径, mtime) -> 版本字符串或 None
+        self.lock = threading.Lock()     # 同一解释器只探测一次
+
+    def exists(self, path, now=None):
+        now = now or time.monotonic()
+        hit = self.stats.get(path)
+        if hit and now - hit[0] < STAT_TTL:
+            return hit[1]
+        ok = os.path.isfile(path)
+        self.stats[path] = (now, ok)
+        return ok
+
+    def forget(self, *paths):
+        # 路径或命令名都可以：文件状态和 PATH 解析结果一起作废
+        for p in paths:
+            self.stats.pop(p, None)
+            self.which.pop(p, None)
+
+    def clear(self):
+        with self.lock:
+            self.stats.clear(); self.which.clear(); self.versions.clear()
+
+    def resolve(self, cmd):
+        now = time.monotonic()
+        hit = self.which.get(cmd)
+        if hit and now - hit[0] < WHICH_TTL:
+            return hit[1]
+        path = shutil.which(cmd)
+        self.which[cmd] = (now, path)
+        return path
+
+    def version(self, path, flag):
+        try: key = (path, os.stat(path).st_mtime_ns)      # 解释器升级后 mtime 变化，自动重新探测
+        except OSError: return None
+        with self.lock:
+            if key not in self.versions:
+                self.versions[key] = probe_version(path, flag)
+            return self.versions[key]
+
+
+def probe_version(path, flag):
+    # python --version 输出到 stdout（旧版本是 stderr），java -version 输出到 stderr；取第一行
+    try:
+        r = subprocess.run([path, flag], capture_output=True, timeout=PROBE_TIMEOUT,
+                           creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    text = (r.stdout or r.stderr).decode("utf-8", "replace").strip()
+    return text.splitlines()[0] if text else None
+
+
+def check_tool(tool, settings, i18n, cache):
+    # 返回 (状态, 问题列表, 说明列表)；状态取问题中最严重的一个
+    key = type_key(tool.get("type", ""), i18n)
+    problems, notes = [], []
+    if key is None:
+        return BAD, [f"unknown type: {tool.get('type', '')}"], notes
+    if key == "opt_pipeline":
+        # 各级引用的工具在运行时解析，这里只看是否为空
+        return (OK, [], []) if tool.get("stages") else (BAD, ["pipeline has no stages"], [])
+    if key != "opt_website":
+        exe = tool.get("path", "")
+        if not exe:
+            problems.append((BAD, "path is empty"))
+        elif not cache.exists(exe):
+            problems.append((BAD, f"path not found: {exe}"))
+    doc = tool.get("doc_path", "")
+    if doc and not cache.exists(doc):
+        problems.append((WARN, f"doc not found: {doc}"))
+    interp = None
+    if key in ("opt_py_cli", "opt_py_exec"):
+        interp = settings.get("python_path", "python"), "--version"
+    elif key in ("opt_java_cli", "opt_java_exec"):
+        interp = settings.get("java_path", "java"), "-version"
+    if interp:
+        cmd, flag = interp
+        path = cmd if os.path.isabs(cmd) and cache.exists(cmd) else cache.resolve(cmd)
+        if not path:
+            problems.append((BAD, f"interpreter not found: {cmd}"))
+        else:
+            ver = cache.version(path, flag)
+            if ver: notes.append(f"{ver} ({path})")
+            else: problems.append((WARN, f"interpreter did not report a version: {path}"))
+    state = BAD if any(s == BAD for s, _ in problems) else WARN if problems else OK
+    return state, [m for _, m in problems], notes
+
+
+def check_tools(tools, settings, i18n, cache):
+    # 后台线程里按块调用；返回 {id: (状态, 问题, 说明)}
+    return {t["id"]: check_tool(t, settings, i18n, cache) for t in tools}
@@ -0,0 +1,93 @@
+# 批量导入窗口：选择若干目录，后台扫描出候选工具，勾选、改名/改分类后一次加入目录
+import os
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListWidget, QFileDialog,
+    QTableWidget, QTableWidgetItem, QHeaderView, QDialogButtonBox
+)
+from PyQt5.QtCore import Qt
+from ivylib.discovery import scan, FingerprintCache
+from ivylib.qt_tasks import run_in_background
+
+
+class ImportDialog(QDialog):
+    COLS = ("name", "type", "category", "path", "doc")
+
+    def __init__(self, L, existing, roots=(), parent=None):
+        # existing：目录里已有工具的路径（去重用）；roots：上次扫描过的目录
+        super().__init__(parent)
+        self.L, self.existing = L, list(existing)
+        self.found = []
+        self.setWindowTitle(L["import_title"])
+        self.resize(1000, 700)
+        layout = QVBoxLayout(self)
+        self.root_list = QListWidget(); self.root_list.addItems(roots)
+        self.root_list.setFixedHeight(90)
+        layout.addWidget(self.root_list)
+        h = QHBoxLayout()
+        h.addWidget(QPushButton(L["import_add_dir"], clicked=self.add_root))
+        h.addWidget(QPushButton(L["delete"], clicked=lambda: self.root_list.takeItem(self.root_list.currentRow())))
+        h.addStretch()
+        self.scan_btn = QPushButton(L["import_scan"], clicked=self.start_scan); h.addWidget(self.scan_btn)
+        layout.addLayout(h)
+        self.table = QTableWidget(0, len(self.COLS))
+        self.table.setHorizontalHeaderLabels([L["import_col_" + c] for c in self.COLS])
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+        h = QHBoxLayout()
+        self.status = QLabel(); h.addWidget(self.status); h.addStretch()
+        h.addWidget(QPushButton(L["import_all"], clicked=lambda: self.check_all(Qt.Checked)))
+        h.addWidget(QPushButton(L["import_none"], clicked=lambda: self.check_all(Qt.Unchecked)))
+        layout.addLayout(h)
+        btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        btns.accepted.connect(self.accept); btns.rejected.connect(self.reject)
+        layout.addWidget(btns)
+
+    def roots(self):
+        return [self.root_list.item(i).text() for i in range(self.root_list.count())]
+
+    def add_root(self):
+        d = QFileDialog.getExistingDirectory(self, self.L["import_add_dir"])
+        if d and d not in self.roots():
+            self.root_list.addItem(d)
+
+    def start_scan(self):
+        roots = [r for r in self.roots() if os.path.isdir(r)]
+        if not roots: return
+        self.scan_btn.setEnabled(False)
+        self.status.setText(self.L["import_scanning"])
+        cache = FingerprintCache()
+        run_in_background(lambda: (scan(roots, self.existing, cache), cache.hits, cache.misses),
+                          on_done=self.on_scanned, on_error=self.on_failed)
+
+    def on_failed(self, e):
+        self.scan_btn.setEnabled(True)
+        self.status.setText(str(e))
+
+    def on_scanned(self, result):
+        self.found, hits, misses = result
+        self.scan_btn.setEnabled(True)
+        self.status.setText(self.L["import_found"].format(len(self.found), hits, hits + misses))
+        self.table.setRowCount(len(self.found))
+        for row, t in enumerate(self.found):
+            name = QTableWidgetItem(t["name"]); name.setCheckState(Qt.Checked)
+            cells = (name, QTableWidgetItem(self.L[t["key"]]), QTableWidgetItem(t["category"]),
+                     QTableWidgetItem(t["path"]), QTableWidgetItem(t["doc_path"]))
+            for c, item in enumerate(cells):
+                if c in (1, 3):          # 类型和路径不在这里改，导入后可编辑
+                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+                self.table.setItem(row, c, item)
+
+    def check_all(self, state):
+        for row in range(self.table.rowCount()):
+            self.table.item(row, 0).setCheckState(state)
+
+    def selected(self):
+        # 勾选的行 -> 与 AddToolDialog.get_tool_info 相同字段的工具字典（不含 id）
+        out = []
+        for row, t in enumerate(self.found):
+            if self.table.item(row, 0).checkState() != Qt.Checked:
+                continue
+            out.append({"name": self.table.item(row, 0).text().strip() or t["name"], "type": self.L[t["key"]],
+                        "url": "", "category": self.table.item(row, 2).text().strip(), "path": t["path"],
+                        "args": "", "doc_path": self.table.item(row, 4).text().strip(), "description": ""})
+        return out
@@ -0,0 +1,222 @@
+// 常驻 JVM 启动器（nailgun 式）：在本机回环端口上监听，每个请求用独立的类加载器加载 jar/类目录，
+// 在本进程里调用 main，stdout/stderr 按帧回传，System.exit 被拦截为退出码。
+// 启动：java [-Djava.security.manager=allow] IvyLauncher.java
+// 握手：标准输出第一行 "IVYLAUNCHER <端口> exit=trap|none <令牌>"。令牌每次启动随机生成，只经标准输出管道
+// 交给父进程；本机其他用户即使连上端口，拿不到令牌也不能让启动器执行任何代码
+//
+// 请求（UTF-8 文本行，值经 URL 编码）：
+//   第 1 行令牌，第 2 行 classpath，第 3 行主类（空表示从 jar 清单读取），第 4 行参数个数 n，随后 n 行参数
+// 响应帧：1 字节类型 + 4 字节大端长度 + 数据；'O' 标准输出，'E' 标准错误，'X' 退出码（4 字节）
+// 终止：客户端在收到 'X' 之前断开即终止该次运行。先中断会话的线程，宽限期后仍有线程存活（死循环、
+// 不响应中断的阻塞 I/O）就以 EXIT_KILLED 退出整个 JVM，由父进程重启，不让残留线程和内存留给之后的运行
+import java.io.*;
+import java.lang.reflect.*;
+import java.net.*;
+import java.nio.charset.StandardCharsets;
+import java.security.MessageDigest;
+import java.security.SecureRandom;
+import java.util.jar.*;
+
+public class IvyLauncher {
+    static final InheritableThreadLocal<Session> CURRENT = new InheritableThreadLocal<>();
+    static boolean exitTrapped = false;
+    static byte[] token;
+    static final int EXIT_KILLED = 75;
+    static final long KILL_GRACE_MS = 2000;
+
+    static class ExitTrap extends SecurityException {
+        final int code;
+        ExitTrap(int code) { super("System.exit(" + code + ")"); this.code = code; }
+    }
+
+    // 一个请求对应一个会话：写回 socket 的帧输出在会话内串行化
+    static class Session {
+        final DataOutputStream out;
+        volatile boolean closed = false;
+        Session(OutputStream os) { out = new DataOutputStream(new BufferedOutputStream(os, 1 << 16)); }
+
+        synchronized void frame(char type, byte[] buf, int off, int len) {
+            if (closed) return;
+            try {
+                out.writeByte(type); out.writeInt(len); out.write(buf, off, len);
+                if (type == 'X') out.flush();
+            } catch (IOException e) { closed = true; }
+        }
+
+        synchronized void flush() {
+            try { out.flush(); } catch (IOException e) { closed = true; }
+        }
+    }
+
+    // 按当前线程所属会话分发输出；不属于任何会话的线程写到守护进程自己的输出
+    static class RoutingStream extends OutputStream {
+        final char type; final PrintStream fallback;
+        RoutingStream(char type, PrintStream fallback) { this.type = type; this.fallback = fallback; }
+        public void write(int b) { write(new byte[]{(byte) b}, 0, 1); }
+        public void write(byte[] b, int off, int len) {
+            Session s = CURRENT.get();
+            if (s == null) fallback.write(b, off, len); else s.frame(type, b, off, len);
+        }
+        public void flush() {
+            Session s = CURRENT.get();
+            if (s == null) fallback.flush(); else s.flush();
+        }
+    }
+
+    @SuppressWarnings("removal")
+    static void installExitTrap() {
+        try {
+            System.setSecurityManager(new SecurityManager() {
+                public void checkPermission(java.security.Permission p) { }
+                public void checkPermission(java.security.Permission p, Object ctx) { }
+                public void checkExit(int status) {
+                    if (CURRENT.get() != null) throw new ExitTrap(status);
+                }
+            });
+            exitTrapped = true;
+        } catch (UnsupportedOperationException | SecurityException e) {
+            exitTrapped = false;     // 新版 JDK 不再支持，Python 端据此改走冷启动
+        }
+    }
+
+    static String dec(String s) throws UnsupportedEncodingException {
+        return URLDecoder.decode(s, "UTF-8");
+    }
+
+    static String mainClassOf(File jar) throws IOException {
+        try (JarFile jf = new JarFile(jar)) {
+            Manifest m = jf.getManifest();
+            String main = m == null ? null : m.getMainAttributes().getValue(Attributes.Name.MAIN_CLASS);
+            if (main == null) throw new IOException("no Main-Class in " + jar);
+            return main.trim();
+        }
+    }
+
+    static ExitTrap findTrap(Throwable t) {
+        for (Throwable c = t; c != null; c = c.getCause())
+            if (c instanceof ExitTrap) return (ExitTrap) c;
+        return null;
+    }
+
+    // 工具抛出的异常：System.exit 返回其退出码；其他异常与独立 JVM 一样打印堆栈、退出码 1
+    static int exitCodeOf(Throwable t, Session s) {
+        ExitTrap trap = findTrap(t);
+        if (trap != null) return trap.code;
+        StringWriter sw = new StringWriter();
+        t.printStackTrace(new PrintWriter(sw));
+        byte[] b = sw.toString().getBytes(StandardCharsets.UTF_8);
+        s.frame('E', b, 0, b.length);
+        return 1;
+    }
+
+    static boolean anyAlive(ThreadGroup group) {
+        Thread[] ts = new Thread[group.activeCount() + 8];
+        for (int i = 0, k = group.enumerate(ts, true); i < k; i++)
+            if (ts[i].isAlive()) return true;
+        return false;
+    }
+
+    static void serve(Socket sock) {
+        Session session = null;
+        try {
+            sock.setSoTimeout(10000);        // 令牌和请求头必须很快到达
+            BufferedReader in = new BufferedReader(new InputStreamReader(sock.getInputStream(), StandardCharsets.UTF_8));
+            String given = in.readLine();
+            // 定长比较，不泄露前缀是否正确；不对就直接断开，不回任何帧
+            if (given == null || !MessageDigest.isEqual(token, given.trim().getBytes(StandardCharsets.US_ASCII))) return;
+            String cp = dec(in.readLine()), main = dec(in.readLine());
+            int n = Integer.parseInt(in.readLine().trim());
+            String[] args = new String[n];
+            for (int i = 0; i < n; i++) args[i] = dec(in.readLine());
+            sock.setSoTimeout(0);
+            session = new Session(sock.getOutputStream());
+            File cpFile = new File(cp);
+            if (main.isEmpty()) main = mainClassOf(cpFile);
+            final Session s = session;
+            final String mainName = main;
+            // 父加载器用平台类加载器，工具之间、工具与启动器之间的类互不可见
+            final URLClassLoader loader = new URLClassLoader(new URL[]{cpFile.toURI().toURL()},
+                    ClassLoader.getSystemClassLoader().getParent());
+            final int[] code = {0};
+            final boolean[] exited = {false};
+            final boolean[] reported = {false};
+            ThreadGroup group = new ThreadGroup("ivy-" + cpFile.getName());
+            Thread t = new Thread(group, () -> {
+                CURRENT.set(s);
+                try {
+                    Method m = Class.forName(mainName, true, loader).getMethod("main", String[].class);
+                    m.invoke(null, (Object) args);
+                } catch (Throwable e) {
+                    Throwable cause = e instanceof InvocationTargetException ? e.getCause() : e;
+                    exited[0] = findTrap(cause) != null;
+                    code[0] = exitCodeOf(cause, s);
+                }
+            }, "main");
+            t.setContextClassLoader(loader);
+            t.start();
+            // 监视连接：没收到退出码就断开视为终止请求，中断该会话的所有线程，宽限期后还没结束就退出整个 JVM
+            Thread watch = new Thread(() -> {
+                try { while (sock.getInputStream().read() >= 0) { } } catch (IOException ignored) { }
+                s.closed = true; group.interrupt();
+                synchronized (reported) { if (reported[0]) return; }
+                long deadline = System.currentTimeMillis() + KILL_GRACE_MS;
+                try {
+                    while (anyAlive(group) && System.currentTimeMillis() < deadline) Thread.sleep(50);
+                } catch (InterruptedException ignored) { }
+                if (anyAlive(group)) Runtime.getRuntime().halt(EXIT_KILLED);
+            });
+            watch.setDaemon(true); watch.start();
+            t.join();
+            // 与独立 JVM 一致：没有调用 System.exit 时，等工具启动的非守护线程都结束后才算退出
+            while (!exited[0] && !s.closed) {
+                Thread[] ts = new Thread[group.activeCount() + 8];
+                Thread pending = null;
+                for (int i = 0, k = group.enumerate(ts, true); i < k; i++)
+                    if (!ts[i].isDaemon() && ts[i].isAlive()) { pending = ts[i]; break; }
+                if (pending == null) break;
+                pending.join();
+            }
+            synchronized (reported) { reported[0] = !s.closed; }
+            byte[] x = java.nio.ByteBuffer.allocate(4).putInt(code[0]).array();
+            s.frame('X', x, 0, 4);
+            try { loader.close(); } catch (IOException ignored) { }
+        } catch (Throwable e) {
+            if (session != null) {
+                byte[] x = java.nio.ByteBuffer.allocate(4).putInt(exitCodeOf(e, session)).array();
+                session.frame('X', x, 0, 4);
+            }
+        } finally {
+            try { sock.close(); } catch (IOException ignored) { }
+        }
+    }
+
+    public static void main(String[] argv) throws IOException {
+        PrintStream realOut = System.out, realErr = System.err;
+        System.setOut(new PrintStream(new RoutingStream('O', realOut), true));
+        System.setErr(new PrintStream(new RoutingStream('E', realErr), true));
+        System.setIn(new ByteArrayInputStream(new byte[0]));
+        installExitTrap();
+        byte[] raw = new byte[32];
+        new SecureRandom().nextBytes(raw);
+        StringBuilder hex = new StringBuilder();
+        for (byte b : raw) hex.append(String.format("%02x", b));
+        token = hex.toString().getBytes(StandardCharsets.US_ASCII);
+        ServerSocket server = new ServerSocket(0, 50, InetAddress.getLoopbackAddress());
+        realOut.println("IVYLAUNCHER " + server.getLocalPort() + " exit=" + (exitTrapped ? "trap" : "none") + " " + hex);
+        realOut.flush();
+        // 父进程（IvyDock）关闭标准输入即退出，避免残留
+        InputStream parent = new FileInputStream(FileDescriptor.in);
+        Thread stdinWatch = new Thread(() -> {
+            try { while (parent.read() >= 0) { } }
+            catch (IOException ignored) { }
+            Runtime.getRuntime().halt(0);
+        });
+        stdinWatch.setDaemon(true); stdinWatch.start();
+        while (true) {
+            Socket sock = server.accept();
+            Thread worker = new Thread(() -> serve(sock), "ivy-session");
+            worker.setDaemon(true);
+            worker.start();
+        }
+    }
+}
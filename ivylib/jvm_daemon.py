@@ -0,0 +1,151 @@
+# 常驻 JVM：为开启 jvm_daemon 的 Java 命令行工具复用同一个启动器 JVM（见 java/IvyLauncher.java），
+# 每次运行通过本机端口发请求（第一行是握手时拿到的随机令牌，别的本机用户连上端口也无法使用），
+# 输出按帧流回。守护进程不可用或中途异常时由调用方退回冷启动
+import os, struct
+from urllib.parse import quote
+from PyQt5.QtCore import QObject, QProcess, pyqtSignal
+from PyQt5.QtNetwork import QTcpSocket, QHostAddress
+
+LAUNCHER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "java", "IvyLauncher.java")
+# JDK 18+ 需要显式允许才能安装 SecurityManager 拦截 System.exit；JDK 11 不认识 allow，去掉重试一次
+FLAG_SETS = (["-Djava.security.manager=allow"], [])
+# 终止的运行在宽限期内没有结束时，启动器以此退出码退出整个 JVM（见 IvyLauncher.EXIT_KILLED），随后重启
+EXIT_KILLED = 75
+
+
+def jvm_target(exe):
+    # (classpath, 主类)：jar 的主类由启动器从清单读取；.class 用所在目录作为 classpath
+    if exe.endswith(".jar"):
+        return exe, ""
+    return os.path.dirname(os.path.abspath(exe)), os.path.splitext(os.path.basename(exe))[0]
+
+
+class JvmRun(QObject):
+    output = pyqtSignal(bytes)
+    finished = pyqtSignal(int)
+    failed = pyqtSignal(str)          # 连接断开而没有收到退出码
+
+    def __init__(self, port, token, classpath, main, args, parent=None):
+        super().__init__(parent)
+        self.buf, self.done = b"", False
+        self.sock = QTcpSocket(self)
+        self.sock.connected.connect(lambda: self.sock.write(self._request(token, classpath, main, args)))
+        self.sock.readyRead.connect(self._read)
+        self.sock.disconnected.connect(self._closed)
+        self.sock.errorOccurred.connect(lambda _: self._closed())
+        self.sock.connectToHost(QHostAddress(QHostAddress.LocalHost), port)
+
+    @staticmethod
+    def _request(token, classpath, main, args):
+        lines = [token, quote(classpath), quote(main), str(len(args))] + [quote(a) for a in args]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def _read(self):
+        self.buf += self.sock.readAll().data()
+        while len(self.buf) >= 5:
+            kind, n = self.buf[:1], struct.unpack(">I", self.buf[1:5])[0]
+            if len(self.buf) < 5 + n:
+                break
+            payload, self.buf = self.buf[5:5 + n], self.buf[5 + n:]
+            if kind == b"X":
+                self.done = True
+                self.finished.emit(struct.unpack(">i", payload)[0])
+            else:
+                self.output.emit(payload)
+
+    def _closed(self):
+        if self.sock.bytesAvailable():
+            self._read()                 # 断开前最后到达的帧（通常含退出码）
+        if not self.done:
+            self.done = True
+            self.failed.emit(self.sock.errorString())
+
+    def kill(self):
+        # 断开连接：启动器中断该次运行的线程，不响应中断的就连同 JVM 一起结束，守护进程随后自动重启
+        self.done = True
+        self.sock.abort()
+
+
+class JvmDaemon(QObject):
+    def __init__(self, java, parent=None):
+        super().__init__(parent)
+        self.java, self.port, self.token, self.broken = java, None, None, False
+        self._flags = 0
+        self._start()
+
+    def _start(self):
+        self.port, self._line = None, b""
+        p = self.proc = QProcess(self)
+        p.setProcessChannelMode(QProcess.SeparateChannels)
+        # 重启后旧进程的信号可能迟到，只处理当前进程的
+        p.readyReadStandardOutput.connect(lambda: p is self.proc and self._handshake())
+        p.finished.connect(lambda code, _: p is self.proc and self._exited(code))
+        p.errorOccurred.connect(lambda err: p is self.proc and self._error(err))
+        p.start(self.java, FLAG_SETS[self._flags] + [LAUNCHER])
+
+    def _handshake(self):
+        if self.port is not None:
+            self.proc.readAllStandardOutput()        # 不属于任何运行的输出，丢弃
+            return
+        self._line += self.proc.readAllStandardOutput().data()
+        if b"\n" not in self._line:
+            return
+        parts = self._line.split(b"\n", 1)[0].decode("ascii", "replace").split()
+        if len(parts) == 4 and parts[0] == "IVYLAUNCHER" and parts[2] == "exit=trap" and len(parts[3]) >= 32:
+            self.port, self.token = int(parts[1]), parts[3]
+        else:
+            self._give_up()                          # 拦截不了 System.exit，不能安全复用
+
+    def _exited(self, code):
+        if self.port is None and not self.broken and self._flags + 1 < len(FLAG_SETS):
+            self._flags += 1                         # 握手前就退出：换一组启动参数再试
+            return self._start()
+        if self.port is not None and code == EXIT_KILLED:
+            return self._start()                     # 为结束被终止的运行而退出：用同一组参数重启
+        self.port, self.broken = None, True
+
+    def _error(self, err):
+        if err == QProcess.FailedToStart:
+            self._give_up()
+
+    def _give_up(self):
+        self.broken, self.port = True, None
+        if self.proc.state() != QProcess.NotRunning:
+            self.proc.kill()
+
+    def ready(self):
+        return self.port is not None and not self.broken
+
+    def run(self, exe, args, parent=None):
+        cp, main = jvm_target(exe)
+        return JvmRun(self.port, self.token, cp, main, args, parent)
+
+    def restart(self):
+        # 某次运行中途断开说明守护进程异常：丢掉它，下次从头启动；已经在重启（还没握手）时不再打断
+        if self.port is None and not self.broken and self.proc.state() != QProcess.NotRunning:
+            return
+        self._give_up()
+        self.broken, self._flags = False, 0
+        self._start()
+
+    def shutdown(self):
+        if self.proc.state() != QProcess.NotRunning:
+            self.proc.closeWriteChannel()            # 启动器读到 EOF 后自行退出
+            if not self.proc.waitForFinished(1000):
+                self.proc.kill()
+
+
+class JvmDaemons(QObject):
+    # 每个 java 命令一个守护进程，首次需要时启动
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.daemons = {}
+
+    def get(self, java):
+        if java not in self.daemons:
+            self.daemons[java] = JvmDaemon(java, self)
+        return self.daemons[java]
+
+    def shutdown(self):
+        for d in self.daemons.values():
+            d.shutdown()
@@ -0,0 +1,60 @@
+# 启动语义：工具类型标签 → 类型键，以及各类型实际执行的程序与参数（不依赖 Qt）
+import os
+
+TYPE_KEYS = ("opt_website", "opt_cli", "opt_exec", "opt_py_cli", "opt_py_exec", "opt_java_cli", "opt_java_exec",
+             "opt_pipeline")
+CLI_TYPES = ("opt_cli", "opt_py_cli", "opt_java_cli")
+DETACHED_TYPES = ("opt_exec", "opt_py_exec", "opt_java_exec")
+TARGET = "{target}"
+# 不能直接当程序启动的脚本（CreateProcess/QProcess 不认）：按扩展名交给解释器运行
+SCRIPT_RUNNERS = {
+    ".ps1": ("powershell", ["-NoProfile", "-ExecutionPolicy", "Bypass", "-File"]),
+    ".sh":  ("sh", []),
+}
+
+
+def type_key(label, i18n):
+    # 工具里保存的是添加时界面语言的类型名，两种语言都要认
+    for L in i18n.values():
+        for k in TYPE_KEYS:
+            if L.get(k) == label:
+                return k
+    return None
+
+
+def script_runner(exe):
+    # (解释器, 解释器参数)；不需要解释器时为 None。有执行权限的 .sh 直接运行，按它自己的 shebang 选 shell
+    ext = os.path.splitext(exe)[1].lower()
+    if ext == ".sh" and os.name != "nt" and os.access(exe, os.X_OK):
+        return None
+    return SCRIPT_RUNNERS.get(ext)
+
+
+def build_command(tool, key, settings, args=None):
+    # 返回 (程序, 参数列表, 工作目录)；args 为 None 时使用工具的默认参数
+    exe = tool.get("path", "")
+    args = tool.get("args", "").split() if args is None else args
+    if key in ("opt_cli", "opt_exec"):
+        cwd = os.path.dirname(exe) if key == "opt_exec" else None
+        runner = script_runner(exe)
+        if runner:
+            return runner[0], runner[1] + [exe] + args, cwd
+        return exe, args, cwd
+    if key in ("opt_py_cli", "opt_py_exec"):
+        return settings.get("python_path", "python"), [exe] + args, None
+    if key in ("opt_java_cli", "opt_java_exec"):
+        java = settings.get("java_path", "java")
+        if exe.endswith(".jar"):
+            return java, ["-jar", exe] + args, None
+        if key == "opt_java_cli":
+            return java, [os.path.splitext(os.path.basename(exe))[0]] + args, None
+        return java, [exe] + args, None
+    raise ValueError(f"not a launchable tool type: {key}")
+
+
+def template_args(template, target):
+    # 参数模板里的 {target} 替换为目标；模板里没有占位符时把目标追加到末尾
+    parts = template.split()
+    if any(TARGET in p for p in parts):
+        return [p.replace(TARGET, target) for p in parts]
+    return parts + [target]
@@ -0,0 +1,91 @@
+# 运行输出日志的只读访问（不依赖 Qt）：mmap 映射文件，后台线程分块建立行首偏移索引，
+# 按行号随机取行；正则检索按块在 mmap 上进行，边找边产出命中行号，可随时取消。几 GB 的日志也不整读进内存
+import os, re, mmap, bisect, threading
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CHUNK = 8 << 20
+
+
+class LogFile:
+    def __init__(self, path, encoding="utf-8"):
+        self.path, self.encoding = path, encoding
+        self.size = os.path.getsize(path)
+        self._f = open(path, "rb")
+        # 空文件不能 mmap
+        self.mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self.offsets = array("Q", [0])   # 第 i 行从 offsets[i] 开始；建索引期间只增不改
+        self.indexed = 0                  # 已扫描到的字节位置
+        self.done = False
+        self.cancel = threading.Event()
+
+    def build_index(self):
+        # 在后台线程里调用；读者随时可以用已建好的部分
+        mm, off = self.mm, self.offsets
+        pos = 0
+        while pos < self.size and not self.cancel.is_set():
+            end = min(pos + CHUNK, self.size)
+            if numpy is not None:
+                starts = numpy.flatnonzero(numpy.frombuffer(mm, numpy.uint8, end - pos, pos) == 10) + (pos + 1)
+                off.frombytes(starts[starts < self.size].astype(numpy.uint64).tobytes())
+            else:
+                i = mm.find(b"\n", pos, end)
+                while i != -1 and i + 1 < self.size:      # 末尾换行之后没有新的一行
+                    off.append(i + 1)
+                    i = mm.find(b"\n", i + 1, end)
+            pos = self.indexed = end
+        self.done = not self.cancel.is_set()
+
+    def line_count(self):
+        return len(self.offsets)
+
+    def line_bytes(self, i):
+        start = self.offsets[i]
+        end = self.offsets[i + 1] - 1 if i + 1 < len(self.offsets) else self.indexed
+        return self.mm[start:end].rstrip(b"\r\n")
+
+    def line(self, i):
+        return self.line_bytes(i).decode(self.encoding, "replace")
+
+    def line_of(self, pos):
+        return bisect.bisect_right(self.offsets, pos) - 1
+
+    def compile(self, pattern, ignore_case=False):
+        # 在原始字节上匹配，模式按日志编码转换；编码不了的字符或错误的正则抛 ValueError / re.error
+        try:
+            raw = pattern.encode(self.encoding)
+        except UnicodeEncodeError as e:
+            raise ValueError(str(e))
+        return re.compile(raw, re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+
+    def search(self, rx, out, cancel, start=0):
+        # 把命中的行号按顺序追加到 out（调用方轮询 len(out) 拿增量结果）；按块推进，块边界对齐到行首。
+        # 只在已建好索引的范围内查找，索引还在建时跟在后面
+        pos, last = start, -1
+        while not cancel.is_set():
+            limit = self.indexed
+            if pos >= limit:
+                if self.done or self.cancel.is_set():
+                    break
+                cancel.wait(0.05)
+                continue
+            end = min(pos + CHUNK, limit)
+            if end < self.size:
+                nl = self.mm.rfind(b"\n", pos, end)
+                end = nl + 1 if nl >= pos else end
+            for m in rx.finditer(self.mm, pos, end):
+                ln = self.line_of(m.start())
+                if ln != last:
+                    out.append(ln); last = ln
+            pos = end
+
+    def close(self):
+        self.cancel.set()
+        if self.size:
+            try: self.mm.close()
+            except BufferError: pass     # 还有 numpy 视图未释放，随对象回收
+        self._f.close()
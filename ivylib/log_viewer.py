@@ -0,0 +1,231 @@
+# 运行历史窗口：左侧按工具列出 run_history 下的输出日志，右侧只绘制可见的几十行（日志 mmap 映射、后台建行索引），
+# 正则检索在后台按块进行，命中结果边找边显示，可以只看匹配行
+import os, re, bisect, datetime, threading
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QSplitter, QListWidget, QListWidgetItem, QLineEdit, QCheckBox,
+    QPushButton, QLabel, QWidget, QAbstractScrollArea, QApplication
+)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QPainter, QFontDatabase, QColor, QPalette, QKeySequence
+from ivylib.log_index import LogFile
+from ivylib.output_buffer import RUN_HISTORY_DIR, tool_dir, list_runs, default_encoding
+from ivylib.pipeline_dialog import human_bytes
+
+MAX_CHARS = 2000                         # 超长行只画前面这些字符
+
+
+class LogView(QAbstractScrollArea):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.log, self.rows, self.hl = None, None, None     # rows 为 None 时显示全部行，否则只显示这些行号
+        self.current = -1                                    # 当前行（行号）
+        self.widest = 0
+
+    def set_log(self, log):
+        self.log, self.rows, self.current, self.widest = log, None, -1, 0
+        self.verticalScrollBar().setValue(0); self.horizontalScrollBar().setValue(0)
+        self.refresh()
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self.refresh()
+
+    def row_count(self):
+        if self.log is None: return 0
+        return len(self.rows) if self.rows is not None else self.log.line_count()
+
+    def line_at(self, row):
+        return self.rows[row] if self.rows is not None else row
+
+    def visible_rows(self):
+        return max(1, self.viewport().height() // self.fontMetrics().height())
+
+    def refresh(self):
+        # 行数随索引/检索增长，定时调用
+        vb, page = self.verticalScrollBar(), self.visible_rows()
+        vb.setRange(0, max(0, self.row_count() - page)); vb.setPageStep(page)
+        hb, w = self.horizontalScrollBar(), self.viewport().width()
+        hb.setRange(0, max(0, self.widest - w + self.gutter())); hb.setPageStep(w)
+        self.viewport().update()
+
+    def gutter(self):
+        return self.fontMetrics().horizontalAdvance("9") * (len(str(self.log.line_count() if self.log else 0)) + 2)
+
+    def paintEvent(self, e):
+        if self.log is None: return
+        p = QPainter(self.viewport())
+        fm, pal = self.fontMetrics(), self.palette()
+        lh, asc, g, x0 = fm.height(), fm.ascent(), self.gutter(), -self.horizontalScrollBar().value()
+        first, count = self.verticalScrollBar().value(), self.row_count()
+        hl_color = QColor(255, 200, 0, 110)
+        for k in range(self.visible_rows() + 1):
+            row = first + k
+            if row >= count: break
+            ln, y = self.line_at(row), k * lh
+            text = self.log.line(ln)[:MAX_CHARS]
+            if ln == self.current:
+                p.fillRect(0, y, self.viewport().width(), lh, pal.color(QPalette.Highlight).lighter(160))
+            if self.hl is not None:
+                for m in self.hl.finditer(text):
+                    a = fm.horizontalAdvance(text[:m.start()])
+                    p.fillRect(g + x0 + a, y, max(2, fm.horizontalAdvance(m.group())), lh, hl_color)
+            p.setPen(pal.color(QPalette.Text))
+            p.drawText(g + x0, y + asc, text)
+            self.widest = max(self.widest, fm.horizontalAdvance(text))
+            p.fillRect(0, y, g - 4, lh, pal.color(QPalette.AlternateBase))
+            p.setPen(pal.color(QPalette.PlaceholderText))
+            p.drawText(0, y, g - 8, lh, Qt.AlignRight | Qt.AlignVCenter, str(ln + 1))
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self.refresh()
+
+    def mousePressEvent(self, e):
+        row = self.verticalScrollBar().value() + e.pos().y() // self.fontMetrics().height()
+        if row < self.row_count():
+            self.current = self.line_at(row)
+            self.viewport().update()
+
+    def keyPressEvent(self, e):
+        if e.matches(QKeySequence.Copy) and self.current >= 0:
+            QApplication.clipboard().setText(self.log.line(self.current))
+        else:
+            super().keyPressEvent(e)
+
+    def goto(self, ln):
+        # 把行号 ln 滚动到中间并设为当前行；只看匹配行时 ln 必须在 rows 里
+        row = bisect.bisect_left(self.rows, ln) if self.rows is not None else ln
+        self.current = ln
+        self.verticalScrollBar().setValue(row - self.visible_rows() // 2)
+        self.viewport().update()
+
+
+class RunHistoryDialog(QDialog):
+    def __init__(self, L, tool=None, encoding=None, base=RUN_HISTORY_DIR, parent=None):
+        super().__init__(parent)
+        self.L, self.base, self.encoding = L, base, encoding or default_encoding()
+        self.log = None
+        self.matches, self.search_stop, self.searcher = [], threading.Event(), None
+        self.workers = []                # 当前日志上的建索引/检索线程，关闭映射前要等它们退出
+        self.setWindowTitle(L["hist_title"]); self.resize(1200, 760)
+        layout = QVBoxLayout(self)
+        split = QSplitter(Qt.Horizontal)
+        left = QSplitter(Qt.Vertical)
+        self.tools = QListWidget(); self.runs = QListWidget()
+        left.addWidget(self.tools); left.addWidget(self.runs); left.setSizes([200, 500])
+        split.addWidget(left)
+        right = QWidget(); rl = QVBoxLayout(right); rl.setContentsMargins(0, 0, 0, 0)
+        h = QHBoxLayout()
+        self.pattern = QLineEdit(); self.pattern.setPlaceholderText(L["hist_search"])
+        self.case = QCheckBox(L["hist_case"]); self.only = QCheckBox(L["hist_filter"])
+        h.addWidget(self.pattern); h.addWidget(self.case); h.addWidget(self.only)
+        h.addWidget(QPushButton("↑", clicked=lambda: self.jump(-1)))
+        h.addWidget(QPushButton("↓", clicked=lambda: self.jump(1)))
+        rl.addLayout(h)
+        self.view = LogView(); rl.addWidget(self.view)
+        self.status = QLabel(); self.status.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        rl.addWidget(self.status)
+        split.addWidget(right); split.setSizes([300, 900])
+        layout.addWidget(split)
+        # 输入防抖 300ms；索引和检索进度每 100ms 刷新一次
+        self.search_timer = QTimer(self); self.search_timer.setSingleShot(True); self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.start_search)
+        self.pattern.textChanged.connect(lambda _: self.search_timer.start())
+        self.pattern.returnPressed.connect(lambda: self.jump(1))
+        self.case.toggled.connect(lambda _: self.start_search())
+        self.only.toggled.connect(lambda on: self.view.set_rows(self.matches if on and self.view.hl else None))
+        self.tick = QTimer(self); self.tick.setInterval(100); self.tick.timeout.connect(self.poll)
+        self.tools.currentTextChanged.connect(self.list_runs)
+        self.runs.currentItemChanged.connect(lambda cur, _: cur and self.open_log(cur.data(Qt.UserRole)))
+        names = sorted(os.listdir(base)) if os.path.isdir(base) else []
+        self.tools.addItems(names)
+        want = os.path.basename(tool_dir(tool, base)) if tool else None
+        if want in names:
+            self.tools.setCurrentRow(names.index(want))
+        elif names:
+            self.tools.setCurrentRow(0)
+
+    def list_runs(self, name):
+        self.runs.clear()
+        d = os.path.join(self.base, name)
+        for mtime, size, path in list_runs(d):
+            when = datetime.datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
+            it = QListWidgetItem(f"{when}  {human_bytes(size)}  {os.path.relpath(path, d)}")
+            it.setData(Qt.UserRole, path)
+            self.runs.addItem(it)
+        if self.runs.count():
+            self.runs.setCurrentRow(0)
+
+    def open_log(self, path):
+        self.close_log()
+        try:
+            self.log = LogFile(path, self.encoding)
+        except (OSError, ValueError) as e:
+            self.status.setText(str(e)); return
+        self.workers = [threading.Thread(target=self.log.build_index, daemon=True)]
+        self.workers[0].start()
+        self.view.set_log(self.log)
+        self.tick.start()
+        self.start_search()
+
+    def close_log(self):
+        # 建索引和检索线程还在读 mmap：先通知取消，等它们退出后再关闭映射。等待放在后台线程，不卡界面
+        self.search_stop.set()
+        log, workers = self.log, self.workers
+        self.log, self.workers, self.searcher = None, [], None
+        self.view.set_log(None)
+        if log is not None:
+            log.cancel.set()
+            threading.Thread(target=self._close_after, args=(log, workers), daemon=True).start()
+
+    @staticmethod
+    def _close_after(log, workers):
+        for t in workers:
+            t.join()
+        log.close()
+
+    def start_search(self):
+        self.search_stop.set()
+        self.matches, self.search_stop = [], threading.Event()
+        text = self.pattern.text()
+        self.view.hl = None
+        if self.log is None or not text:
+            self.view.set_rows(None); return
+        flags = re.IGNORECASE if self.case.isChecked() else 0
+        try:
+            rx = self.log.compile(text, self.case.isChecked())
+            self.view.hl = re.compile(text, flags | re.MULTILINE)
+        except (re.error, ValueError) as e:
+            self.status.setText(f"{self.L['hist_bad_regex']}: {e}"); return
+        self.searcher = threading.Thread(target=self.log.search, args=(rx, self.matches, self.search_stop), daemon=True)
+        self.searcher.start()
+        self.workers = [t for t in self.workers if t.is_alive()] + [self.searcher]
+        self.view.set_rows(self.matches if self.only.isChecked() else None)
+        self.tick.start()
+
+    def poll(self):
+        log = self.log
+        if log is None:
+            return self.tick.stop()
+        pct = 100 * log.indexed // log.size if log.size else 100
+        text = self.L["hist_status"].format(log.line_count(), human_bytes(log.size), pct)
+        if self.view.hl is not None:
+            text += "  " + self.L["hist_matches"].format(len(self.matches))
+        self.status.setText(text + f"  {log.path}")
+        self.view.refresh()
+        # 检索线程跟在索引后面，两者都结束后停止刷新
+        if log.done and not (self.searcher and self.searcher.is_alive()):
+            self.tick.stop()
+
+    def jump(self, step):
+        if not self.matches:
+            return
+        cur = self.view.current
+        i = bisect.bisect_right(self.matches, cur) if step > 0 else bisect.bisect_left(self.matches, cur) - 1
+        self.view.goto(self.matches[i % len(self.matches)])
+
+    def done(self, r):
+        self.tick.stop()
+        self.close_log()
+        super().done(r)
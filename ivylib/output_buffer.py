@@ -0,0 +1,113 @@
+# 命令行输出缓冲：增量解码（多字节字符跨块不丢）、待显示文本限长、原始字节落盘
+import os, re, time, codecs, locale, shutil, datetime
+from collections import deque
+
+RUN_HISTORY_DIR = "run_history"
+
+
+def default_encoding():
+    return locale.getpreferredencoding(False) or "utf-8"
+
+
+def tool_dir(name, base=RUN_HISTORY_DIR):
+    safe = re.sub(r'[\\/:*?"<>|\s]+', "_", name).strip("_") or "tool"
+    return os.path.join(base, safe)
+
+
+def spool_path(name, base=RUN_HISTORY_DIR):
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return os.path.join(tool_dir(name, base), stamp + ".log")
+
+
+def list_runs(d):
+    # 某个工具目录下的全部输出日志（含批量运行子目录），新的在前：[(mtime, 大小, 路径)]
+    out = []
+    for root, _, files in os.walk(d):
+        for f in files:
+            if f.endswith(".log"):
+                p = os.path.join(root, f)
+                try: st = os.stat(p)
+                except OSError: continue
+                out.append((st.st_mtime, st.st_size, p))
+    return sorted(out, reverse=True)
+
+
+def prune_runs(d, keep=0, max_age_days=0):
+    # 保留期：一个工具目录下最多保留最新的 keep 次运行、删除超过 max_age_days 天的（0 为不限）。
+    # 一次运行是一个 .log 或一个批量运行子目录；正被打开的日志在 Windows 上删不掉，跳过，下次再删。返回删除的个数
+    try:
+        entries = [e for e in os.scandir(d) if e.name.endswith(".log") or e.is_dir()]
+    except OSError:
+        return 0
+    runs = []
+    for e in entries:
+        try: runs.append((e.stat().st_mtime, e.path, e.is_dir()))
+        except OSError: continue
+    runs.sort(reverse=True)
+    cutoff = time.time() - max_age_days * 86400 if max_age_days else None
+    removed = 0
+    for k, (mtime, path, is_dir) in enumerate(runs):
+        if (keep and k >= keep) or (cutoff is not None and mtime < cutoff):
+            try:
+                shutil.rmtree(path) if is_dir else os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def prune_history(keep=0, max_age_days=0, names=None, base=RUN_HISTORY_DIR):
+    # names 为 None 时处理所有工具目录，否则只处理这些工具的
+    if not (keep or max_age_days):
+        return 0
+    if names is None:
+        try: dirs = [e.path for e in os.scandir(base) if e.is_dir()]
+        except OSError: return 0
+    else:
+        dirs = [tool_dir(n, base) for n in names]
+    return sum(prune_runs(d, keep, max_age_days) for d in dirs)
+
+
+class OutputBuffer:
+    def __init__(self, encoding=None, max_pending=1 << 20, spool=None):
+        try:
+            dec = codecs.getincrementaldecoder(encoding or default_encoding())
+        except LookupError:
+            dec = codecs.getincrementaldecoder("utf-8")
+        self.decoder = dec(errors="replace")
+        self.max_pending = max_pending    # 界面来不及刷新时最多积压这么多字符，多出的丢弃最早部分
+        self.pending = deque()
+        self.pending_len = 0
+        self.dropped = 0                  # 因积压被丢弃、未显示的字符数（磁盘上仍完整）
+        self.total_bytes = 0
+        self.spool_path = spool
+        self._spool = None
+        if spool:
+            os.makedirs(os.path.dirname(spool) or ".", exist_ok=True)
+            self._spool = open(spool, "wb")
+
+    def feed(self, data, final=False):
+        self.total_bytes += len(data)
+        if self._spool:
+            self._spool.write(data)
+        text = self.decoder.decode(data, final)
+        if not text:
+            return
+        self.pending.append(text)
+        self.pending_len += len(text)
+        while self.pending_len > self.max_pending and len(self.pending) > 1:
+            old = self.pending.popleft()
+            self.pending_len -= len(old)
+            self.dropped += len(old)
+
+    def take(self):
+        text = "".join(self.pending)
+        self.pending.clear()
+        self.pending_len = 0
+        return text
+
+    def close(self):
+        self.feed(b"", final=True)
+        if self._spool:
+            self._spool.close()
+            self._spool = None
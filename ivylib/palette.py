@@ -0,0 +1,79 @@
+# 快速启动面板：输入即按 frecency（使用频率 × 近期程度）排序显示，回车启动，走与双击相同的启动流程。
+# 排名分数随每次启动增量更新（ivylib.frecency）；按分数排好的名称表在启动或目录改动后空闲时重建，
+# 打开面板时直接可用，每次按键只做一遍名称匹配，不读使用日志
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PyQt5.QtCore import Qt, QEvent, QTimer
+from ivylib.frecency import Ranker
+
+MAX_ROWS = 20
+
+
+class LaunchPalette(QDialog):
+    def __init__(self, L, tools, frecency, launch, search=None, parent=None):
+        # tools: 目录列表（与主界面共用，改动后须 invalidate）；launch(tool)；search(text) -> 按相关度排好的 id 列表
+        super().__init__(parent, Qt.Dialog | Qt.FramelessWindowHint)
+        self.L, self.tools, self.frecency, self.launch, self.search = L, tools, frecency, launch, search
+        self.ranker, self.shown = None, []
+        self.rebuild_timer = QTimer(self); self.rebuild_timer.setSingleShot(True); self.rebuild_timer.setInterval(500)
+        self.rebuild_timer.timeout.connect(self.rebuild)
+        self.setWindowTitle(L["palette_title"]); self.resize(560, 420)
+        layout = QVBoxLayout(self)
+        self.edit = QLineEdit(); self.edit.setPlaceholderText(L["palette_hint"])
+        self.edit.textChanged.connect(self.update_list)
+        self.edit.returnPressed.connect(self.accept_current)
+        self.edit.installEventFilter(self)
+        self.list = QListWidget(); self.list.setUniformItemSizes(True)
+        self.list.itemActivated.connect(lambda _: self.accept_current())
+        layout.addWidget(self.edit); layout.addWidget(self.list)
+
+    def invalidate(self):
+        self.ranker = None
+        self.rebuild_timer.start()
+
+    def rebuild(self):
+        self.ranker = Ranker(self.tools, self.frecency)
+        if self.isVisible():
+            self.update_list(self.edit.text())
+
+    def popup(self):
+        self.edit.clear()
+        self.update_list("")
+        if self.parent() is not None:
+            g = self.parent().frameGeometry()
+            self.move(g.x() + (g.width() - self.width()) // 2, g.y() + g.height() // 5)
+        self.show(); self.raise_(); self.activateWindow()
+        self.edit.setFocus()
+
+    def update_list(self, text):
+        if self.ranker is None:              # 还没来得及在空闲时重建
+            self.ranker = Ranker(self.tools, self.frecency)
+        self.shown = self.ranker.rank(text, MAX_ROWS, self.search)
+        self.list.clear()
+        for t in self.shown:
+            uses = self.frecency.score(t["name"])
+            label = f"{t['name']}    {t.get('category', '')}"
+            if uses >= 0.05:
+                label += "    " + self.L["palette_uses"].format(uses)
+            self.list.addItem(QListWidgetItem(label))
+        if self.shown:
+            self.list.setCurrentRow(0)
+
+    def eventFilter(self, obj, e):
+        # 焦点留在输入框里，上下键/翻页键移动列表的当前行
+        if e.type() == QEvent.KeyPress and e.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+            self.list.keyPressEvent(e)
+            return True
+        return super().eventFilter(obj, e)
+
+    def changeEvent(self, e):
+        # 点到别处就收起
+        if e.type() == QEvent.ActivationChange and not self.isActiveWindow():
+            self.hide()
+        super().changeEvent(e)
+
+    def accept_current(self):
+        row = self.list.currentRow()
+        if 0 <= row < len(self.shown):
+            t = self.shown[row]
+            self.hide()
+            self.launch(t)
@@ -0,0 +1,130 @@
+# 工具流水线（不依赖 Qt）：上一级的 stdout 经 OS 管道逐块转给下一级的 stdin。
+# 每条边一个转发线程、一次只持有一块数据：下游读得慢时转发线程阻塞在写上，上游随之阻塞在
+# 自己写满的管道上，内存占用与输出总量无关。阻塞在写上的时间记为该级受到的反压。
+# （QProcess 会把子进程输出持续读进进程内缓冲，无法形成反压，所以这里用 subprocess。）
+import os, time, queue, threading, subprocess
+
+CHUNK = 64 * 1024
+EVENT_QUEUE = 256          # 最后一级 stdout 与各级 stderr 交给界面前最多积压的块数
+
+
+class StageStats:
+    def __init__(self, name):
+        self.name = name
+        self.bytes_in = self.bytes_out = 0
+        self.blocked = 0.0                # 输出因下游来不及读而阻塞的秒数
+        self.started = self.ended = None
+        self.code = None
+
+    @property
+    def running(self):
+        return self.started is not None and self.ended is None
+
+
+class PipelineRun:
+    # stages: [(名称, 程序, 参数列表, 工作目录)]；events 里是 ("out"|"err", 级号, bytes)
+    def __init__(self, stages):
+        self.stages = stages
+        self.stats = [StageStats(s[0]) for s in stages]
+        self.events = queue.Queue(EVENT_QUEUE)
+        self.procs, self.threads = [], []
+        self.started = None
+        self.stopping = False
+
+    def start(self):
+        self.started = time.monotonic()
+        flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        try:
+            for i, (_, program, args, cwd) in enumerate(self.stages):
+                p = subprocess.Popen([program] + list(args), cwd=cwd or None, bufsize=0, creationflags=flags,
+                                     stdin=subprocess.DEVNULL if i == 0 else subprocess.PIPE,
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                self.procs.append(p)
+                self.stats[i].started = time.monotonic()
+        except OSError:
+            self.stop()
+            for s in self.stats[:len(self.procs)]: s.ended = time.monotonic()
+            raise
+        for i in range(len(self.procs)):
+            self._spawn(self._relay, i)
+            self._spawn(self._drain_err, i)
+            self._spawn(self._wait, i)
+
+    def _spawn(self, fn, i):
+        t = threading.Thread(target=fn, args=(i,), daemon=True)
+        self.threads.append(t)
+        t.start()
+
+    def _relay(self, i):
+        src = self.procs[i].stdout
+        dst = self.procs[i + 1].stdin if i + 1 < len(self.procs) else None
+        s = self.stats[i]
+        try:
+            while True:
+                data = os.read(src.fileno(), CHUNK)
+                if not data:
+                    break
+                s.bytes_out += len(data)
+                t = time.monotonic()
+                if dst is None:
+                    if not self._emit(("out", i, data)): break
+                else:
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(dst.fileno(), view):]
+                    self.stats[i + 1].bytes_in += len(data)
+                s.blocked += time.monotonic() - t
+        except OSError:
+            pass                      # 下游提前退出：关掉上游的读端，上游写时收到 EPIPE，和 shell 管道一致
+        finally:
+            for f in (dst, src):
+                if f is not None:
+                    try: f.close()
+                    except OSError: pass
+
+    def _drain_err(self, i):
+        f = self.procs[i].stderr
+        try:
+            for data in iter(lambda: os.read(f.fileno(), CHUNK), b""):
+                if not self._emit(("err", i, data)): break
+        except OSError:
+            pass
+        finally:
+            f.close()
+
+    def _emit(self, item):
+        # 界面取得慢时在这里等（同样形成反压）；停止后不再等，免得线程永远挂着
+        while not self.stopping:
+            try:
+                self.events.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _wait(self, i):
+        self.stats[i].code = self.procs[i].wait()
+        self.stats[i].ended = time.monotonic()
+
+    def take_events(self):
+        out = []
+        while True:
+            try: out.append(self.events.get_nowait())
+            except queue.Empty: return out
+
+    def done(self):
+        return self.started is not None and not any(t.is_alive() for t in self.threads) and self.events.empty()
+
+    def stop(self):
+        self.stopping = True
+        for p in self.procs:
+            if p.poll() is None:
+                try: p.kill()
+                except OSError: pass
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        ends = [s.ended for s in self.stats]
+        end = max(ends) if ends and None not in ends else time.monotonic()
+        return end - self.started
@@ -0,0 +1,190 @@
+# 流水线编辑与运行窗口：各级从目录中的命令行工具里选择并可覆盖参数，运行时按级显示吞吐和反压
+import os
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QPushButton, QLabel, QComboBox,
+    QTableWidget, QTableWidgetItem, QPlainTextEdit, QSplitter, QHeaderView, QMessageBox
+)
+from PyQt5.QtCore import Qt, QTimer
+from ivylib.pipeline import PipelineRun
+from ivylib.output_buffer import OutputBuffer, spool_path
+
+
+def human_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+class PipelineDialog(QDialog):
+    STAT_COLS = ("stage", "state", "in", "out", "rate", "backpressure")
+
+    def __init__(self, L, tools, resolve, pipeline=None, encoding=None, scrollback=10000, on_save=None):
+        # tools：可选的命令行工具；resolve(stage) -> (名称, 程序, 参数, 工作目录)，工具不存在时抛 KeyError
+        super().__init__()
+        self.L, self.tools, self.resolve, self.on_save = L, tools, resolve, on_save
+        self.pipeline = dict(pipeline or {})
+        self.encoding = encoding
+        self.run = self.out_buf = self.err_buf = None
+        self.last = None                      # 上一次刷新时各级的 (输出字节, 阻塞秒数, 时间)
+        self.setWindowTitle(f"{L['pipe_title']} - {self.pipeline['name']}" if pipeline else L["pipe_title"])
+        self.resize(1000, 760)
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        self.name = QLineEdit(self.pipeline.get("name", "")); form.addRow(L["name"], self.name)
+        self.cat = QLineEdit(self.pipeline.get("category", "")); form.addRow(L["category"], self.cat)
+        layout.addLayout(form)
+        # 各级
+        self.stages = QTableWidget(0, 2)
+        self.stages.setHorizontalHeaderLabels([L["pipe_col_tool"], L["cli_args"]])
+        self.stages.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.stages.setSelectionBehavior(QTableWidget.SelectRows)
+        self.stages.setFixedHeight(180)
+        for st in self.pipeline.get("stages", []):
+            self.add_stage(st)
+        layout.addWidget(self.stages)
+        h = QHBoxLayout()
+        h.addWidget(QPushButton(L["pipe_add_stage"], clicked=lambda: self.add_stage()))
+        h.addWidget(QPushButton(L["delete"], clicked=self.remove_stage))
+        h.addWidget(QPushButton("↑", clicked=lambda: self.move_stage(-1)))
+        h.addWidget(QPushButton("↓", clicked=lambda: self.move_stage(1)))
+        h.addStretch()
+        self.run_btn = QPushButton(L["cli_run"], clicked=self.start)
+        self.stop_btn = QPushButton(L["cancel"], clicked=self.stop); self.stop_btn.setEnabled(False)
+        h.addWidget(self.run_btn); h.addWidget(self.stop_btn)
+        if on_save:
+            h.addWidget(QPushButton(L["pipe_save"], clicked=self.save))
+        layout.addLayout(h)
+        # 运行统计与输出
+        split = QSplitter(Qt.Vertical)
+        self.stats = QTableWidget(0, len(self.STAT_COLS))
+        self.stats.setHorizontalHeaderLabels([L["pipe_col_" + c] for c in self.STAT_COLS])
+        self.stats.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.stats.setEditTriggers(QTableWidget.NoEditTriggers)
+        split.addWidget(self.stats)
+        self.output = QPlainTextEdit(); self.output.setReadOnly(True); self.output.setMaximumBlockCount(scrollback)
+        split.addWidget(self.output)
+        self.errors = QPlainTextEdit(); self.errors.setReadOnly(True); self.errors.setMaximumBlockCount(scrollback)
+        self.errors.setPlaceholderText("stderr")
+        split.addWidget(self.errors)
+        split.setSizes([160, 400, 120])
+        layout.addWidget(split)
+        self.status = QLabel(); layout.addWidget(self.status)
+        self.tick = QTimer(self); self.tick.setInterval(100); self.tick.timeout.connect(self.poll)
+
+    # —— 编辑 ——
+    def add_stage(self, st=None):
+        row = self.stages.rowCount()
+        self.stages.insertRow(row)
+        cb = QComboBox()
+        for t in self.tools:
+            cb.addItem(t["name"], t["id"])
+        if st:
+            i = cb.findData(st.get("tool"))
+            if i < 0:                         # 引用的工具已被删除：保留 id，运行时报错
+                cb.addItem(f"? {st.get('tool')}", st.get("tool")); i = cb.count() - 1
+            cb.setCurrentIndex(i)
+        self.stages.setCellWidget(row, 0, cb)
+        self.stages.setItem(row, 1, QTableWidgetItem(st.get("args", "") if st else ""))
+
+    def remove_stage(self):
+        row = self.stages.currentRow()
+        if row >= 0:
+            self.stages.removeRow(row)
+
+    def move_stage(self, d):
+        row = self.stages.currentRow()
+        if not 0 <= row + d < self.stages.rowCount() or row < 0:
+            return
+        a, b = self.stage_at(row), self.stage_at(row + d)
+        for r, st in ((row, b), (row + d, a)):
+            cb = self.stages.cellWidget(r, 0)
+            cb.setCurrentIndex(max(cb.findData(st["tool"]), 0))
+            self.stages.item(r, 1).setText(st["args"])
+        self.stages.setCurrentCell(row + d, 1)
+
+    def stage_at(self, row):
+        item = self.stages.item(row, 1)
+        return {"tool": self.stages.cellWidget(row, 0).currentData(), "args": item.text() if item else ""}
+
+    def current_stages(self):
+        return [self.stage_at(r) for r in range(self.stages.rowCount())]
+
+    def save(self):
+        name, stages = self.name.text().strip(), self.current_stages()
+        if not name or not stages:
+            return QMessageBox.warning(self, self.L["pipe_title"], self.L["pipe_incomplete"])
+        self.pipeline.update(name=name, category=self.cat.text().strip(), stages=stages)
+        self.on_save(self.pipeline)
+        self.setWindowTitle(f"{self.L['pipe_title']} - {name}")
+
+    # —— 运行 ——
+    def start(self):
+        stages = self.current_stages()
+        if not stages:
+            return
+        try:
+            commands = [self.resolve(st) for st in stages]
+        except (KeyError, ValueError) as e:
+            return QMessageBox.warning(self, self.L["launch_error"], f"{self.L['pipe_bad_stage']} {e}")
+        self.run = PipelineRun(commands)
+        log = spool_path(self.name.text().strip() or "pipeline")
+        self.out_buf = OutputBuffer(self.encoding, spool=log)
+        self.err_buf = OutputBuffer(self.encoding, spool=os.path.splitext(log)[0] + ".stderr.log")
+        self.output.clear(); self.errors.clear()
+        self.stats.setRowCount(len(commands))
+        for i, c in enumerate(commands):
+            self.stats.setItem(i, 0, QTableWidgetItem(f"{i + 1}. {c[0]}"))
+            for col in range(1, len(self.STAT_COLS)):
+                self.stats.setItem(i, col, QTableWidgetItem(""))
+        try:
+            self.run.start()
+        except OSError as e:
+            self.finish()
+            return QMessageBox.warning(self, self.L["launch_error"], str(e))
+        self.last = None
+        self.run_btn.setEnabled(False); self.stop_btn.setEnabled(True)
+        self.status.setText(log)
+        self.tick.start()
+
+    def poll(self):
+        for kind, i, data in self.run.take_events():
+            (self.out_buf if kind == "out" else self.err_buf).feed(data)
+        for buf, pane in ((self.out_buf, self.output), (self.err_buf, self.errors)):
+            text = buf.take()
+            if text:
+                pane.moveCursor(pane.textCursor().End); pane.insertPlainText(text)
+        self.refresh_stats()
+        if self.run.done():
+            self.finish()
+
+    def refresh_stats(self):
+        now = [(s.bytes_out, s.blocked) for s in self.run.stats]
+        span = self.run.elapsed()
+        prev, self.last = self.last, (now, span)
+        dt = span - prev[1] if prev else span
+        for i, s in enumerate(self.run.stats):
+            state = self.L["batch_state_running"] if s.running else ("" if s.code is None else f"exit {s.code}")
+            d_out, d_blk = (now[i][0] - prev[0][i][0], now[i][1] - prev[0][i][1]) if prev else now[i]
+            cells = (state, human_bytes(s.bytes_in) if i else "", human_bytes(s.bytes_out),
+                     f"{human_bytes(d_out / dt)}/s" if s.running and dt > 0 else "",
+                     f"{min(d_blk / dt, 1):.0%}" if s.running and dt > 0 else f"{s.blocked:.2f}s")
+            for col, text in enumerate(cells, 1):
+                self.stats.item(i, col).setText(text)
+
+    def finish(self):
+        self.tick.stop()
+        if self.out_buf:
+            for buf in (self.out_buf, self.err_buf): buf.close()
+            self.output.insertPlainText(self.out_buf.take()); self.errors.insertPlainText(self.err_buf.take())
+        if self.run and self.run.started is not None:
+            self.refresh_stats()
+            self.status.setText(f"{self.status.text()}  {self.run.elapsed():.2f}s")
+        self.run_btn.setEnabled(True); self.stop_btn.setEnabled(False)
+
+    def stop(self):
+        if self.run: self.run.stop()
+
+    def closeEvent(self, e):
+        self.stop()
+        super().closeEvent(e)
@@ -0,0 +1,93 @@
+# 运行中的程序面板：列出启动器管理的进程和排队中的启动，可结束、挂起/恢复、取消排队或调整优先级
+import time
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt5.QtCore import Qt, QTimer
+from ivylib.runs import sample_proc
+from ivylib.supervisor import QUEUED, SUSPENDED
+
+
+class ProcessPanel(QDialog):
+    COLS = ("tool", "category", "state", "pid", "priority", "elapsed", "rss")
+
+    def __init__(self, L, supervisor, parent=None):
+        super().__init__(parent)
+        self.L, self.sup = L, supervisor
+        self.setWindowTitle(L["proc_title"]); self.resize(800, 420)
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(self.COLS))
+        self.table.setHorizontalHeaderLabels([L["proc_col_" + c] for c in self.COLS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.itemSelectionChanged.connect(self.update_buttons)
+        layout.addWidget(self.table)
+        h = QHBoxLayout()
+        self.limits = QLabel(); h.addWidget(self.limits); h.addStretch()
+        self.kill_btn = QPushButton(L["proc_kill"], clicked=lambda: self.act(self.sup.kill))
+        self.pause_btn = QPushButton(L["proc_suspend"], clicked=self.toggle_suspend)
+        self.cancel_btn = QPushButton(L["proc_cancel"], clicked=lambda: self.act(self.sup.cancel))
+        self.up_btn = QPushButton("↑", clicked=lambda: self.act(lambda j: self.sup.reprioritize(j, 1)))
+        self.down_btn = QPushButton("↓", clicked=lambda: self.act(lambda j: self.sup.reprioritize(j, -1)))
+        for b in (self.kill_btn, self.pause_btn, self.cancel_btn, self.up_btn, self.down_btn):
+            h.addWidget(b)
+        layout.addLayout(h)
+        self.ids = []
+        supervisor.changed.connect(self.refresh)
+        # 耗时和内存每秒刷新一次，只在窗口可见时
+        self.tick = QTimer(self); self.tick.setInterval(1000); self.tick.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, e):
+        self.tick.start(); self.refresh()
+        super().showEvent(e)
+
+    def hideEvent(self, e):
+        self.tick.stop()
+        super().hideEvent(e)
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        sel = self.selected()
+        jobs = self.sup.running() + self.sup.queued()
+        self.ids = [j.id for j in jobs]
+        now = time.monotonic()
+        self.table.setRowCount(len(jobs))
+        for row, j in enumerate(jobs):
+            s = sample_proc(j.pid) if j.pid else None
+            since = j.started_at or j.queued_at
+            cells = (j.tool, j.category, self.L["proc_" + j.state], j.pid or "", j.priority,
+                     f"{now - since:.0f}s", f"{s[0] / 1024:.0f} MB" if s and s[0] else "")
+            for c, v in enumerate(cells):
+                self.table.setItem(row, c, QTableWidgetItem(str(v)))
+            if j.id == sel:
+                self.table.selectRow(row)
+        s = self.sup.settings
+        self.limits.setText(self.L["proc_limits"].format(len(self.sup.running()), s.get("max_running", 0),
+                                                         s.get("max_per_category", 0), s.get("memory_budget_mb", 0)))
+        self.update_buttons()
+
+    def selected(self):
+        rows = self.table.selectionModel().selectedRows() if self.table.selectionModel() else []
+        return self.ids[rows[0].row()] if rows and rows[0].row() < len(self.ids) else None
+
+    def update_buttons(self):
+        j = self.sup.jobs.get(self.selected())
+        queued = j is not None and j.state == QUEUED
+        for b in (self.cancel_btn, self.up_btn, self.down_btn):
+            b.setEnabled(queued)
+        self.kill_btn.setEnabled(j is not None and not queued)
+        self.pause_btn.setEnabled(j is not None and not queued)
+        self.pause_btn.setText(self.L["proc_resume" if j is not None and j.state == SUSPENDED else "proc_suspend"])
+
+    def act(self, fn):
+        jid = self.selected()
+        if jid is not None:
+            fn(jid)
+
+    def toggle_suspend(self):
+        j = self.sup.jobs.get(self.selected())
+        if j is not None:
+            self.sup.suspend(j.id, j.state != SUSPENDED)
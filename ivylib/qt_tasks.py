@@ -0,0 +1,37 @@
+# 把耗时操作放到 QThreadPool 里执行，完成后在主线程回调
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+_pending = set()     # 持有任务引用，直到回调结束
+
+
+class _Signals(QObject):
+    done = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+class _Task(QRunnable):
+    def __init__(self, fn, args):
+        super().__init__()
+        self.fn, self.args = fn, args
+        self.signals = _Signals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.done.emit(result)
+
+
+def run_in_background(fn, *args, on_done=None, on_error=None, pool=None):
+    task = _Task(fn, args)
+    _pending.add(task)
+
+    def finish(cb, value):
+        _pending.discard(task)
+        if cb: cb(value)
+    task.signals.done.connect(lambda r: finish(on_done, r))
+    task.signals.failed.connect(lambda e: finish(on_error, e))
+    (pool or QThreadPool.globalInstance()).start(task)
+    return task
@@ -0,0 +1,63 @@
+# 详情面板渲染：Markdown → HTML 的结果按 (工具 id, 内容摘要) 缓存，附带的 .md/.txt 文档内联显示。
+# 渲染函数不依赖 Qt，可在工作线程里执行
+import os, html, json, hashlib
+from collections import OrderedDict
+
+DOC_INLINE_MAX = 2 << 20        # 内联显示的文档上限 2MB，超出部分截断
+
+
+class LRUCache:
+    def __init__(self, capacity=128):
+        self.capacity = capacity
+        self.data = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self.data:
+            return default
+        self.data.move_to_end(key)
+        return self.data[key]
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.capacity:
+            self.data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+
+def content_key(tool):
+    # 只取影响显示的字段；文档本身的变化由 doc_stamp 判断
+    raw = json.dumps([tool.get(k, "") for k in ("name", "category", "description", "doc_path")],
+                     ensure_ascii=False)
+    return tool["id"], hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def doc_stamp(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime, st.st_size
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _md(text):
+    import markdown
+    return markdown.markdown(text, extensions=["fenced_code", "tables"])
+
+
+def render_detail(tool, category_label):
+    # 返回 (文档 stamp, html)；stamp 用于之后判断缓存是否过期
+    md = f"# {tool['name']}\n\n- **{category_label}**: {tool.get('category', '')}\n\n{tool.get('description', '')}"
+    body = _md(md)
+    doc = tool.get("doc_path", "")
+    stamp = doc_stamp(doc) if doc else None
+    if stamp and doc.lower().endswith((".md", ".txt")):
+        with open(doc, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read(DOC_INLINE_MAX)
+        body += "<hr/>" + (_md(text) if doc.lower().endswith(".md") else f"<pre>{html.escape(text)}</pre>")
+    return stamp, body
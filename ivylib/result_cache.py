@@ -0,0 +1,117 @@
+# 命令行运行结果缓存（不依赖 Qt）：键由程序、参数、工作目录以及程序/解释器/参数里出现的文件的内容指纹组成，
+# 值是 zlib 压缩的输出和退出码。每条一个文件，文件头记录退出码与生成时间；命中时更新 mtime，
+# 超出容量时按 mtime 淘汰最久未用的，超过 TTL 的视为未命中
+import os, time, zlib, shutil, struct, hashlib, threading
+
+RESULT_CACHE_DIR = "result_cache"
+HEADER = struct.Struct(">4siQd")        # 魔数, 退出码, 原始长度, 生成时间
+MAGIC = b"IVR1"
+MAX_ENTRY = 64 << 20                    # 超过这个大小的输出不缓存
+
+_fingerprints = {}                      # (路径, 大小, mtime) -> sha256，文件没变就不重新读
+_fp_lock = threading.Lock()
+
+
+def file_digest(path):
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _fp_lock:
+        if key in _fingerprints:
+            return _fingerprints[key]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    with _fp_lock:
+        _fingerprints[key] = h.hexdigest()
+    return _fingerprints[key]
+
+
+def run_key(program, args, cwd=None):
+    # 程序按 PATH 解析后取指纹（解释器升级即失效）；参数里是文件的（脚本、jar、输入文件）同样取内容指纹
+    h = hashlib.sha256()
+    resolved = shutil.which(program) or program
+    for part in [resolved, cwd or ""] + list(args):
+        h.update(part.encode("utf-8", "surrogateescape") + b"\0")
+        path = os.path.join(cwd, part) if cwd and not os.path.isabs(part) else part
+        if os.path.isfile(path):
+            h.update(file_digest(path).encode("ascii"))
+        h.update(b"\1")
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, base=RESULT_CACHE_DIR, max_bytes=256 << 20, ttl=7 * 86400):
+        self.base, self.max_bytes, self.ttl = base, max_bytes, ttl
+        os.makedirs(base, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.base, key + ".z")
+
+    def get(self, key):
+        # 命中返回 (退出码, 输出 bytes, 生成时间)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                magic, code, size, created = HEADER.unpack(f.read(HEADER.size))
+                data = zlib.decompress(f.read()) if magic == MAGIC else None
+        except (OSError, struct.error, zlib.error):
+            data = None
+        if data is None or len(data) != size or time.time() - created > self.ttl:
+            self.discard(key)
+            return None
+        try: os.utime(path)             # 记录最近使用，供 LRU 淘汰
+        except OSError: pass
+        return code, data, created
+
+    def lookup(self, program, args, force=False):
+        # (键, 命中结果或 None)。算键要读程序和参数文件取指纹，命中还要解压，图形界面在后台线程调用
+        key = run_key(program, args)
+        return key, None if force else self.get(key)
+
+    def put_file(self, key, code, path):
+        # 从输出落盘文件存入：先看大小，超限的不读进内存
+        try:
+            if os.path.getsize(path) > MAX_ENTRY:
+                return False
+            with open(path, "rb") as f:
+                return self.put(key, code, f.read())
+        except OSError:
+            return False
+
+    def put(self, key, code, data):
+        if len(data) > MAX_ENTRY:
+            return False
+        path = self._path(key)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, code, len(data), time.time()))
+            f.write(zlib.compress(data, 6))
+        os.replace(tmp, path)
+        self.evict()
+        return True
+
+    def discard(self, key):
+        try: os.remove(self._path(key))
+        except OSError: pass
+
+    def entries(self):
+        out = []
+        for e in os.scandir(self.base):
+            if e.name.endswith(".z"):
+                try: st = e.stat()
+                except OSError: continue
+                out.append((st.st_mtime, st.st_size, e.path))
+        return out
+
+    def evict(self):
+        # 先删过期的（mtime 不早于生成时间，mtime 都已超过 TTL 必然过期），再按最久未用删到容量以内
+        entries = sorted(self.entries())
+        total = sum(s for _, s, _ in entries)
+        now = time.time()
+        for mtime, size, path in entries:
+            if total <= self.max_bytes and now - mtime <= self.ttl:
+                break
+            try: os.remove(path)
+            except OSError: continue
+            total -= size
@@ -0,0 +1,74 @@
+# 运行期资源采样：对登记的进程定时读取内存与 CPU，结束时写入运行记录。
+# 刚启动的几秒内存变化最快，按 interval 密集采样；之后只剩长时间运行的进程时放慢到 slow_interval
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from ivylib.runs import RunLog, new_record, sample_proc, pid_alive
+
+
+class RunMonitor(QObject):
+    recorded = pyqtSignal(dict)
+
+    FAST_SECS = 5
+
+    def __init__(self, log=None, interval=250, slow_interval=2000, parent=None):
+        super().__init__(parent)
+        self.log = log or RunLog()
+        self.interval, self.slow_interval = interval, slow_interval
+        self.active = {}              # id(rec) -> [rec, pid, poll]
+        self.timer = QTimer(self); self.timer.setInterval(interval)
+        self.timer.timeout.connect(self._tick)
+
+    def begin(self, tool, mode):
+        rec = new_record(tool, mode)
+        rec["_t0"] = time.monotonic()
+        return rec
+
+    def spawned(self, rec, pid=None, poll=None):
+        # 进程已启动：记下启动延迟并开始采样。poll 返回退出码或 None（仍在运行）；
+        # 不传 poll 时（脱离运行的进程）按 pid 是否存在判断结束，退出码未知
+        rec["spawn_ms"] = round((time.monotonic() - rec["_t0"]) * 1000, 2)
+        if pid:
+            self.active[id(rec)] = [rec, pid, poll]
+            self._sample(rec, pid)
+            self.timer.start(self.interval)
+
+    def _sample(self, rec, pid):
+        s = sample_proc(pid)
+        if s is None:
+            return
+        rss, cpu = s
+        if rss is not None:
+            rec["peak_rss_kb"] = max(rec["peak_rss_kb"] or 0, rss)
+        rec["cpu_s"] = round(max(rec["cpu_s"] or 0, cpu), 3)
+
+    def _tick(self):
+        for rec, pid, poll in list(self.active.values()):
+            if poll is not None:
+                code = poll()
+                if code is not None:
+                    self.finish(rec, code); continue
+            elif pid_alive(pid) is not True:
+                self.finish(rec, None); continue
+            self._sample(rec, pid)
+        if not self.active:
+            self.timer.stop()
+            return
+        now = time.monotonic()
+        young = any(now - rec["_t0"] < self.FAST_SECS for rec, _, _ in self.active.values())
+        want = self.interval if young else self.slow_interval
+        if self.timer.interval() != want:
+            self.timer.setInterval(want)
+
+    def finish(self, rec, exit_code, out_bytes=None):
+        entry = self.active.pop(id(rec), None)
+        if entry is not None:
+            self._sample(rec, entry[1])         # 进程若尚未被回收还能再取一次
+        if "_t0" not in rec:
+            return                              # 已经记录过
+        rec["wall_s"] = round(time.monotonic() - rec.pop("_t0"), 3)
+        rec["exit_code"], rec["out_bytes"] = exit_code, out_bytes
+        try:
+            self.log.append(rec)
+        except OSError:
+            pass
+        self.recorded.emit(rec)
@@ -0,0 +1,110 @@
+# 运行记录（不依赖 Qt）：每次启动一条，含启动延迟、总耗时、退出码、峰值内存、CPU 时间和输出大小。
+# 追加写入 JSONL；资源数据优先用 psutil（可选依赖），否则在 Linux 上读 /proc
+import os, csv, json, math, time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+RUNS_FILE = "run_records.jsonl"
+FIELDS = ("tool", "mode", "start", "spawn_ms", "wall_s", "exit_code", "peak_rss_kb", "cpu_s", "out_bytes")
+_TICK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def new_record(tool, mode):
+    rec = dict.fromkeys(FIELDS)
+    rec.update(tool=tool, mode=mode, start=round(time.time(), 3))
+    return rec
+
+
+def sample_proc(pid):
+    # 返回 (峰值/当前常驻内存 KB, 累计 CPU 秒)；进程已不存在或平台不支持时返回 None
+    if psutil is not None:
+        try:
+            p = psutil.Process(pid)
+            mem, cpu = p.memory_info(), p.cpu_times()
+            return getattr(mem, "peak_wset", mem.rss) // 1024, cpu.user + cpu.system
+        except (psutil.Error, OSError):
+            return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            rss = next((int(l.split()[1]) for l in f if l.startswith("VmHWM:")), None)
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        # utime, stime, cutime, cstime（含已回收的子进程）
+        cpu = sum(int(x) for x in fields[11:15]) / _TICK
+    except (OSError, ValueError, IndexError):
+        return None
+    return rss, cpu
+
+
+def pid_alive(pid):
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.path.isdir("/proc"):
+        return os.path.exists(f"/proc/{pid}")
+    return None                   # 无法判断
+
+
+class RunLog:
+    def __init__(self, path=RUNS_FILE):
+        self.path = path
+
+    def append(self, rec):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({k: rec.get(k) for k in FIELDS}, ensure_ascii=False) + "\n")
+
+    def records(self, since=None, until=None):
+        # 只取 start 落在 [since, until) 内的记录
+        try:
+            f = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try: rec = json.loads(line)
+                except ValueError: continue          # 写到一半的行
+                start = rec.get("start", 0)
+                if (since is None or start >= since) and (until is None or start < until):
+                    yield rec
+
+
+def percentile(values, q):
+    # 最近秩法：values 已排序
+    if not values:
+        return None
+    return values[min(len(values), max(1, math.ceil(q * len(values)))) - 1]
+
+
+def summarize(records):
+    # 每个工具：运行次数、失败次数、耗时与峰值内存的 p50/p95
+    by_tool = {}
+    for r in records:
+        by_tool.setdefault(r["tool"], []).append(r)
+    rows = []
+    for tool, rs in by_tool.items():
+        wall = sorted(r["wall_s"] for r in rs if r.get("wall_s") is not None)
+        rss = sorted(r["peak_rss_kb"] for r in rs if r.get("peak_rss_kb") is not None)
+        spawn = sorted(r["spawn_ms"] for r in rs if r.get("spawn_ms") is not None)
+        fails = sum(1 for r in rs if r.get("exit_code") not in (None, 0))
+        rows.append({"tool": tool, "runs": len(rs), "failures": fails,
+                     "wall_p50": percentile(wall, .5), "wall_p95": percentile(wall, .95),
+                     "rss_p50": percentile(rss, .5), "rss_p95": percentile(rss, .95),
+                     "spawn_p50": percentile(spawn, .5)})
+    rows.sort(key=lambda r: -(r["wall_p95"] or 0))
+    return rows
+
+
+def export_csv(records, path):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.DictWriter(f, FIELDS, extrasaction="ignore")
+        w.writeheader()
+        for r in records:
+            w.writerow(r)
+
+
+def export_jsonl(records, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps({k: r.get(k) for k in FIELDS}, ensure_ascii=False) + "\n")
@@ -0,0 +1,170 @@
+# 全文检索：名称/分类/说明/参数/说明文档 的内存倒排索引，支持前缀与单字符容错匹配，
+# 结果按字段权重 × 使用次数加权排序；增删改按工具 id 增量更新
+import os, re, math, bisect
+
+FIELD_WEIGHTS = {"name": 5.0, "category": 3.0, "description": 2.0, "args": 1.0, "doc": 1.0}
+DOC_EXTS = (".md", ".txt")
+DOC_MAX_BYTES = 1 << 20          # 说明文档只索引前 1MB
+PREFIX_LIMIT = 200               # 一个查询词最多展开多少个前缀词
+EXACT, PREFIX, FUZZY = 1.0, 0.7, 0.4
+
+_WORD = re.compile(r"[0-9a-z_]+|[一-鿿]+")
+
+
+def tokenize(text):
+    # 英文按词切分；中文没有空格，切成单字和相邻二字，查询时用二字，兼顾召回与精度
+    out = []
+    for w in _WORD.findall(text.lower()):
+        if w[0] >= "一":
+            out.extend(w)
+            out.extend(w[i:i+2] for i in range(len(w) - 1))
+        else:
+            out.append(w)
+    return out
+
+
+def query_terms(text):
+    out = []
+    for w in _WORD.findall(text.lower()):
+        if w[0] >= "一" and len(w) > 1:
+            out.extend(w[i:i+2] for i in range(len(w) - 1))
+        else:
+            out.append(w)
+    return out
+
+
+def _deletes(term):
+    return {term[:i] + term[i+1:] for i in range(len(term))}
+
+
+def read_doc(path):
+    if not path or not path.lower().endswith(DOC_EXTS):
+        return None, ""
+    try:
+        mtime = os.path.getmtime(path)
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return mtime, f.read(DOC_MAX_BYTES)
+    except OSError:
+        return None, ""
+
+
+class SearchIndex:
+    def __init__(self):
+        self.postings = {}       # term -> {tool_id: 权重}
+        self.terms = []          # 有序词表，用于前缀查找
+        self.deletes = {}        # 删一个字符后的变体 -> {term}，用于容错匹配
+        self.doc_terms = {}      # tool_id -> {term: 权重}，删除/更新时用
+        self.names = {}          # tool_id -> name，用于按使用次数加权
+        self.doc_mtime = {}      # tool_id -> (doc_path, mtime)
+        self.usage = {}          # name -> 使用次数
+
+    # —— 建索引 ——
+    def add(self, tool, doc_text=None, mtime=None):
+        # doc_text/mtime 可由调用方在后台线程用 read_doc 预先读好，这里就不碰文件
+        tid = tool["id"]
+        if tid in self.doc_terms:
+            self.remove(tid)
+        doc = tool.get("doc_path", "")
+        if doc_text is None:
+            mtime, doc_text = read_doc(doc)
+        weights = {}
+        fields = dict(tool, doc=doc_text)
+        for field, w in FIELD_WEIGHTS.items():
+            for term in tokenize(fields.get(field) or ""):
+                weights[term] = max(weights.get(term, 0), w)
+        for term, w in weights.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                bisect.insort(self.terms, term)
+                if len(term) > 2:
+                    for d in _deletes(term):
+                        self.deletes.setdefault(d, set()).add(term)
+            posting[tid] = w
+        self.doc_terms[tid] = weights
+        self.names[tid] = tool.get("name", "")
+        self.doc_mtime[tid] = (doc, mtime)
+
+    def remove(self, tid):
+        for term in self.doc_terms.pop(tid, ()):
+            posting = self.postings[term]
+            posting.pop(tid, None)
+            if not posting:
+                del self.postings[term]
+                del self.terms[bisect.bisect_left(self.terms, term)]
+                if len(term) > 2:
+                    for d in _deletes(term):
+                        s = self.deletes.get(d)
+                        if s is not None:
+                            s.discard(term)
+                            if not s: del self.deletes[d]
+        self.names.pop(tid, None)
+        self.doc_mtime.pop(tid, None)
+
+    def update(self, tool):
+        self.add(tool)
+
+    def rebuild(self, tools):
+        usage = self.usage
+        SearchIndex.__init__(self)
+        self.usage = usage
+        for t in tools:
+            self.add(t)
+
+    def set_usage(self, counts):
+        self.usage = counts
+
+    # —— 说明文档变化检测 ——
+    def stale_docs(self):
+        # 返回 mtime 变了的 (tool_id, doc_path)；只做 stat，可在后台线程调用
+        out = []
+        for tid, (doc, mtime) in list(self.doc_mtime.items()):
+            if not doc or not doc.lower().endswith(DOC_EXTS):
+                continue
+            try: cur = os.path.getmtime(doc)
+            except OSError: cur = None
+            if cur != mtime:
+                out.append((tid, doc))
+        return out
+
+    # —— 查询 ——
+    def _expand(self, q):
+        hits = {}
+        if q in self.postings:
+            hits[q] = EXACT
+        i = bisect.bisect_left(self.terms, q)
+        for term in self.terms[i:i + PREFIX_LIMIT]:
+            if not term.startswith(q):
+                break
+            hits.setdefault(term, PREFIX)
+        if len(q) > 3 and not hits:
+            # 编辑距离 1：查询词与索引词删一个字符后相同（覆盖增、删、改一个字符）
+            cands = set(self.deletes.get(q, ()))
+            for d in _deletes(q):
+                if d in self.postings: cands.add(d)
+                cands |= self.deletes.get(d, set())
+            for term in cands:
+                hits.setdefault(term, FUZZY)
+        return hits
+
+    def search(self, text, limit=None):
+        qs = query_terms(text)
+        if not qs:
+            return []
+        scores = None
+        for q in qs:
+            cur = {}
+            for term, factor in self._expand(q).items():
+                for tid, w in self.postings[term].items():
+                    s = w * factor
+                    if s > cur.get(tid, 0):
+                        cur[tid] = s
+            if scores is None:
+                scores = cur
+            else:                                  # 多个查询词取交集
+                scores = {tid: scores[tid] + s for tid, s in cur.items() if tid in scores}
+            if not scores:
+                return []
+        usage, names = self.usage, self.names
+        ranked = sorted(scores, key=lambda tid: -scores[tid] * (1 + math.log1p(usage.get(names[tid], 0))))
+        return ranked[:limit] if limit else ranked
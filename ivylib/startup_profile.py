@@ -0,0 +1,28 @@
+# 启动耗时分析：python IvyDock.py --profile-startup，按阶段打印到 stderr
+import sys, time
+
+TARGET_MS = 300
+
+
+class StartupProfile:
+    def __init__(self, t0, enabled=False):
+        self.t0 = self.last = t0
+        self.enabled = enabled
+        self.phases = []
+        self.done = False
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def report(self, out=None):
+        if not self.enabled or self.done:
+            return
+        self.done = True
+        out = out or sys.stderr
+        total = (self.last - self.t0) * 1000
+        for name, ms in self.phases:
+            print(f"  {name:<16}{ms:8.1f} ms", file=out)
+        verdict = "OK" if total <= TARGET_MS else f"over target by {total - TARGET_MS:.1f} ms"
+        print(f"  {'total':<16}{total:8.1f} ms  (target {TARGET_MS} ms: {verdict})", file=out)
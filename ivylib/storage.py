@@ -0,0 +1,184 @@
+# JSON 持久化：临时文件 + 改名的原子写入、保留上一版 .bak、损坏时自动恢复，
+# 以及把短时间内的多次修改合并成一次后台写入的 DebouncedWriter（不覆盖别人在此期间写入的文件）
+import os, json, time, shutil, tempfile, threading
+
+recovery_log = []        # 启动时发生的恢复记录，界面据此提示用户
+
+
+def _write(path, text):
+    # 临时文件名各不相同，两个写入者（图形界面、另一个实例）不会互相拿走对方的临时文件
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp)
+            _backup(path)
+        else:
+            os.chmod(tmp, 0o644)
+        # 只有这一步替换目标文件，其他进程任何时候读都能读到完整的旧版或新版
+        os.replace(tmp, path)
+    except BaseException:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+
+
+def _backup(path):
+    # 把当前版本留作 .bak：硬链接到临时名再改名，目标文件一直在；文件系统不支持硬链接时复制
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".bak", dir=os.path.dirname(path) or ".")
+    os.close(fd)
+    try:
+        os.remove(tmp)
+        os.link(path, tmp)
+    except OSError:
+        shutil.copy2(path, tmp)
+    os.replace(tmp, path + ".bak")
+    # .bak 已经是同一个文件的硬链接时 rename 什么也不做，临时名要自己删
+    try: os.remove(tmp)
+    except FileNotFoundError: pass
+
+
+def save_json(path, data):
+    _write(path, json.dumps(data, ensure_ascii=False, indent=2))
+
+
+def _read(path, default):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, type(default)):
+        raise ValueError(f"expected {type(default).__name__}, got {type(data).__name__}")
+    return data
+
+
+def file_stamp(path):
+    # (mtime, 大小)，判断文件是否被别的进程/同步工具改过；文件不存在时为 None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def peek_json(path, default):
+    # 只读不修复：监视到文件变化时用，读不到或内容不完整（同步工具正在写）返回 None
+    try:
+        return _read(path, default)
+    except (OSError, ValueError):
+        return None
+
+
+def load_json(path, default, repair=False):
+    # 读不到或损坏时从 .bak 取上一版。repair 只在唯一的写入者（图形界面启动时）传入：
+    # 损坏的文件改名留档并把 .bak 写回；普通读取（命令行等）只在内存里用 .bak，不写盘，
+    # 以免在别的进程保存的间隙用旧版覆盖新版
+    try:
+        return _read(path, default)
+    except FileNotFoundError:
+        err = None
+    except (OSError, ValueError) as e:
+        err = e
+        aside = None
+        if repair:
+            # 损坏的文件改名留档，不覆盖，方便手工找回
+            aside = f"{path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+            try: os.replace(path, aside)
+            except OSError: aside = None
+    bak = path + ".bak"
+    if os.path.exists(bak):
+        try:
+            data = _read(bak, default)
+        except (OSError, ValueError):
+            pass
+        else:
+            if repair:
+                save_json(path, data)
+            if err is not None:
+                recovery_log.append(f"{path}: {err}; restored from {bak}" + (f", damaged copy kept as {aside}" if aside else ""))
+            return data
+    if err is not None:
+        recovery_log.append(f"{path}: {err}; no usable backup, using defaults" + (f", damaged copy kept as {aside}" if aside else ""))
+    return default.copy()
+
+
+class DebouncedWriter:
+    # schedule() 只记录最新快照并立即返回；后台线程在最后一次修改 delay 秒后写盘，
+    # 连续修改合并成一次。flush() 阻塞到所有待写内容落盘（退出前调用）。
+    # adopt() 过的文件写盘前先核对 file_stamp，磁盘上已被别人改过就放弃这次写入、记入 stale，
+    # 由调用方合并后重新 schedule，不会用旧快照覆盖别人的修改。
+    # 写盘失败（磁盘满、只读、被占用）时快照留在 pending 里隔 retry 秒重试，失败的文件记在 failed，
+    # 每个文件从正常变为失败时回调一次 on_error(path, 错误)（在后台线程里调用）
+    def __init__(self, delay=0.5, retry=5.0, on_error=None):
+        self.delay, self.retry, self.on_error = delay, retry, on_error
+        self.pending = {}                 # path -> (快照, 最后修改时间)
+        self.cond = threading.Condition()
+        self.busy = False
+        self.failed = {}                  # path -> (最近一次写盘错误, 失败时刻)，写成功后清除
+        self.stamps = {}                  # path -> 调用方已读入的版本的 file_stamp
+        self.written = {}                 # path -> 最近一次自己写入的快照
+        self.stale = set()
+        self.thread = threading.Thread(target=self._run, name="json-writer", daemon=True)
+        self.thread.start()
+
+    def schedule(self, path, data):
+        # 浅拷贝即可：列表/字典里的元素在修改时整体替换，不会原地改动
+        snap = list(data) if isinstance(data, list) else dict(data)
+        with self.cond:
+            self.pending[path] = (snap, time.monotonic())
+            self.cond.notify()
+
+    def adopt(self, path, stamp):
+        with self.cond:
+            self.stamps[path] = stamp
+            self.stale.discard(path)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                now = time.monotonic()
+                due = [p for p, (_, t) in self.pending.items() if now - t >= self.delay]
+                if not due:
+                    self.cond.wait(self.delay - (now - min(t for _, t in self.pending.values())))
+                    continue
+                batch = {p: self.pending.pop(p)[0] for p in due}
+                self.busy = True
+            for path, data in batch.items():
+                with self.cond:
+                    if path in self.stamps and file_stamp(path) != self.stamps[path]:
+                        self.stale.add(path)
+                        continue
+                try:
+                    save_json(path, data)
+                except OSError as e:
+                    with self.cond:
+                        first = path not in self.failed
+                        self.failed[path] = (str(e), time.monotonic())
+                        # 期间又有新快照就等它，否则这份稍后重试
+                        self.pending.setdefault(path, (data, time.monotonic() - self.delay + self.retry))
+                    if first and self.on_error:
+                        self.on_error(path, str(e))
+                    continue
+                with self.cond:
+                    self.failed.pop(path, None)
+                    if path in self.stamps:
+                        self.stamps[path] = file_stamp(path)
+                    self.written[path] = data
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()
+
+    def flush(self):
+        # 等所有待写内容落盘。每份至少再试一次，仍失败的留在 pending 里继续定时重试，
+        # 返回 {path: 错误}，由调用方提示后决定是否再 flush
+        with self.cond:
+            start = time.monotonic()
+            for path in list(self.pending):
+                self.pending[path] = (self.pending[path][0], 0)   # 立即到期
+            self.cond.notify_all()
+            while self.busy or any(self.failed.get(p, (None, 0))[1] < start for p in self.pending):
+                self.cond.wait()
+            return {p: e for p, (e, _) in self.failed.items()}
@@ -0,0 +1,264 @@
+# 可执行类工具的统一启动器：所有脱离窗口运行的程序都经这里排队启动，按优先级出队。
+# 全局并发数、每个分类的并发数和内存预算都是可选限制，默认 0 即不限：这些程序大多是长时间开着的
+# 图形界面工具，默认限额会让后来的启动一直排队。所有子进程由同一个回收线程等待，退出时通过信号通知主线程。
+# 子进程在独立的会话/进程组里，IvyDock 退出后继续运行
+import os, sys, time, heapq, select, signal, itertools, threading, subprocess
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from ivylib.runs import sample_proc
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+QUEUED, RUNNING, SUSPENDED = "queued", "running", "suspended"
+
+
+class Job:
+    __slots__ = ("id", "tool", "category", "program", "args", "cwd", "priority", "state",
+                 "proc", "pid", "queued_at", "started_at", "estimate_kb", "rec")
+
+    def __init__(self, id, tool, category, program, args, cwd, priority, estimate_kb):
+        self.id, self.tool, self.category = id, tool, category
+        self.program, self.args, self.cwd, self.priority = program, args, cwd, priority
+        self.state, self.proc, self.pid, self.rec = QUEUED, None, None, None
+        self.queued_at, self.started_at = time.monotonic(), None
+        self.estimate_kb = estimate_kb
+
+
+def _suspend(pid, on):
+    if psutil is not None:
+        p = psutil.Process(pid)
+        return p.suspend() if on else p.resume()
+    if os.name == "nt":
+        import ctypes
+        k32, ntdll = ctypes.windll.kernel32, ctypes.windll.ntdll
+        h = k32.OpenProcess(0x0800, False, pid)           # PROCESS_SUSPEND_RESUME
+        if not h:
+            raise OSError(f"OpenProcess({pid}) failed")
+        try:
+            (ntdll.NtSuspendProcess if on else ntdll.NtResumeProcess)(h)
+        finally:
+            k32.CloseHandle(h)
+        return
+    os.killpg(pid, signal.SIGSTOP if on else signal.SIGCONT)
+
+
+def _kill(job):
+    # 连同它启动的子进程一起结束（启动器类的 exe 常常自己再拉起真正的程序）
+    if psutil is not None:
+        try:
+            for c in psutil.Process(job.pid).children(recursive=True):
+                c.kill()
+        except psutil.Error:
+            pass
+    if os.name != "nt":
+        try: os.killpg(job.pid, signal.SIGKILL); return
+        except OSError: pass
+    job.proc.kill()
+
+
+class _Reaper:
+    # 所有子进程共用一个回收线程：Linux 上等 pidfd 可读（进程一退出就返回），其他平台每 POLL 秒 poll() 一遍；
+    # 新登记的子进程最迟 POLL 秒后纳入等待。没有子进程时阻塞在条件变量上，不空转
+    POLL = 0.5
+
+    def __init__(self, on_exit):
+        self.on_exit = on_exit
+        self.procs = {}                   # job id -> (Popen, pidfd 或 None)
+        self.cond = threading.Condition()
+        self.thread = None
+
+    def add(self, jid, p):
+        fd = None
+        if hasattr(os, "pidfd_open"):
+            try: fd = os.pidfd_open(p.pid)
+            except OSError: pass
+        with self.cond:
+            self.procs[jid] = (p, fd)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="supervisor-reaper", daemon=True)
+                self.thread.start()
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.procs:
+                    self.cond.wait()
+                items = list(self.procs.items())
+            if all(fd is not None for _, (_, fd) in items):
+                poller = select.poll()
+                for _, (_, fd) in items:
+                    poller.register(fd, select.POLLIN)
+                poller.poll(self.POLL * 1000)
+            else:
+                time.sleep(self.POLL)
+            for jid, (p, fd) in items:
+                code = p.poll()
+                if code is None:
+                    continue
+                with self.cond:
+                    self.procs.pop(jid, None)
+                if fd is not None:
+                    os.close(fd)
+                self.on_exit(jid, code)
+
+
+class Supervisor(QObject):
+    changed = pyqtSignal()
+    failed = pyqtSignal(str, str)          # 工具名, 错误信息
+    _exited = pyqtSignal(int, object)      # job id, 退出码（回收线程 -> 主线程；Windows 退出码可能超出 int32）
+
+    def __init__(self, settings, monitor=None, parent=None):
+        super().__init__(parent)
+        self.settings, self.monitor = settings, monitor
+        self.queue = []                    # 堆：(-优先级, 序号, job)
+        self.jobs = {}                     # id -> Job（排队中和运行中）
+        self.peak_kb = {}                  # 工具 -> 最近一次运行的峰值内存，用来估算下一次
+        self.seq = itertools.count(1)
+        self._exited.connect(self._on_exit)
+        self.reaper = _Reaper(self._exited.emit)
+        if monitor is not None:
+            monitor.recorded.connect(self._learn)
+        # 只因内存预算而排队时，内存不会随进程退出以外的事件释放，隔一会儿再看一次
+        self.retry = QTimer(self); self.retry.setSingleShot(True); self.retry.setInterval(2000)
+        self.retry.timeout.connect(self.dispatch)
+
+    # —— 限额（直接读当前设置，设置修改后立即生效；0 为不限）——
+    def limit_total(self):
+        return self.settings.get("max_running", 0) or sys.maxsize
+
+    def limit_category(self, cat):
+        limits = self.settings.get("category_limits", {})
+        return limits.get(cat, self.settings.get("max_per_category", 0)) or sys.maxsize
+
+    def budget_kb(self):
+        return (self.settings.get("memory_budget_mb", 0) or 0) * 1024
+
+    def _learn(self, rec):
+        if rec.get("mode") == "detached" and rec.get("peak_rss_kb"):
+            self.peak_kb[rec["tool"]] = rec["peak_rss_kb"]
+
+    # —— 排队与出队 ——
+    def submit(self, tool, category, program, args, cwd=None, priority=0):
+        job = Job(next(self.seq), tool, category, program, list(args), cwd, priority, self.peak_kb.get(tool, 0))
+        self.jobs[job.id] = job
+        heapq.heappush(self.queue, (-priority, job.id, job))
+        self.dispatch()
+        self.changed.emit()
+        return job
+
+    def running(self):
+        return [j for j in self.jobs.values() if j.state != QUEUED]
+
+    def queued(self):
+        return [j for _, _, j in sorted(self.queue) if j.state == QUEUED]
+
+    def used_kb(self, running):
+        total = 0
+        for j in running:
+            s = sample_proc(j.pid)
+            total += (s[0] or 0) if s else j.estimate_kb
+        return total
+
+    def dispatch(self):
+        # 按优先级依次尝试；被分类限额挡住的不影响后面其他分类的任务。挂起的进程仍占名额
+        running = self.running()
+        per_cat = {}
+        for j in running:
+            per_cat[j.category] = per_cat.get(j.category, 0) + 1
+        budget = self.budget_kb()
+        used = self.used_kb(running) if budget and self.queue else 0
+        skipped, blocked_by_memory = [], False
+        while self.queue and len(running) < self.limit_total():
+            item = heapq.heappop(self.queue)
+            job = item[2]
+            if job.state != QUEUED:
+                continue                  # 已取消
+            if per_cat.get(job.category, 0) >= self.limit_category(job.category):
+                skipped.append(item); continue
+            if budget and running and used + job.estimate_kb > budget:
+                skipped.append(item); blocked_by_memory = True; continue
+            if self._start(job):
+                running.append(job)
+                per_cat[job.category] = per_cat.get(job.category, 0) + 1
+                used += job.estimate_kb
+        for item in skipped:
+            heapq.heappush(self.queue, item)
+        if blocked_by_memory:
+            self.retry.start()
+
+    def _start(self, job):
+        # CREATE_NEW_PROCESS_GROUP | DETACHED_PROCESS：与原来 startDetached 一样不依附 IvyDock
+        kw = {"creationflags": 0x00000200 | 0x00000008} if os.name == "nt" else {"start_new_session": True}
+        rec = self.monitor.begin(job.tool, "detached") if self.monitor else None
+        try:
+            p = subprocess.Popen([job.program] + job.args, cwd=job.cwd or None, stdin=subprocess.DEVNULL,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kw)
+        except OSError as e:
+            del self.jobs[job.id]
+            self.failed.emit(job.tool, f"{job.program}: {e}")
+            return False
+        job.proc, job.pid, job.state, job.rec = p, p.pid, RUNNING, rec
+        job.started_at = time.monotonic()
+        if rec is not None:
+            self.monitor.spawned(rec, p.pid, lambda: None)     # 只采样资源，退出由回收线程报告
+        self.reaper.add(job.id, p)
+        return True
+
+    def start_queued(self):
+        # 退出前由用户选择：不受限额，立即启动所有还在排队的任务（它们不依附 IvyDock，会继续运行）
+        started = []
+        while self.queue:
+            job = heapq.heappop(self.queue)[2]
+            if job.state == QUEUED and self._start(job):
+                started.append(job)
+        self.changed.emit()
+        return started
+
+    def _on_exit(self, jid, code):
+        job = self.jobs.pop(jid, None)
+        if job is None:
+            return
+        if job.rec is not None:
+            self.monitor.finish(job.rec, code)
+        self.dispatch()
+        self.changed.emit()
+
+    # —— 面板操作 ——
+    def cancel(self, jid):
+        job = self.jobs.get(jid)
+        if job is not None and job.state == QUEUED:
+            job.state = None              # 留在堆里，出队时丢弃
+            del self.jobs[jid]
+            self.changed.emit()
+
+    def reprioritize(self, jid, delta):
+        job = self.jobs.get(jid)
+        if job is None or job.state != QUEUED:
+            return
+        job.priority += delta
+        self.queue = [(-j.priority, j.id, j) for _, _, j in self.queue if j.state == QUEUED]
+        heapq.heapify(self.queue)
+        self.dispatch()
+        self.changed.emit()
+
+    def kill(self, jid):
+        job = self.jobs.get(jid)
+        if job is not None and job.proc is not None:
+            if job.state == SUSPENDED:
+                try: _suspend(job.pid, False)     # 被挂起的进程收不到终止以外的信号，先恢复
+                except OSError: pass
+            _kill(job)                    # 回收线程随即报告退出
+
+    def suspend(self, jid, on=True):
+        job = self.jobs.get(jid)
+        if job is None or job.proc is None or (job.state == SUSPENDED) == on:
+            return
+        try:
+            _suspend(job.pid, on)
+        except Exception as e:
+            self.failed.emit(job.tool, str(e)); return
+        job.state = SUSPENDED if on else RUNNING
+        self.changed.emit()
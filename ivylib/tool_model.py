@@ -0,0 +1,220 @@
+# 工具树的 Model/View 实现：分类 → 工具两级，按 id 做行级增删改，不再整树重建
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor
+
+ToolIdRole = Qt.UserRole + 1
+HealthRole = Qt.UserRole + 2
+BADGE_COLORS = {"ok": "#3cb371", "warn": "#e6a23c", "bad": "#e05252"}
+_badges = {}
+
+
+def badge(state):
+    # 健康状态徽标：实心圆点，按状态缓存
+    if state not in _badges:
+        pm = QPixmap(12, 12); pm.fill(Qt.transparent)
+        p = QPainter(pm); p.setRenderHint(QPainter.Antialiasing)
+        p.setPen(Qt.NoPen); p.setBrush(QColor(BADGE_COLORS[state])); p.drawEllipse(2, 2, 8, 8); p.end()
+        _badges[state] = QIcon(pm)
+    return _badges[state]
+
+
+class _Category:
+    # ids 是树里的行顺序，rows 是 id -> 行号的反查表，row 是分类自己在顶层的行号；
+    # 按 id 找行（健康状态刷新、编辑后定位）不用线性查找
+    __slots__ = ("name", "ids", "rows", "row")
+
+    def __init__(self, name, row):
+        self.name, self.ids, self.rows, self.row = name, [], {}, row
+
+    def append(self, tid):
+        self.rows[tid] = len(self.ids)
+        self.ids.append(tid)
+
+    def pop(self, row):
+        del self.rows[self.ids.pop(row)]
+        for k in range(row, len(self.ids)):      # 后面的行号前移
+            self.rows[self.ids[k]] = k
+
+
+class ToolModel(QAbstractItemModel):
+    def __init__(self, tools, header="", parent=None):
+        super().__init__(parent)
+        self.header = header
+        self.by_id = {}                   # id -> 工具，插入顺序即目录（保存）顺序；按 id 增删改都不用查找列表
+        self.tools = self.by_id.values()  # 按目录顺序的实时视图，保存和扫描都用它
+        self.health = {}                  # id -> (状态, 问题, 说明)，由后台扫描填入
+        self.cats = []                    # 保持首次出现的顺序，和原来的分组顺序一致
+        self._cat_of = {}
+        for t in tools:
+            self.by_id[t["id"]] = t
+            self._category(t.get("category", "")).append(t["id"])
+
+    def _category(self, name):
+        c = self._cat_of.get(name)
+        if c is None:
+            c = self._cat_of[name] = _Category(name, len(self.cats))
+            self.cats.append(c)
+        return c
+
+    # —— QAbstractItemModel 接口 ——
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, None)
+        return self.createIndex(row, column, self.cats[parent.row()])
+
+    def parent(self, index):
+        cat = index.internalPointer() if index.isValid() else None
+        if cat is None:
+            return QModelIndex()
+        return self.createIndex(cat.row, 0, None)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.cats)
+        if parent.internalPointer() is None:
+            return len(self.cats[parent.row()].ids)
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        cat = index.internalPointer()
+        if cat is None:
+            return self.cats[index.row()].name if role == Qt.DisplayRole else None
+        tid = cat.ids[index.row()]
+        if role == Qt.DisplayRole:
+            return self.by_id[tid]["name"]
+        if role == ToolIdRole:
+            return tid
+        h = self.health.get(tid)
+        if h is None:
+            return None
+        if role == Qt.DecorationRole:
+            return badge(h[0])
+        if role == Qt.ToolTipRole:
+            return "\n".join(h[1] + h[2]) or None
+        if role == HealthRole:
+            return h
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.header
+        return None
+
+    # —— 查询 ——
+    def tool(self, index):
+        tid = index.data(ToolIdRole) if index.isValid() else None
+        return self.by_id.get(tid) if tid else None
+
+    def index_of(self, tid):
+        cat = self._cat_of[self.by_id[tid].get("category", "")]
+        return self.createIndex(cat.rows[tid], 0, cat)
+
+    # —— 行级修改 ——
+    def _attach(self, t):
+        # 只处理树里的行：挂到所属分类末尾，分类不存在时先建
+        name = t.get("category", "")
+        if name not in self._cat_of:
+            n = len(self.cats)
+            self.beginInsertRows(QModelIndex(), n, n)
+            self._category(name)
+            self.endInsertRows()
+        cat = self._cat_of[name]
+        row = len(cat.ids)
+        self.beginInsertRows(self.createIndex(cat.row, 0, None), row, row)
+        cat.append(t["id"])
+        self.endInsertRows()
+
+    def _detach(self, t):
+        cat = self._cat_of[t.get("category", "")]
+        crow, row = cat.row, cat.rows[t["id"]]
+        if len(cat.ids) == 1:             # 分类里最后一个工具，连分类一起删
+            self.beginRemoveRows(QModelIndex(), crow, crow)
+            del self.cats[crow], self._cat_of[cat.name]
+            for k in range(crow, len(self.cats)):
+                self.cats[k].row = k
+        else:
+            self.beginRemoveRows(self.createIndex(crow, 0, None), row, row)
+        cat.pop(row)
+        self.endRemoveRows()
+
+    def add_tool(self, t):
+        self.by_id[t["id"]] = t
+        self._attach(t)
+
+    def remove_tool(self, tid):
+        self._detach(self.by_id[tid])
+        del self.by_id[tid]
+        self.health.pop(tid, None)
+
+    def update_tool(self, tid, new):
+        old = self.by_id[tid]
+        self.by_id[tid] = new             # 原位替换，目录顺序不变
+        self.health.pop(tid, None)        # 旧结果作废，等重新检查
+        if old.get("category", "") != new.get("category", ""):
+            # 换了分类就是在树里移动：从旧分类删掉、挂到新分类
+            self._detach(old)
+            self._attach(new)
+            return
+        idx = self.index_of(tid)
+        self.dataChanged.emit(idx, idx)
+
+    def reorder(self, ids):
+        # 按给定顺序重排目录（热加载合并后沿用对方文件的顺序）；树里的分组不变。原地重建，tools 视图仍然有效
+        items = [(tid, self.by_id[tid]) for tid in ids]
+        self.by_id.clear()
+        self.by_id.update(items)
+
+    def set_health(self, results):
+        # 只对状态有变化的行发 dataChanged，反复扫描不会让整棵树重绘
+        for tid, h in results.items():
+            if tid in self.by_id and self.health.get(tid) != h:
+                self.health[tid] = h
+                idx = self.index_of(tid)
+                self.dataChanged.emit(idx, idx, [Qt.DecorationRole, Qt.ToolTipRole, HealthRole])
+
+
+class ToolFilterProxy(QSortFilterProxyModel):
+    # 有检索结果时只显示命中的工具并按相关度排序；索引尚未建好时退回名称/分类子串匹配。
+    # 分类节点随子节点递归显示，按其中最靠前的命中排序
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.key, self.rank, self.cat_rank = "", None, {}
+        self.setRecursiveFilteringEnabled(True)
+
+    def set_key(self, text, ranked=None):
+        self.key = text.lower()
+        self.rank, self.cat_rank = None, {}
+        if ranked is not None and self.key:
+            self.rank = {tid: i for i, tid in enumerate(ranked)}
+            by_id = self.sourceModel().by_id
+            for tid in reversed(ranked):
+                self.cat_rank[by_id[tid].get("category", "")] = self.rank[tid]
+        self.invalidateFilter()
+        self.sort(0 if self.rank is not None else -1)
+
+    def filterAcceptsRow(self, row, parent):
+        if not self.key:
+            return True
+        if not parent.isValid():
+            return False                  # 分类行由递归过滤按子节点决定
+        t = self.sourceModel().tool(self.sourceModel().index(row, 0, parent))
+        if not t:
+            return False
+        if self.rank is not None:
+            return t["id"] in self.rank
+        return self.key in t["name"].lower() or self.key in t.get("category", "").lower()
+
+    def lessThan(self, left, right):
+        m = self.sourceModel()
+        if not left.parent().isValid():
+            big = len(self.cat_rank)
+            return self.cat_rank.get(m.data(left), big) < self.cat_rank.get(m.data(right), big)
+        big = len(self.rank)
+        return self.rank.get(left.data(ToolIdRole), big) < self.rank.get(right.data(ToolIdRole), big)
@@ -0,0 +1,568 @@
+# 使用日志存储：可插拔后端，记录一次启动只做一次追加，不再整文件重写
+import os, sys, json, mmap, time, struct, sqlite3, datetime
+
+LEGACY_LOG = "usage_log.json"
+
+
+def _day(ts):
+    return datetime.datetime.fromtimestamp(ts).date().isoformat()
+
+
+def _ts(iso):
+    return datetime.datetime.fromisoformat(iso).timestamp()
+
+
+_np = False
+
+def _numpy():
+    # numpy 是可选依赖，只有列式后端用得到，第一次用到时才导入（没装时结果同样记住）
+    global _np
+    if _np is False:
+        try:
+            import numpy as _np
+        except ImportError:
+            _np = None
+    return _np
+
+
+class UsageStore:
+    # 后端接口：record 追加一条；events 按时间顺序返回 {"tool","time"} 字典；
+    # rollup 返回按天、按工具预聚合的 (day, tool, n)，写入时同步维护
+    def record(self, tool, ts=None):
+        raise NotImplementedError
+
+    def import_events(self, events):
+        raise NotImplementedError
+
+    def events(self, since=None):
+        raise NotImplementedError
+
+    def rollup(self, since_day=None):
+        raise NotImplementedError
+
+    def rebuild_rollups(self):
+        raise NotImplementedError
+
+    def count(self):
+        return sum(1 for _ in self.events())
+
+    def compact(self, before):
+        # 保留期：把 before（时间戳）之前的事件只保留在日汇总里，删除明细；返回删除的条数
+        return 0
+
+    def close(self):
+        pass
+
+
+class JsonlUsageStore(UsageStore):
+    # 追加写 JSON Lines，每行一条事件；O_APPEND 保证多进程追加不互相覆盖。
+    # 日汇总放在旁路文件 *.rollup.json，连同已汇总到的字节偏移一起保存，
+    # 打开时只需补读偏移之后新增的行（例如其他进程或上次崩溃后追加的部分）。
+    # 汇总在写入后定期存盘（距上次超过 CHECKPOINT_SECS 秒或新汇总了 CHECKPOINT_BYTES 字节），
+    # 进程没走到 close() 就退出时，下次打开也只需补读最近的一小段
+    CHECKPOINT_SECS = 30
+    CHECKPOINT_BYTES = 64 << 10
+
+    def __init__(self, path):
+        self.path = path
+        self.rollup_path = os.path.splitext(path)[0] + ".rollup.json"
+        self._fp = open(path, "a", encoding="utf-8")
+        self._daily, self._offset = {}, 0
+        try:
+            with open(self.rollup_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            self._daily, self._offset = saved["daily"], saved["offset"]
+        except (OSError, ValueError, KeyError):
+            pass
+        self._saved, self._saved_at = self._offset, time.monotonic()
+        self._catch_up()
+        self._checkpoint()
+
+    def _line(self, tool, ts):
+        when = datetime.datetime.fromtimestamp(ts).isoformat()
+        return json.dumps({"tool": tool, "time": when}, ensure_ascii=False) + "\n"
+
+    def _bump(self, day, tool, n=1):
+        tools = self._daily.setdefault(day, {})
+        tools[tool] = tools.get(tool, 0) + n
+
+    def _catch_up(self):
+        if os.path.getsize(self.path) < self._offset:   # 日志被截断或替换过
+            self._daily, self._offset = {}, 0
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break                              # 正在写入的半行，下次再读
+                self._offset += len(raw)
+                try: e = json.loads(raw)
+                except ValueError: continue
+                self._bump(e["time"][:10], e["tool"])
+
+    def record(self, tool, ts=None):
+        self._fp.write(self._line(tool, ts if ts is not None else datetime.datetime.now().timestamp()))
+        self._fp.flush()
+        self._catch_up()     # 通常只读到刚写的这一行，也顺带汇总其他进程的追加
+        self._checkpoint()
+
+    def import_events(self, events):
+        for t, ts in events:
+            self._fp.write(self._line(t, ts))
+        self._fp.flush()
+        self._catch_up()
+        self._checkpoint()
+
+    def _checkpoint(self):
+        if self._offset - self._saved >= self.CHECKPOINT_BYTES or \
+                (self._offset != self._saved and time.monotonic() - self._saved_at >= self.CHECKPOINT_SECS):
+            self.save_rollups()
+
+    def rollup(self, since_day=None):
+        for day, tools in self._daily.items():
+            if since_day is None or day >= since_day:
+                for tool, n in tools.items():
+                    yield day, tool, n
+
+    def rebuild_rollups(self):
+        self._fp.flush()
+        self._daily, self._offset = {}, 0
+        self._catch_up()
+        self.save_rollups()
+
+    def save_rollups(self):
+        tmp = self.rollup_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"offset": self._offset, "daily": self._daily}, f, ensure_ascii=False)
+        os.replace(tmp, self.rollup_path)
+        self._saved, self._saved_at = self._offset, time.monotonic()
+
+    def events(self, since=None):
+        self._fp.flush()
+        start = datetime.datetime.fromtimestamp(since).isoformat() if since is not None else None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try: e = json.loads(line)
+                except ValueError: continue      # 崩溃时可能留下半行，跳过
+                if start is None or e["time"] >= start:
+                    yield e
+
+    def close(self):
+        self._fp.close()
+        self.save_rollups()
+
+
+class SqliteUsageStore(UsageStore):
+    # SQLite 后端：WAL 模式下单条插入不随历史增长变慢，(tool, day) 与 day 上有索引；
+    # daily 表与事件在同一事务里累加，仪表盘只读 daily
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS events(
+                id   INTEGER PRIMARY KEY,
+                tool TEXT NOT NULL,
+                ts   REAL NOT NULL,
+                day  TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS idx_events_tool_day ON events(tool, day);
+            CREATE INDEX IF NOT EXISTS idx_events_day ON events(day);
+            CREATE TABLE IF NOT EXISTS daily(
+                day  TEXT NOT NULL,
+                tool TEXT NOT NULL,
+                n    INTEGER NOT NULL,
+                PRIMARY KEY(day, tool)) WITHOUT ROWID;
+        """)
+        # 早期版本的库没有 daily 表，首次打开时补算一次
+        if not self.db.execute("SELECT 1 FROM daily LIMIT 1").fetchone() and \
+                self.db.execute("SELECT 1 FROM events LIMIT 1").fetchone():
+            self.rebuild_rollups()
+
+    _BUMP = ("INSERT INTO daily(day, tool, n) VALUES (?,?,1) "
+             "ON CONFLICT(day, tool) DO UPDATE SET n = n + 1")
+
+    def record(self, tool, ts=None):
+        ts = ts if ts is not None else datetime.datetime.now().timestamp()
+        day = _day(ts)
+        with self.db:
+            self.db.execute("INSERT INTO events(tool, ts, day) VALUES (?,?,?)", (tool, ts, day))
+            self.db.execute(self._BUMP, (day, tool))
+
+    def import_events(self, events):
+        with self.db:
+            self.db.executemany("INSERT INTO events(tool, ts, day) VALUES (?,?,?)",
+                                ((t, ts, _day(ts)) for t, ts in events))
+        self.rebuild_rollups()
+
+    def events(self, since=None):
+        sql, params = "SELECT tool, ts FROM events", ()
+        if since is not None:
+            sql, params = sql + " WHERE ts >= ?", (since,)
+        for tool, ts in self.db.execute(sql + " ORDER BY ts", params):
+            yield {"tool": tool, "time": datetime.datetime.fromtimestamp(ts).isoformat()}
+
+    def rollup(self, since_day=None):
+        if since_day is None:
+            return self.db.execute("SELECT day, tool, n FROM daily").fetchall()
+        return self.db.execute("SELECT day, tool, n FROM daily WHERE day >= ?", (since_day,)).fetchall()
+
+    def rebuild_rollups(self):
+        with self.db:
+            # 压缩掉明细的日子只剩汇总，不能重算；从仍有明细的最早一天开始重算
+            first = self.db.execute("SELECT MIN(day) FROM events").fetchone()[0]
+            if first is None:
+                return
+            self.db.execute("DELETE FROM daily WHERE day >= ?", (first,))
+            self.db.execute("INSERT INTO daily(day, tool, n) "
+                            "SELECT day, tool, COUNT(*) FROM events GROUP BY day, tool")
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def compact(self, before):
+        # daily 表已包含这些事件，删明细不影响统计；rebuild_rollups 之后只剩保留期内的明细
+        with self.db:
+            return self.db.execute("DELETE FROM events WHERE ts < ?", (before,)).rowcount
+
+    def close(self):
+        self.db.close()
+
+
+class ColumnarUsageStore(UsageStore):
+    # 紧凑列式后端：目录下 tools.txt 为工具名字典（行号即 id，只追加），events.bin 为定长记录
+    # (uint32 秒, uint32 工具 id)，每条 8 字节，一次 O_APPEND 写入，多进程同时追加也不会错位。
+    # 整列读取时 mmap 整个文件：有 numpy 时 frombuffer 零拷贝视图 + 向量化计数，否则用 array 切片；
+    # 映射随返回的数组一起释放，不常驻（Windows 上被映射的文件不能被压缩时替换）。
+    # 日汇总连同已汇总到的记录数（高水位）存在 rollup.json，打开时只补读高水位之后追加的记录；
+    # 事件文件被压缩替换过（inode 或 through 变了）时才全部重算。
+    # 超过保留期的事件由 compact() 折叠进 compacted.json 的日汇总；through 之前的记录不再计入，
+    # 所以先写汇总、后重写事件文件，中途崩溃也不会重复计数
+    REC = 8
+    CHECKPOINT_SECS = 30
+    CHECKPOINT_RECS = 8192
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.events_path = os.path.join(path, "events.bin")
+        self.tools_path = os.path.join(path, "tools.txt")
+        self.compacted_path = os.path.join(path, "compacted.json")
+        self.rollup_path = os.path.join(path, "rollup.json")
+        open(self.events_path, "ab").close()
+        self._names, self._ids = [], {}
+        self._load_tools()
+        self._load_compacted()
+        if self._load_rollups():
+            self._catch_up()
+            self._checkpoint()
+        else:
+            self.rebuild_rollups()
+
+    # —— 工具名字典 ——
+    def _load_tools(self):
+        with open(self.tools_path, "a+", encoding="utf-8") as f:
+            f.seek(0)
+            lines = f.read().split("\n")[:-1]          # 最后一段是未写完的行或空串
+        for name in lines[len(self._names):]:
+            # 两个进程同时登记同一个新工具时会出现重复行，统一映射到第一次出现的 id
+            self._ids.setdefault(name, len(self._names))
+            self._names.append(name)
+
+    def _tool_id(self, tool):
+        tool = tool.replace("\n", " ")
+        if tool not in self._ids:
+            self._load_tools()                          # 其他进程可能已经登记过
+        if tool not in self._ids:
+            with open(self.tools_path, "a", encoding="utf-8") as f:
+                f.write(tool + "\n")
+            self._load_tools()
+        return self._ids[tool]
+
+    # —— 列 ——
+    def _read(self, start=0):
+        # 返回从第 start 条起的 (秒列, id 列)；末尾不足 8 字节的半条记录忽略。
+        # 补读新追加的尾部（start > 0）直接读文件，整列读取走 mmap
+        with open(self.events_path, "rb") as f:
+            n = os.fstat(f.fileno()).st_size // self.REC - start
+            if n <= 0:
+                buf = b""
+            elif start:
+                f.seek(start * self.REC)
+                buf = f.read(n * self.REC)
+            else:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)   # 关闭文件后映射仍有效
+        np = _numpy()
+        if np is not None:
+            dt = [("ts", "<u4"), ("tool", "<u4")]
+            rec = np.frombuffer(buf, dtype=dt, count=n) if n > 0 else np.zeros(0, dtype=dt)
+            return rec["ts"], rec["tool"]
+        from array import array
+        a = array("I")
+        a.frombytes(memoryview(buf)[:max(n, 0) * self.REC])
+        if sys.byteorder == "big": a.byteswap()
+        return a[0::2], a[1::2]
+
+    @staticmethod
+    def _since(ts, ids, lo):
+        if lo:
+            np = _numpy()
+            if np is not None:
+                keep = ts >= lo
+                ts, ids = ts[keep], ids[keep]
+            else:
+                pairs = [(t, i) for t, i in zip(ts, ids) if t >= lo]
+                ts, ids = [t for t, _ in pairs], [i for _, i in pairs]
+        return ts, ids
+
+    def columns(self, since=None):
+        # (秒列, id 列, 名称表)，供向量化统计直接使用；不含已折叠的部分
+        ts, ids = self._since(*self._read(), max(since or 0, self._through))
+        return ts, ids, list(self._names)
+
+    # —— 汇总 ——
+    def _load_compacted(self):
+        try:
+            with open(self.compacted_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            self._compacted, self._through = saved["daily"], saved["through"]
+        except (OSError, ValueError, KeyError):
+            self._compacted, self._through = {}, 0
+
+    def _count_into(self, daily, ts, ids):
+        # 按本地日期分桶：算出覆盖范围内每天零点的时间戳，用二分把每条记录归到对应的天
+        if len(ts) == 0:
+            return
+        np = _numpy()
+        if np is not None:
+            ts, ids = np.asarray(ts, dtype=np.uint32), np.asarray(ids, dtype=np.uint32)
+            t0, t1 = int(ts.min()), int(ts.max())
+        else:
+            t0, t1 = min(ts), max(ts)
+        d = datetime.date.fromtimestamp(t0)
+        days, edges = [], []
+        while True:
+            days.append(d.isoformat())
+            edges.append(datetime.datetime(d.year, d.month, d.day).timestamp())
+            if edges[-1] > t1: break
+            d += datetime.timedelta(days=1)
+        if np is not None:
+            day_idx = np.searchsorted(np.asarray(edges), ts, side="right") - 1
+            key = day_idx.astype(np.int64) * (len(self._names) + 1) + ids
+            uniq, counts = np.unique(key, return_counts=True)
+            pairs = zip((uniq // (len(self._names) + 1)).tolist(), (uniq % (len(self._names) + 1)).tolist(),
+                        counts.tolist())
+        else:
+            import bisect
+            from collections import Counter
+            c = Counter((bisect.bisect_right(edges, t) - 1, i) for t, i in zip(ts, ids))
+            pairs = ((di, i, n) for (di, i), n in c.items())
+        for di, i, n in pairs:
+            tools = daily.setdefault(days[di], {})
+            name = self._names[i]
+            tools[name] = tools.get(name, 0) + n
+
+    def _events_ino(self):
+        try: return os.stat(self.events_path).st_ino
+        except OSError: return None
+
+    def _load_rollups(self):
+        # 存档与当前事件文件、折叠线一致时载入并返回 True，否则需要全部重算
+        try:
+            with open(self.rollup_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            ok = saved["through"] == self._through and saved["ino"] == self._events_ino() and \
+                saved["n"] <= os.path.getsize(self.events_path) // self.REC
+            if ok:
+                self._daily, self._n, self._rollup_ino = saved["daily"], saved["n"], saved["ino"]
+        except (OSError, ValueError, KeyError, TypeError):
+            ok = False
+        self._saved, self._saved_at = (self._n if ok else -1), time.monotonic()
+        return ok
+
+    def save_rollups(self):
+        tmp = self.rollup_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"n": self._n, "ino": self._events_ino(), "through": self._through, "daily": self._daily},
+                      f, ensure_ascii=False)
+        os.replace(tmp, self.rollup_path)
+        self._saved, self._saved_at = self._n, time.monotonic()
+
+    def _checkpoint(self):
+        if self._n - self._saved >= self.CHECKPOINT_RECS or \
+                (self._n != self._saved and time.monotonic() - self._saved_at >= self.CHECKPOINT_SECS):
+            self.save_rollups()
+
+    def _catch_up(self):
+        if self._events_ino() != self._rollup_ino or os.path.getsize(self.events_path) // self.REC < self._n:
+            self._load_compacted()                      # 被其他进程压缩替换过：重新读汇总并全部重算
+            return self.rebuild_rollups()
+        ts, ids = self._read(self._n)
+        self._n += len(ts)
+        if self._through:
+            keep = [k for k, t in enumerate(ts) if t >= self._through]
+            if len(keep) != len(ts):
+                ts, ids = [ts[k] for k in keep], [ids[k] for k in keep]
+        if max(ids, default=-1) >= len(self._names):
+            self._load_tools()
+        self._count_into(self._daily, ts, ids)
+
+    def rebuild_rollups(self):
+        self._daily, self._n = {}, 0
+        self._load_tools()
+        self._rollup_ino = self._events_ino()
+        ts, ids = self._read()
+        self._n = len(ts)
+        self._count_into(self._daily, *self._since(ts, ids, self._through))
+        self.save_rollups()
+
+    def rollup(self, since_day=None):
+        for src in (self._compacted, self._daily):
+            for day, tools in src.items():
+                if since_day is None or day >= since_day:
+                    for tool, n in tools.items():
+                        yield day, tool, n
+
+    # —— 写入 ——
+    def _append(self, pairs):
+        buf = b"".join(struct.pack("<II", int(ts), tid) for ts, tid in pairs)
+        fd = os.open(self.events_path, os.O_WRONLY | os.O_APPEND | getattr(os, "O_BINARY", 0))
+        try: os.write(fd, buf)
+        finally: os.close(fd)
+
+    def record(self, tool, ts=None):
+        ts = ts if ts is not None else datetime.datetime.now().timestamp()
+        self._append([(ts, self._tool_id(tool))])
+        self._catch_up()
+        self._checkpoint()
+
+    def import_events(self, events):
+        self._append([(ts, self._tool_id(t)) for t, ts in events])
+        self._catch_up()
+        self._checkpoint()
+
+    def events(self, since=None):
+        ts, ids, names = self.columns(since)
+        for t, i in sorted(zip(ts.tolist() if hasattr(ts, "tolist") else ts,
+                               ids.tolist() if hasattr(ids, "tolist") else ids)):
+            yield {"tool": names[i], "time": datetime.datetime.fromtimestamp(t).isoformat()}
+
+    def count(self):
+        return len(self.columns()[0])
+
+    def compact(self, before):
+        # 把 before 之前的事件折叠成日汇总并从事件文件中删除，返回折叠的条数
+        before = max(int(before), self._through)        # 折叠线只前进不后退
+        ts, ids = self._read()
+        np = _numpy()
+        if np is not None:
+            ts, ids = ts.copy(), ids.copy()             # 释放映射，否则 Windows 上无法替换事件文件
+            old = (ts >= self._through) & (ts < before)
+            stale, old_ts, old_ids = int((ts < before).sum()), ts[old], ids[old]
+        else:
+            old = [(t, i) for t, i in zip(ts, ids) if self._through <= t < before]
+            stale, old_ts, old_ids = sum(1 for t in ts if t < before), [t for t, _ in old], [i for _, i in old]
+        if not stale:
+            return 0
+        if before > self._through:
+            compacted = {d: dict(t) for d, t in self._compacted.items()}
+            self._count_into(compacted, old_ts, old_ids)
+            tmp = self.compacted_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"through": before, "daily": compacted}, f, ensure_ascii=False)
+            os.replace(tmp, self.compacted_path)
+        # 汇总已生效；之后再把保留期内的事件重写成新文件（其他进程下次追加时会看到文件变短并重算）
+        if np is not None:
+            keep = ts >= before
+            body = np.rec.fromarrays([ts[keep], ids[keep]], dtype=[("ts", "<u4"), ("tool", "<u4")]).tobytes()
+        else:
+            body = b"".join(struct.pack("<II", t, i) for t, i in zip(ts, ids) if t >= before)
+        tmp = self.events_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, self.events_path)
+        self._load_compacted()
+        self.rebuild_rollups()
+        return len(old_ts)
+
+    def close(self):
+        if self._n != self._saved:
+            self.save_rollups()
+
+
+BACKENDS = {
+    "sqlite": (SqliteUsageStore, "usage_log.db"),
+    "jsonl":  (JsonlUsageStore, "usage_log.jsonl"),
+    "columnar": (ColumnarUsageStore, "usage_log.col"),
+}
+
+
+def migrate_legacy(store, legacy_path):
+    # 一次性迁移旧版 usage_log.json，成功后改名，避免重复导入
+    if not os.path.isfile(legacy_path):
+        return 0
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    rows = []
+    for e in data:
+        try: rows.append((e["tool"], _ts(e["time"])))
+        except (KeyError, TypeError, ValueError): continue
+    store.import_events(rows)
+    os.replace(legacy_path, legacy_path + ".migrated")
+    return len(rows)
+
+
+def retention_cutoff(days):
+    # 保留最近 days 天（含今天）的明细；按本地零点对齐，压缩只涉及整天
+    first = datetime.date.today() - datetime.timedelta(days=days - 1)
+    return datetime.datetime(first.year, first.month, first.day).timestamp()
+
+
+def open_usage_store(backend="sqlite", base_dir=".", retention_days=0):
+    cls, fname = BACKENDS.get(backend, BACKENDS["sqlite"])
+    store = cls(os.path.join(base_dir, fname))
+    migrate_legacy(store, os.path.join(base_dir, LEGACY_LOG))
+    if retention_days:
+        store.compact(retention_cutoff(retention_days))
+    return store
+
+
+# 仪表盘统计：只读日汇总，耗时与天数×工具数成正比，与事件总数无关
+def compute_today_top5(store):
+    from collections import Counter
+    today = datetime.date.today().isoformat()
+    cnt = Counter()
+    for day, tool, n in store.rollup(today):
+        if day == today: cnt[tool] += n
+    return ([],[]) if not cnt else zip(*cnt.most_common(5))
+
+
+def compute_trend(store, days):
+    from collections import defaultdict
+    start = datetime.date.today() - datetime.timedelta(days=days-1)
+    c = defaultdict(int)
+    for day, _, n in store.rollup(start.isoformat()):
+        c[datetime.date.fromisoformat(day)] += n
+    days_sorted = sorted(c)
+    return days_sorted, [c[d] for d in days_sorted]
+
+
+if __name__ == "__main__":
+    # python -m ivylib.usage rebuild|compact [--days 365] [--backend sqlite|jsonl|columnar] [--dir .]
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m ivylib.usage")
+    ap.add_argument("command", choices=["rebuild", "compact"])
+    ap.add_argument("--days", type=int, default=365, help="compact: keep this many days of raw events")
+    ap.add_argument("--backend", default="sqlite", choices=list(BACKENDS))
+    ap.add_argument("--dir", default=".")
+    opts = ap.parse_args()
+    store = open_usage_store(opts.backend, opts.dir)
+    if opts.command == "compact":
+        n = store.compact(retention_cutoff(opts.days))
+        print(f"folded {n} events older than {opts.days} days into daily totals, {store.count()} remain")
+    else:
+        store.rebuild_rollups()
+        print(f"rebuilt daily rollups from {store.count()} events")
+    store.close()
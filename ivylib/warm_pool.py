@@ -0,0 +1,67 @@
+# 预热解释器池：为开启 warm 的 Python 命令行工具提前启动几个空闲的 warm_worker 进程，
+# 运行时直接取一个、写入请求即可，省掉解释器启动与预加载模块的时间；取走后在后台补齐
+import os, json
+from PyQt5.QtCore import QObject, QProcess, QTimer
+
+WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "warm_worker.py")
+
+
+def warm_request(script, args, cwd=None):
+    return (json.dumps({"script": script, "args": list(args), "cwd": cwd}) + "\n").encode("utf-8")
+
+
+class WarmPool(QObject):
+    def __init__(self, python, script, preload="", size=2, parent=None):
+        super().__init__(parent)
+        self.python, self.script, self.preload, self.size = python, script, preload, size
+        self.idle = []
+        self.refill()
+
+    def _spawn(self):
+        p = QProcess(self)
+        p.setProcessChannelMode(QProcess.MergedChannels)
+        args = [WORKER, os.path.dirname(os.path.abspath(self.script))]
+        if self.preload:
+            args.append(self.preload)
+        p.start(self.python, args)
+        return p
+
+    def refill(self):
+        self.idle = [p for p in self.idle if p.state() != QProcess.NotRunning]
+        while len(self.idle) < self.size:
+            self.idle.append(self._spawn())
+
+    def take(self):
+        # 取一个空闲进程（仍在启动中的也可以，写入会先缓冲）；没有可用的返回 None，由调用方走冷启动
+        while self.idle:
+            p = self.idle.pop(0)
+            if p.state() != QProcess.NotRunning:
+                QTimer.singleShot(0, self.refill)
+                return p
+            p.kill(); p.deleteLater()
+        QTimer.singleShot(0, self.refill)
+        return None
+
+    def shutdown(self):
+        for p in self.idle:
+            p.closeWriteChannel()        # 空行即退出
+            if not p.waitForFinished(500):
+                p.kill()
+        self.idle = []
+
+
+class WarmPools(QObject):
+    # 按 (解释器, 脚本, 预加载模块) 各自维护一个池
+    def __init__(self, size=2, parent=None):
+        super().__init__(parent)
+        self.size, self.pools = size, {}
+
+    def get(self, python, script, preload=""):
+        key = (python, os.path.abspath(script), preload)
+        if key not in self.pools:
+            self.pools[key] = WarmPool(python, script, preload, self.size, self)
+        return self.pools[key]
+
+    def shutdown(self):
+        for pool in self.pools.values():
+            pool.shutdown()
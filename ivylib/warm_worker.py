@@ -0,0 +1,38 @@
+# 预热工作进程：python warm_worker.py <脚本目录> [模块,模块...]
+# 由工具配置的 Python 解释器启动，先导入预加载模块，然后阻塞等待一行 JSON 请求
+# {"script": ..., "args": [...], "cwd": ...}，收到后以 __main__ 身份运行脚本，一个进程只跑一次。
+# 注意：这个文件在目标解释器里执行，只能用标准库
+import os, sys, json, runpy
+
+
+def preload(modules):
+    # 预加载期间的输出丢弃，避免混进之后脚本的输出
+    out, err = sys.stdout, sys.stderr
+    with open(os.devnull, "w") as null:
+        sys.stdout = sys.stderr = null
+        try:
+            for name in modules:
+                try: __import__(name)
+                except Exception: pass
+        finally:
+            sys.stdout, sys.stderr = out, err
+
+
+def main():
+    # sys.path[0] 换成脚本所在目录，与直接 python script.py 一致，也让预加载能找到脚本旁的模块
+    sys.path[0] = sys.argv[1]
+    preload([m.strip() for m in ",".join(sys.argv[2:]).split(",") if m.strip()])
+    line = sys.stdin.readline()
+    if not line:
+        return 0                     # 池被关闭
+    req = json.loads(line)
+    script = req["script"]
+    if req.get("cwd"):
+        os.chdir(req["cwd"])
+    sys.argv = [script] + list(req.get("args", []))
+    runpy.run_path(script, run_name="__main__")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())